@@ -0,0 +1,399 @@
+#!/usr/bin/env python
+"""ベンチマークスイート
+
+リポジトリ層・サービス層・スキーマ検証・レスポンスのシリアライズ・
+HTTP (POST /tasks, GET /tasks) の性能を、
+インメモリ / ディスク上の SQLite と複数のデータ件数で計測し、結果を JSON で出力する。
+
+使い方:
+    python benchmarks/run.py                              # 1k / 100k / 1M 件
+    python benchmarks/run.py --sizes 1000 --storage memory
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare baseline.json      # 前回の結果と比較
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from task_app.api.responses import FastJSONResponse, page_content
+from task_app.api.tasks import get_task_cache
+from task_app.config import Settings
+from task_app.database import Base, create_db_engine, get_db
+from task_app.main import app
+from task_app.models.task import Task, utc_now
+from task_app.repositories.pagination import CursorPosition, encode_cursor
+from task_app.repositories.task import TaskRepository
+from task_app.schemas.task import (
+    TaskCreate,
+    TaskPageResponse,
+    TaskResponse,
+    TaskUpdate,
+)
+from task_app.services.task import TaskService
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+STORAGES = ("memory", "disk")
+SEED_CHUNK = 10_000
+
+
+@dataclass
+class Result:
+    """1つのベンチマークの計測結果"""
+
+    name: str
+    storage: str
+    rows: int
+    ops: int
+    seconds: float
+    ops_per_sec: float
+    mean_us: float
+    p50_us: float
+    p95_us: float
+
+
+def measure(
+    name: str, storage: str, rows: int, ops: int, op: Callable[[int], object]
+) -> Result:
+    """op(i) を ops 回実行し、1回ごとの所要時間を集計する"""
+    timings = []
+    started = time.perf_counter()
+    for i in range(ops):
+        t0 = time.perf_counter()
+        op(i)
+        timings.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return Result(
+        name=name,
+        storage=storage,
+        rows=rows,
+        ops=ops,
+        seconds=round(elapsed, 6),
+        ops_per_sec=round(ops / elapsed, 2),
+        mean_us=round(statistics.fmean(timings) * 1e6, 2),
+        p50_us=round(timings[len(timings) // 2] * 1e6, 2),
+        p95_us=round(timings[int(len(timings) * 0.95)] * 1e6, 2),
+    )
+
+
+@contextmanager
+def database(storage: str, rows: int) -> Iterator[sessionmaker]:
+    """rows 件のタスクを投入したデータベースのセッションファクトリを返す"""
+    with tempfile.TemporaryDirectory() as tmp:
+        if storage == "memory":
+            engine = create_engine(
+                "sqlite:///:memory:",
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+        else:
+            engine = create_db_engine(f"sqlite:///{tmp}/bench.db", Settings())
+        Base.metadata.create_all(engine)
+        now = utc_now()
+        with engine.begin() as conn:
+            for start in range(0, rows, SEED_CHUNK):
+                conn.execute(
+                    insert(Task),
+                    [
+                        {
+                            "title": f"Task {i}",
+                            "description": "benchmark",
+                            "completed": i % 2 == 0,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for i in range(start, min(start + SEED_CHUNK, rows))
+                    ],
+                )
+        try:
+            yield sessionmaker(autoflush=False, bind=engine)
+        finally:
+            engine.dispose()
+
+
+def bench_database(storage: str, rows: int, scale: float) -> list[Result]:
+    """リポジトリ層・サービス層・HTTPのベンチマーク"""
+    n = lambda ops: max(1, int(ops * scale))  # noqa: E731
+    rng = random.Random(0)
+    results = []
+    with database(storage, rows) as session_factory:
+        db: Session = session_factory()
+        repo = TaskRepository(db)
+        service = TaskService(repo)
+        ids = [rng.randint(1, rows) for _ in range(n(1000))]
+
+        results.append(
+            measure(
+                "repository.create",
+                storage,
+                rows,
+                n(200),
+                lambda i: repo.create(TaskCreate(title=f"new {i}")),
+            )
+        )
+        results.append(
+            measure(
+                "repository.get_by_id",
+                storage,
+                rows,
+                len(ids),
+                lambda i: repo.get_by_id(ids[i]),
+            )
+        )
+        results.append(
+            measure(
+                "repository.get_all[first page]",
+                storage,
+                rows,
+                n(100),
+                lambda i: repo.get_all(skip=0, limit=100),
+            )
+        )
+        results.append(
+            measure(
+                "repository.get_all[last page]",
+                storage,
+                rows,
+                n(20),
+                lambda i: repo.get_all(skip=max(rows - 100, 0), limit=100),
+            )
+        )
+        # get_all の最終ページと同じ位置を指すカーソル（シード時の id は 1..rows）
+        deep_cursor = encode_cursor(CursorPosition("id", (max(rows - 100, 0),)))
+        results.append(
+            measure(
+                "repository.get_page[last page]",
+                storage,
+                rows,
+                n(20),
+                lambda i: repo.get_page(limit=100, cursor=deep_cursor),
+            )
+        )
+        # 一覧1ページ分の取得からJSONまで: ORM + TaskResponse（従来）と
+        # 行タプル + orjson（GET /tasks の現在の経路）
+        results.append(
+            measure(
+                "serialize.page[orm+pydantic]",
+                storage,
+                rows,
+                n(100),
+                lambda i: TaskPageResponse.model_validate(
+                    repo.get_page(limit=100)
+                ).model_dump_json(),
+            )
+        )
+        results.append(
+            measure(
+                "serialize.page[rows+orjson]",
+                storage,
+                rows,
+                n(100),
+                lambda i: (
+                    FastJSONResponse(
+                        page_content(repo.get_page(limit=100, rows=True))
+                    ).body
+                ),
+            )
+        )
+        results.append(
+            measure(
+                "repository.update",
+                storage,
+                rows,
+                n(200),
+                lambda i: repo.update(ids[i], TaskUpdate(title=f"updated {i}")),
+            )
+        )
+        results.append(
+            measure(
+                "service.toggle_complete",
+                storage,
+                rows,
+                n(200),
+                lambda i: service.toggle_complete(ids[i]),
+            )
+        )
+        db.close()
+
+        results.extend(bench_http(session_factory, storage, rows, n(200)))
+    return results
+
+
+def bench_http(
+    session_factory: sessionmaker, storage: str, rows: int, ops: int
+) -> list[Result]:
+    """POST /tasks と GET /tasks をHTTPクライアント経由で計測する"""
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_task_cache] = lambda: None
+    try:
+        with TestClient(app) as client:
+            return [
+                measure(
+                    "http.POST /tasks",
+                    storage,
+                    rows,
+                    ops,
+                    lambda i: client.post("/tasks", json={"title": f"http {i}"}),
+                ),
+                measure(
+                    "http.GET /tasks",
+                    storage,
+                    rows,
+                    ops,
+                    lambda i: client.get("/tasks", params={"limit": 100}),
+                ),
+            ]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def bench_schemas(scale: float) -> list[Result]:
+    """スキーマ検証のベンチマーク（データ件数に依存しない）"""
+    ops = max(1, int(10_000 * scale))
+    now = datetime.now(UTC)
+    task = Task(
+        id=1,
+        title="Task",
+        description="desc",
+        completed=False,
+        created_at=now,
+        updated_at=now,
+        version=1,
+    )
+    payload = {"title": "Task", "description": "desc"}
+    return [
+        measure(
+            "schema.TaskCreate.model_validate",
+            "-",
+            0,
+            ops,
+            lambda i: TaskCreate.model_validate(payload),
+        ),
+        measure(
+            "schema.TaskResponse.model_validate[orm]",
+            "-",
+            0,
+            ops,
+            lambda i: TaskResponse.model_validate(task),
+        ),
+    ]
+
+
+def metadata() -> dict:
+    """実行環境の情報"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def compare(results: list[Result], baseline_path: Path) -> None:
+    """前回の結果と ops/sec を比較して表示する"""
+    baseline = {
+        (r["name"], r["storage"], r["rows"]): r
+        for r in json.loads(baseline_path.read_text())["results"]
+    }
+    print(f"\nComparison with {baseline_path}:")
+    for r in results:
+        base = baseline.get((r.name, r.storage, r.rows))
+        if base is None:
+            continue
+        change = (r.ops_per_sec / base["ops_per_sec"] - 1) * 100
+        print(f"  {r.name:<40} {r.storage:<6} {r.rows:>9}  {change:+7.1f}%")
+
+
+def parse_args(argv=None):
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="TaskAPP ベンチマーク")
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="投入するタスク件数（カンマ区切り）",
+    )
+    parser.add_argument(
+        "--storage",
+        type=lambda s: s.split(","),
+        default=list(STORAGES),
+        help="memory / disk（カンマ区切り）",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="各ベンチマークの実行回数の倍率",
+    )
+    parser.add_argument("--output", type=Path, help="結果を書き出すJSONファイル")
+    parser.add_argument("--compare", type=Path, help="比較対象の結果JSONファイル")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ベンチマークを実行"""
+    args = parse_args(argv)
+    results = bench_schemas(args.scale)
+    for storage in args.storage:
+        for rows in args.sizes:
+            print(f"Running {storage} / {rows} rows...", file=sys.stderr)
+            results.extend(bench_database(storage, rows, args.scale))
+
+    for r in results:
+        print(
+            f"{r.name:<40} {r.storage:<6} {r.rows:>9}  "
+            f"{r.ops_per_sec:>10.1f} ops/s  p50 {r.p50_us:>9.1f}us  "
+            f"p95 {r.p95_us:>9.1f}us"
+        )
+
+    report = {"meta": metadata(), "results": [asdict(r) for r in results]}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
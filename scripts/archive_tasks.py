@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""完了済みタスクのアーカイブスクリプト
+
+最後の更新から指定した日数が経った完了済みタスクを tasks_archive に移す。
+アーカイブしたタスクはIDで取得できるが、一覧・検索・集計には含まれなくなる。
+
+使い方:
+    python scripts/archive_tasks.py --older-than-days 30
+    python scripts/archive_tasks.py --older-than-days 90 --batch-size 1000
+"""
+
+import argparse
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from task_app.archiver import DEFAULT_BATCH_SIZE
+from task_app.config import settings
+from task_app.database import SessionLocal, engine
+from task_app.models.task import utc_now
+from task_app.repositories.task import TaskRepository
+from task_app.services.task import TaskService
+
+# ARCHIVE_RETENTION_DAYS が設定されていない場合の保持日数
+DEFAULT_RETENTION_DAYS = 30.0
+
+
+def parse_args(argv=None):
+    """コマンドライン引数を解析"""
+    retention_days = settings.archive_retention_days or DEFAULT_RETENTION_DAYS
+    parser = argparse.ArgumentParser(description="完了済みタスクをアーカイブする")
+    parser.add_argument(
+        "--older-than-days",
+        type=float,
+        default=retention_days,
+        help=(
+            "最後の更新からこの日数が経ったものが対象"
+            f"（デフォルト: {retention_days:g}）"
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"1トランザクションで移動する件数（デフォルト: {DEFAULT_BATCH_SIZE}）",
+    )
+    parser.add_argument(
+        "--max-batches",
+        type=int,
+        help="処理する最大のバッチ数（省略時はすべて）",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """完了済みタスクをアーカイブ"""
+    args = parse_args(argv)
+    cutoff = utc_now() - timedelta(days=args.older_than_days)
+
+    print(f"Archiving tasks completed before {cutoff:%Y-%m-%d %H:%M} ({engine.url})...")
+    db = SessionLocal()
+    try:
+        service = TaskService(TaskRepository(db))
+        archived = service.archive_completed(
+            cutoff, batch_size=args.batch_size, max_batches=args.max_batches
+        )
+    finally:
+        db.close()
+
+    print(f"Archived {archived} tasks.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
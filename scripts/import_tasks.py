@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""タスク一括インポートスクリプト
+
+NDJSON / CSV ファイルをストリームとして読み込み、タスクを一括作成する。
+
+使い方:
+    python scripts/import_tasks.py tasks.ndjson
+    python scripts/import_tasks.py tasks.csv --batch-size 5000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from task_app.database import SessionLocal, engine
+from task_app.importer import DEFAULT_BATCH_SIZE, PARSERS
+from task_app.repositories.task import TaskRepository
+from task_app.services.task import TaskService
+
+# 表示するエラーの最大件数
+MAX_PRINTED_ERRORS = 20
+
+
+def parse_args(argv=None):
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="タスクを一括インポートする")
+    parser.add_argument("path", type=Path, help="NDJSON / CSV ファイル")
+    parser.add_argument(
+        "--format",
+        choices=sorted(PARSERS),
+        help="入力形式（省略時は拡張子から判定）",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"1トランザクションで作成する件数（デフォルト: {DEFAULT_BATCH_SIZE}）",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """タスクをインポート"""
+    args = parse_args(argv)
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+
+    print(f"Importing {args.path} ({fmt}) into {engine.url}...")
+    db = SessionLocal()
+    try:
+        service = TaskService(TaskRepository(db))
+        with args.path.open(encoding="utf-8-sig", newline="") as stream:
+            result = service.import_tasks(stream, fmt, args.batch_size)
+    finally:
+        db.close()
+
+    print(
+        f"Imported {result.imported} tasks in {result.elapsed_seconds:.2f}s "
+        f"({result.rows_per_second:.0f} rows/sec), {result.failed} failed."
+    )
+    for error in result.errors[:MAX_PRINTED_ERRORS]:
+        print(f"  line {error.line}: {error.error}")
+    if result.failed > MAX_PRINTED_ERRORS:
+        print(f"  ... and {result.failed - MAX_PRINTED_ERRORS} more")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
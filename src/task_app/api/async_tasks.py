@@ -0,0 +1,225 @@
+"""タスク API ルーター（非同期版）
+
+DATABASE_ASYNC が有効な場合に tasks ルーターより先に登録され、
+同じパスのエンドポイントをネイティブなコルーチンとして処理する。
+作成・一覧と、1件のタスクの取得・更新・削除・完了状態の変更を扱い、
+ここで定義されていないエンドポイント（一括更新・一括削除・インポート・
+差分同期・集計・検索・エクスポート・変更フィード）は同期版のルーターが処理する。
+
+task_id は {task_id:int} で数字だけに一致させ、同期版のルーターの
+/tasks/changes や /tasks/bulk などを横取りしないようにしている。
+"""
+
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from task_app.api.conditional import (
+    is_not_modified,
+    not_modified,
+    page_etag,
+    task_etag,
+    validator_headers,
+)
+from task_app.api.responses import FastJSONResponse, page_content
+from task_app.api.tasks import (
+    CONDITIONAL_WRITE_RESPONSES,
+    MAX_BULK_CREATE,
+    get_task_cache,
+    get_task_events,
+    get_task_fields,
+    get_task_filter,
+    get_task_ids,
+    parse_if_match,
+    version_conflict,
+    written_task,
+)
+from task_app.cache import CacheBackend
+from task_app.database import get_async_db
+from task_app.events import EventBroker
+from task_app.models.task import Task
+from task_app.repositories.async_task import AsyncTaskRepository
+from task_app.repositories.pagination import InvalidCursorError, TaskPage
+from task_app.repositories.task import TaskVersionConflictError
+from task_app.schemas.task import (
+    TaskCreate,
+    TaskFilter,
+    TaskOrderBy,
+    TaskPageResponse,
+    TaskResponse,
+    TaskUpdate,
+)
+from task_app.services.async_task import AsyncTaskService
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+def get_async_task_service(
+    db: AsyncSession = Depends(get_async_db),
+    cache: CacheBackend | None = Depends(get_task_cache),
+    events: EventBroker = Depends(get_task_events),
+) -> AsyncTaskService:
+    """AsyncTaskServiceの依存性注入"""
+    repository = AsyncTaskRepository(db)
+    return AsyncTaskService(repository, cache, events)
+
+
+@router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+async def create_task(
+    task_in: TaskCreate,
+    service: AsyncTaskService = Depends(get_async_task_service),
+) -> Task:
+    """新しいタスクを作成する"""
+    return await service.create(task_in)
+
+
+@router.post(
+    "/bulk", response_model=list[TaskResponse], status_code=status.HTTP_201_CREATED
+)
+async def create_tasks_bulk(
+    tasks_in: list[TaskCreate] = Body(..., max_length=MAX_BULK_CREATE),
+    service: AsyncTaskService = Depends(get_async_task_service),
+) -> list[Task]:
+    """複数のタスクを一括作成する"""
+    return await service.create_many(tasks_in)
+
+
+@router.get(
+    "",
+    response_model=TaskPageResponse,
+    responses={304: {"description": "前回取得時から変更なし"}},
+)
+async def list_tasks(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    order_by: TaskOrderBy = Query("id"),
+    filters: TaskFilter = Depends(get_task_filter),
+    ids: list[int] | None = Depends(get_task_ids),
+    fields: tuple[str, ...] | None = Depends(get_task_fields),
+    service: AsyncTaskService = Depends(get_async_task_service),
+) -> Response:
+    """タスク一覧を条件で絞り込み、カーソルページネーションで取得する"""
+    try:
+        if ids is not None:
+            items = await service.get_many(ids, filters=filters, fields=fields)
+            page = TaskPage(items=items)
+        else:
+            page = await service.get_page(
+                limit=limit,
+                cursor=cursor,
+                order_by=order_by,
+                filters=filters,
+                rows=True,
+                fields=fields,
+            )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="カーソルが不正です"
+        )
+    headers = validator_headers(page_etag(page, fields))
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified(headers)
+    return FastJSONResponse(page_content(page, fields), headers=headers)
+
+
+@router.get(
+    "/{task_id:int}",
+    response_model=TaskResponse,
+    responses={
+        304: {"description": "前回取得時から変更なし"},
+        404: {"description": "タスクが存在しない"},
+    },
+)
+async def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    service: AsyncTaskService = Depends(get_async_task_service),
+) -> Task | Response:
+    """IDでタスクを取得する（条件付きGETは同期版と同じ）"""
+    task = await service.get_including_archived(task_id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="タスクが見つかりません"
+        )
+    headers = validator_headers(task_etag(task), task.updated_at)
+    if is_not_modified(request, headers["ETag"], task.updated_at):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return task
+
+
+@router.patch(
+    "/{task_id:int}",
+    response_model=TaskResponse,
+    responses=CONDITIONAL_WRITE_RESPONSES,
+)
+async def update_task(
+    task_id: int,
+    task_in: TaskUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    service: AsyncTaskService = Depends(get_async_task_service),
+) -> Task:
+    """タスクを更新する（If-Match の扱いは同期版と同じ）"""
+    version = parse_if_match(if_match, task_id)
+    try:
+        task = await service.update(task_id, task_in, expected_version=version)
+    except TaskVersionConflictError:
+        raise version_conflict() from None
+    return written_task(task, response)
+
+
+@router.post(
+    "/{task_id:int}/{action}",
+    response_model=TaskResponse,
+    responses=CONDITIONAL_WRITE_RESPONSES,
+)
+async def change_task_completion(
+    task_id: int,
+    action: Literal["complete", "incomplete", "toggle"],
+    response: Response,
+    if_match: str | None = Header(default=None),
+    service: AsyncTaskService = Depends(get_async_task_service),
+) -> Task:
+    """タスクを完了 / 未完了にする、または完了状態をトグルする"""
+    write = {
+        "complete": service.mark_complete,
+        "incomplete": service.mark_incomplete,
+        "toggle": service.toggle_complete,
+    }[action]
+    version = parse_if_match(if_match, task_id)
+    try:
+        task = await write(task_id, expected_version=version)
+    except TaskVersionConflictError:
+        raise version_conflict() from None
+    return written_task(task, response)
+
+
+@router.delete(
+    "/{task_id:int}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={404: {"description": "タスクが存在しない"}},
+)
+async def delete_task(
+    task_id: int,
+    service: AsyncTaskService = Depends(get_async_task_service),
+) -> Response:
+    """タスクを削除する"""
+    if not await service.delete(task_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="タスクが見つかりません"
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
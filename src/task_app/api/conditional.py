@@ -0,0 +1,143 @@
+"""条件付きリクエスト（ETag / Last-Modified / If-Match）のヘルパー
+
+ETag は Task.version から、Last-Modified は Task.updated_at から求める。
+If-None-Match / If-Modified-Since が一致した場合は 304 を返し、レスポンスの
+シリアライズを省略する。更新系のAPIは If-Match の ETag からバージョンを求め、
+楽観的排他制御の前提条件にする。
+"""
+
+import hashlib
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from task_app.models.task import Task
+from task_app.repositories.pagination import TaskPage
+
+# クライアントにキャッシュを許可しつつ、使う前に必ず再検証させる
+CACHE_CONTROL = "no-cache"
+
+
+def _as_utc(value: datetime) -> datetime:
+    """タイムゾーンなしの日時はUTCとみなす（SQLiteはタイムゾーンを保存しない）"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def task_etag(task: Task) -> str:
+    """
+    タスクの ETag（IDとバージョンから求める強いETag）
+
+    タスクの内容はすべての更新でバージョンが上がるため、バージョンが同じなら
+    表現も同じになる。If-Match（強い比較）でもそのまま使える。
+    """
+    return f'"{task.id}-{task.version}"'
+
+
+def page_etag(page: TaskPage, fields: Sequence[str] | None = None) -> str:
+    """
+    タスク一覧の ETag
+
+    ページに含まれるタスクのIDとバージョン、前後ページのカーソルから求めるため、
+    タスクの追加・更新・削除のいずれでもページの ETag が変わる。
+    fields（疎なフィールドセット）が異なる表現は別の ETag になる。
+    """
+    digest = hashlib.sha1(usedforsecurity=False)
+    for task in page.items:
+        digest.update(f"{task.id}:{task.version};".encode())
+    digest.update(f"{page.next_cursor}|{page.prev_cursor}".encode())
+    if fields is not None:
+        digest.update(f"|{','.join(fields)}".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    """HTTPの日時形式（IMF-fixdate）"""
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def validator_headers(
+    etag: str, last_modified: datetime | None = None
+) -> dict[str, str]:
+    """ETag / Last-Modified / Cache-Control ヘッダ"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _opaque_tag(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match が ETag に一致するか（弱い比較）"""
+    if if_none_match.strip() == "*":
+        return True
+    tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+    return _opaque_tag(etag) in tags
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    リクエストの条件から、クライアントの持つ表現が最新かどうかを判定する
+
+    If-None-Match がある場合はそれだけで判定し、If-Modified-Since は無視する
+    （RFC 9110 13.2.2）。
+
+    Args:
+        request: リクエスト
+        etag: 現在の表現の ETag
+        last_modified: 現在の表現の更新日時（ない場合は If-Modified-Since を使わない）
+
+    Returns:
+        bool: 304 Not Modified を返してよい場合はTrue
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTPの日時は秒単位のため、更新日時も秒単位に切り捨てて比較する
+    return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def if_match_version(if_match: str, task_id: int) -> int | None:
+    """
+    If-Match ヘッダから更新の前提とするタスクのバージョンを求める
+
+    Args:
+        if_match: If-Match ヘッダの値
+        task_id: 更新対象のタスクID
+
+    Returns:
+        int | None: ETag が示すバージョン。"*" の場合は None（存在だけを条件にする）
+
+    Raises:
+        ValueError: 対象のタスクの強いETag（task_etag の形式）1つでない場合
+    """
+    tag = if_match.strip()
+    if tag == "*":
+        return None
+    if len(tag) < 2 or not (tag.startswith('"') and tag.endswith('"')):
+        raise ValueError(f"Invalid If-Match: {if_match!r}")
+    etag_id, _, version = tag[1:-1].partition("-")
+    if etag_id != str(task_id) or not version.isdigit():
+        raise ValueError(f"Invalid If-Match: {if_match!r}")
+    return int(version)
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """本文のない 304 Not Modified レスポンス"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,49 @@
+"""読み取り系APIの高速なレスポンス
+
+一覧・検索・差分同期は件数が多く、ORMオブジェクトの生成と TaskResponse への
+変換がCPU時間の大半を占める。これらのAPIでは RESPONSE_COLUMNS だけを行タプル
+として取得し、TaskResponse と同じ形の辞書から直接JSONを組み立てる。
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from task_app.repositories.changes import ChangeSet
+from task_app.repositories.pagination import TaskPage
+from task_app.serializers import dumps_json, partial_record, task_record
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson（なければ標準の json）でシリアライズするJSONレスポンス"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def page_content(page: TaskPage, fields: Sequence[str] | None = None) -> dict[str, Any]:
+    """
+    行タプルのページを TaskPageResponse と同じ形にする
+
+    fields を指定した場合、各タスクはそのフィールドだけを含む。
+    """
+    if fields is None:
+        items = [task_record(row) for row in page.items]
+    else:
+        items = [partial_record(row, fields) for row in page.items]
+    return {
+        "items": items,
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }
+
+
+def changes_content(changes: ChangeSet) -> dict[str, Any]:
+    """行タプルの差分を TaskChangesResponse と同じ形にする"""
+    return {
+        "changed": [task_record(row) for row in changes.changed],
+        "deleted": changes.deleted,
+        "watermark": changes.watermark,
+        "has_more": changes.has_more,
+    }
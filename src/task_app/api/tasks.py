@@ -1,27 +1,230 @@
 """タスク API ルーター"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import io
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any, Literal
+
+import anyio.from_thread
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
+from task_app import database
+from task_app.api.conditional import (
+    if_match_version,
+    is_not_modified,
+    not_modified,
+    page_etag,
+    task_etag,
+    validator_headers,
+)
+from task_app.api.responses import FastJSONResponse, changes_content, page_content
+from task_app.batching import WriteBatcher
+from task_app.cache import CacheBackend, LRUCache
+from task_app.config import settings
 from task_app.database import get_db
-from task_app.repositories.task import TaskRepository
-from task_app.schemas.task import TaskCreate, TaskResponse
+from task_app.events import EventBroker, Subscription, sse_stream
+from task_app.importer import DEFAULT_BATCH_SIZE
+from task_app.models.task import Task
+from task_app.replicas import RoutingSession
+from task_app.repositories.pagination import InvalidCursorError, TaskPage
+from task_app.repositories.task import TaskRepository, TaskVersionConflictError
+from task_app.schemas.task import (
+    TaskBulkDelete,
+    TaskBulkResponse,
+    TaskBulkUpdate,
+    TaskChangesResponse,
+    TaskCreate,
+    TaskFilter,
+    TaskImportResponse,
+    TaskOrderBy,
+    TaskPageResponse,
+    TaskResponse,
+    TaskStatsResponse,
+    TaskUpdate,
+)
+from task_app.serializers import (
+    RESPONSE_FIELDS,
+    iter_csv,
+    iter_ndjson,
+    task_record,
+)
 from task_app.services.task import TaskService
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# 一括作成APIで1リクエストあたりに受け付ける最大件数
+MAX_BULK_CREATE = 10_000
+# 一覧APIの ids で1リクエストあたりに指定できる最大のID数
+MAX_IDS = 500
+
+# プロセス内で共有するタスクキャッシュ
+task_cache: CacheBackend | None = (
+    LRUCache(max_size=settings.task_cache_max_size, ttl=settings.task_cache_ttl)
+    if settings.task_cache_enabled
+    else None
+)
+
+
+# 書き込みのグループコミット（WRITE_BATCHING で有効にする）
+write_batcher: WriteBatcher | None = (
+    WriteBatcher(
+        database.engine,
+        max_batch_size=settings.write_batch_max_size,
+        max_delay_ms=settings.write_batch_max_delay_ms,
+    )
+    if settings.write_batching
+    else None
+)
+
+
+# タスクの変更フィード（GET /tasks/stream と /tasks/ws の購読者に配信する）
+task_events = EventBroker(max_queue_size=settings.event_queue_size)
+
+
+def get_task_cache() -> CacheBackend | None:
+    """タスクキャッシュの依存性注入"""
+    return task_cache
 
-def get_task_service(db: Session = Depends(get_db)) -> TaskService:
-    """TaskServiceの依存性注入"""
+
+def get_write_batcher() -> WriteBatcher | None:
+    """書き込みバッチの依存性注入"""
+    return write_batcher
+
+
+def get_task_events() -> EventBroker:
+    """変更フィードの依存性注入"""
+    return task_events
+
+
+def get_task_service(
+    db: Session = Depends(get_db),
+    cache: CacheBackend | None = Depends(get_task_cache),
+    batcher: WriteBatcher | None = Depends(get_write_batcher),
+    events: EventBroker = Depends(get_task_events),
+    consistency: str | None = Header(None, alias="X-Consistency"),
+) -> TaskService:
+    """
+    TaskServiceの依存性注入
+
+    リクエストヘッダ "X-Consistency: strong" が指定された場合は、読み込みも
+    プライマリで行い、直前の書き込みを確実に読めるようにする。
+    """
+    if consistency == "strong" and isinstance(db, RoutingSession):
+        db.force_primary = True
     repository = TaskRepository(db)
-    return TaskService(repository)
+    return TaskService(repository, cache, batcher, events)
+
+
+def get_task_filter(
+    completed: bool | None = Query(None),
+    created_after: datetime | None = Query(None),
+    created_before: datetime | None = Query(None),
+    updated_after: datetime | None = Query(None),
+    updated_before: datetime | None = Query(None),
+    title_prefix: str | None = Query(None, min_length=1, max_length=255),
+) -> TaskFilter:
+    """
+    クエリパラメータからタスク一覧の絞り込み条件を組み立てる
+
+    Args:
+        completed: 完了状態
+        created_after: 作成日時の下限（この日時を含む）
+        created_before: 作成日時の上限（この日時を含まない）
+        updated_after: 更新日時の下限（この日時を含む）
+        updated_before: 更新日時の上限（この日時を含まない）
+        title_prefix: タイトルの前方一致
+
+    Returns:
+        TaskFilter: 絞り込み条件
+    """
+    return TaskFilter(
+        completed=completed,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        title_prefix=title_prefix,
+    )
+
+
+def get_task_ids(
+    ids: str | None = Query(None, description="取得するタスクのID（カンマ区切り）"),
+) -> list[int] | None:
+    """
+    クエリパラメータ ids（例: "1,2,3"）をタスクIDのリストにする
+
+    Args:
+        ids: カンマ区切りのタスクID
+
+    Returns:
+        list[int] | None: タスクID（指定されていない場合はNone）
+
+    Raises:
+        HTTPException: 整数でない値を含む場合、または件数が 1〜MAX_IDS でない場合
+    """
+    if ids is None:
+        return None
+    try:
+        task_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="ids が不正です"
+        )
+    if not 1 <= len(task_ids) <= MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids は1〜{MAX_IDS}件で指定してください",
+        )
+    return task_ids
+
+
+def get_task_fields(
+    fields: str | None = Query(None, description="返すフィールド（カンマ区切り）"),
+) -> tuple[str, ...] | None:
+    """
+    クエリパラメータ fields（例: "id,title,completed"）をフィールド名にする
+
+    Args:
+        fields: カンマ区切りのフィールド名（TaskResponse のフィールド）
+
+    Returns:
+        tuple[str, ...] | None: 重複を除いたフィールド名（指定されていない場合はNone）
+
+    Raises:
+        HTTPException: 空の場合、または TaskResponse にないフィールドを含む場合
+    """
+    if fields is None:
+        return None
+    names = tuple(dict.fromkeys(p.strip() for p in fields.split(",") if p.strip()))
+    unknown = [name for name in names if name not in RESPONSE_FIELDS]
+    if not names or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"fields が不正です: {fields}",
+        )
+    return names
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 def create_task(
     task_in: TaskCreate,
     service: TaskService = Depends(get_task_service),
-) -> TaskResponse:
+) -> Task:
     """
     新しいタスクを作成する
 
@@ -34,3 +237,605 @@ def create_task(
     """
     task = service.create(task_in)
     return task
+
+
+@router.post(
+    "/bulk", response_model=list[TaskResponse], status_code=status.HTTP_201_CREATED
+)
+def create_tasks_bulk(
+    tasks_in: list[TaskCreate] = Body(..., max_length=MAX_BULK_CREATE),
+    service: TaskService = Depends(get_task_service),
+) -> list[Task]:
+    """
+    複数のタスクを一括作成する
+
+    すべてのタスクは1トランザクションで作成され、1件でも失敗した場合は
+    いずれのタスクも作成されない。
+
+    Args:
+        tasks_in: タスク作成データのリスト
+        service: TaskServiceインスタンス
+
+    Returns:
+        list[TaskResponse]: 作成されたタスク（リクエストと同じ順序）
+    """
+    return service.create_many(tasks_in)
+
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+def update_tasks_bulk(
+    bulk_in: TaskBulkUpdate,
+    service: TaskService = Depends(get_task_service),
+) -> TaskBulkResponse:
+    """
+    複数のタスクを一括更新する
+
+    ids または filters で指定したタスクに同じ変更を、1トランザクションの
+    UPDATE 文で適用する。
+
+    Args:
+        bulk_in: 対象（ids / filters）と変更内容
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskBulkResponse: 更新したタスクのID
+    """
+    ids = service.update_many(bulk_in.changes, ids=bulk_in.ids, filters=bulk_in.filters)
+    return TaskBulkResponse(ids=ids)
+
+
+@router.delete("/bulk", response_model=TaskBulkResponse)
+def delete_tasks_bulk(
+    bulk_in: TaskBulkDelete,
+    service: TaskService = Depends(get_task_service),
+) -> TaskBulkResponse:
+    """
+    複数のタスクを一括削除する
+
+    ids または filters で指定したタスクを、1トランザクションの DELETE 文で
+    削除する。
+
+    Args:
+        bulk_in: 対象（ids / filters）
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskBulkResponse: 削除したタスクのID
+    """
+    ids = service.delete_many(ids=bulk_in.ids, filters=bulk_in.filters)
+    return TaskBulkResponse(ids=ids)
+
+
+class _RequestBodyReader(io.RawIOBase):
+    """
+    リクエストボディを同期的に読み込むファイルオブジェクト
+
+    スレッドプールで動く解析処理から、イベントループ上の request.stream() を
+    チャンク単位で読み進める。ボディ全体を保持しないため、メモリ使用量は
+    ボディの大きさによらない。
+    """
+
+    def __init__(self, request: Request) -> None:
+        self._chunks = request.stream()
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            chunk = anyio.from_thread.run(self._next_chunk)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    async def _next_chunk(self) -> bytes | None:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+
+@router.post("/import", response_model=TaskImportResponse)
+async def import_tasks(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BULK_CREATE),
+    service: TaskService = Depends(get_task_service),
+) -> TaskImportResponse:
+    """
+    NDJSON / CSV のリクエストボディからタスクを一括インポートする
+
+    ボディは受信しながらスレッドプールで行ごとに解析・保存し、全体を
+    メモリや一時ファイルに保持しない。batch_size 件ごとに1トランザクションで作成し、
+    不正な行は行番号付きのエラーとして返す。
+
+    Args:
+        request: リクエスト（ボディをストリームとして読み込む）
+        format: 入力形式（ndjson または csv）
+        batch_size: 1トランザクションで作成する件数
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskImportResponse: 作成件数・行ごとのエラー・処理速度
+    """
+    body = io.BufferedReader(_RequestBodyReader(request))
+    stream = io.TextIOWrapper(body, encoding="utf-8-sig", newline="")
+    result = await run_in_threadpool(service.import_tasks, stream, format, batch_size)
+    return TaskImportResponse.model_validate(result)
+
+
+@router.get(
+    "",
+    response_model=TaskPageResponse,
+    responses={304: {"description": "前回取得時から変更なし"}},
+)
+def list_tasks(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    order_by: TaskOrderBy = Query("id"),
+    filters: TaskFilter = Depends(get_task_filter),
+    ids: list[int] | None = Depends(get_task_ids),
+    fields: tuple[str, ...] | None = Depends(get_task_fields),
+    service: TaskService = Depends(get_task_service),
+) -> Response:
+    """
+    タスク一覧を条件で絞り込み、カーソルページネーションで取得する
+
+    例: 未完了のタスクを新しい順に取得する場合は
+    ``?completed=false&order_by=-created_at``
+
+    ``?ids=1,2,3`` を指定した場合は、それらのタスクを1回のクエリで指定した順に
+    返す（存在しないIDは含まれず、limit / cursor / order_by は使わない）。
+    ``?fields=id,title`` を指定した場合は、そのフィールドだけを取得して返す。
+
+    ページの内容から求めた ETag を返し、If-None-Match が一致する場合は
+    304 Not Modified を返す。タスクは行タプルで取得し、TaskResponse を経由
+    せずにJSONにする。
+
+    Args:
+        request: リクエスト（条件付きGETのヘッダを参照する）
+        limit: 1ページあたりの最大件数
+        cursor: 前回レスポンスの next_cursor / prev_cursor
+        order_by: 並び順のキー（"-" を付けると降順）
+        filters: 絞り込み条件
+        ids: 取得するタスクのID
+        fields: 返すフィールド
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskPageResponse: タスクのリストと前後ページのカーソル
+    """
+    try:
+        if ids is not None:
+            page = TaskPage(items=service.get_many(ids, filters=filters, fields=fields))
+        else:
+            page = service.get_page(
+                limit=limit,
+                cursor=cursor,
+                order_by=order_by,
+                filters=filters,
+                rows=True,
+                fields=fields,
+            )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="カーソルが不正です"
+        )
+    headers = validator_headers(page_etag(page, fields))
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified(headers)
+    return FastJSONResponse(page_content(page, fields), headers=headers)
+
+
+@router.get("/changes", response_model=TaskChangesResponse)
+def get_task_changes(
+    since: str | None = Query(None),
+    limit: int = Query(500, ge=1, le=1000),
+    service: TaskService = Depends(get_task_service),
+) -> Response:
+    """
+    前回の同期以降に作成・更新・削除されたタスクを取得する（差分同期）
+
+    レスポンスの watermark を次回の since に指定すると、それ以降の変更だけが
+    返るため、同期の通信量はタスクの総数ではなく変更の件数に比例する。
+    has_more が true の間は、返された watermark で続けて取得する。
+    直前（SETTLE_TIME 以内）の変更は、実行中のトランザクションが後からそれより
+    古い変更をコミットする可能性があるため、次回の同期でも再び返る。
+
+    Args:
+        since: 前回レスポンスの watermark（省略時はすべてのタスク）
+        limit: 作成・更新、削除それぞれの最大件数
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskChangesResponse: 変更されたタスク、削除されたタスクのID、watermark
+    """
+    try:
+        changes = service.get_changes(since=since, limit=limit, rows=True)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="watermark が不正です"
+        )
+    return FastJSONResponse(changes_content(changes))
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+def get_task_stats(
+    filters: TaskFilter = Depends(get_task_filter),
+    service: TaskService = Depends(get_task_service),
+) -> TaskStatsResponse:
+    """
+    タスクの件数（全体・完了・未完了）を取得する
+
+    絞り込み条件を指定しない場合は、書き込みと同じトランザクションで更新される
+    集計テーブルから取得するため、タスクの件数に関わらず一定時間で返る。
+
+    Args:
+        filters: 絞り込み条件（GET /tasks と同じクエリパラメータ）
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskStatsResponse: タスクの件数
+    """
+    return TaskStatsResponse.model_validate(service.get_stats(filters))
+
+
+@router.get("/search", response_model=list[TaskResponse])
+def search_tasks(
+    q: str = Query(..., min_length=1, max_length=255, pattern=r"\S"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    service: TaskService = Depends(get_task_service),
+) -> Response:
+    """
+    タイトルと説明を全文検索する
+
+    全文検索インデックス（SQLite は FTS5、PostgreSQL は GIN）を使うため、
+    件数が増えても検索時間はほぼ一定に保たれる。
+
+    Args:
+        q: 検索語（空白区切りの語をすべて含むタスクを返す）
+        limit: 取得する最大件数
+        offset: スキップする件数
+        service: TaskServiceインスタンス
+
+    Returns:
+        list[TaskResponse]: 関連度の高い順のタスク
+    """
+    rows = service.search(q, limit=limit, offset=offset, rows=True)
+    return FastJSONResponse([task_record(row) for row in rows])
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_tasks(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    service: TaskService = Depends(get_task_service),
+) -> StreamingResponse:
+    """
+    すべてのタスクをストリーミングでエクスポートする
+
+    データベースから少しずつ読み込みながら送信するため、件数に関わらず
+    メモリ使用量は一定で、最初のバイトもすぐに送信される。
+
+    Args:
+        format: 出力形式（ndjson または csv）
+        service: TaskServiceインスタンス
+
+    Returns:
+        StreamingResponse: NDJSON または CSV のストリーム
+    """
+    rows = service.stream_all()
+    if format == "csv":
+        body, media_type = iter_csv(rows), "text/csv; charset=utf-8"
+    else:
+        body, media_type = iter_ndjson(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_task_events(
+    events: EventBroker = Depends(get_task_events),
+) -> StreamingResponse:
+    """
+    タスクの変更を Server-Sent Events で配信する
+
+    タスクの作成・更新・完了状態の変更・削除がコミットされるたびに、
+    event が created / updated / completed / deleted のイベントを送信する。
+    data は {"type", "id", "task"} のJSONで、task は変更後のタスク
+    （削除と一括更新では null）。読み出しが遅れてイベントが溢れた場合は
+    resync イベントを送るので、GET /tasks/changes で変更を取得し直すこと。
+
+    Args:
+        events: 変更フィード
+
+    Returns:
+        StreamingResponse: text/event-stream のストリーム
+    """
+    return StreamingResponse(
+        sse_stream(events.subscribe(), settings.event_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _close_on_disconnect(
+    websocket: WebSocket, subscription: Subscription
+) -> None:
+    """クライアントが切断したら購読を終了する（受信したメッセージは無視する）"""
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        subscription.close()
+
+
+@router.websocket("/ws")
+async def task_events_websocket(
+    websocket: WebSocket,
+    events: EventBroker = Depends(get_task_events),
+) -> None:
+    """
+    タスクの変更を WebSocket で配信する
+
+    GET /tasks/stream の data と同じJSONを、イベントごとに1つのテキスト
+    メッセージとして送信する。
+
+    Args:
+        websocket: WebSocket接続
+        events: 変更フィード
+    """
+    # 接続の確立を待つクライアントが、直後の変更を取りこぼさないように先に購読する
+    with events.subscribe() as subscription:
+        await websocket.accept()
+        watcher = asyncio.create_task(_close_on_disconnect(websocket, subscription))
+        try:
+            while (event := await subscription.get()) is not None:
+                await websocket.send_text(event.data)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            watcher.cancel()
+
+
+@router.get(
+    "/{task_id}",
+    response_model=TaskResponse,
+    responses={
+        304: {"description": "前回取得時から変更なし"},
+        404: {"description": "タスクが存在しない"},
+    },
+)
+def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    service: TaskService = Depends(get_task_service),
+) -> Task | Response:
+    """
+    IDでタスクを取得する
+
+    version から求めた ETag と updated_at の Last-Modified を返し、
+    If-None-Match または If-Modified-Since が一致する場合は本文なしの
+    304 Not Modified を返す。ETag は更新APIの If-Match にそのまま使える。
+
+    Args:
+        task_id: タスクID
+        request: リクエスト（条件付きGETのヘッダを参照する）
+        response: レスポンス（ETag / Last-Modified ヘッダを設定する）
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskResponse: タスク
+    """
+    task = service.get_including_archived(task_id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="タスクが見つかりません"
+        )
+    headers = validator_headers(task_etag(task), task.updated_at)
+    if is_not_modified(request, headers["ETag"], task.updated_at):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return task
+
+
+def parse_if_match(if_match: str | None, task_id: int) -> int | None:
+    """
+    If-Match ヘッダから更新の前提とするバージョンを取り出す
+
+    Args:
+        if_match: If-Match ヘッダ（ない場合はバージョンを確認しない）
+        task_id: タスクID
+
+    Returns:
+        int | None: 前提とするバージョン（If-Match がない場合はNone）
+
+    Raises:
+        HTTPException: If-Match が不正な場合（400）
+    """
+    if if_match is None:
+        return None
+    try:
+        return if_match_version(if_match, task_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="If-Match が不正です"
+        ) from None
+
+
+def version_conflict() -> HTTPException:
+    """更新が競合した場合（TaskVersionConflictError）の 409 Conflict"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="タスクは他の更新により変更されています",
+    )
+
+
+def written_task(task: Task | None, response: Response) -> Task:
+    """
+    更新後のタスクの ETag / Last-Modified をレスポンスに設定する
+
+    Args:
+        task: 更新後のタスク（存在しなかった場合はNone）
+        response: レスポンス
+
+    Returns:
+        Task: 更新後のタスク
+
+    Raises:
+        HTTPException: タスクが存在しない場合（404）
+    """
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="タスクが見つかりません"
+        )
+    response.headers.update(validator_headers(task_etag(task), task.updated_at))
+    return task
+
+
+def _conditional_write(
+    write: Callable[[int, int | None], Task | None],
+    task_id: int,
+    if_match: str | None,
+    response: Response,
+) -> Task:
+    """
+    If-Match を前提条件としてタスクを更新し、新しい ETag を設定する
+
+    Args:
+        write: タスクIDと前提とするバージョンを受け取って更新する関数
+        task_id: タスクID
+        if_match: If-Match ヘッダ（ない場合はバージョンを確認しない）
+        response: レスポンス（ETag / Last-Modified ヘッダを設定する）
+
+    Returns:
+        Task: 更新後のタスク
+    """
+    version = parse_if_match(if_match, task_id)
+    try:
+        task = write(task_id, version)
+    except TaskVersionConflictError:
+        raise version_conflict() from None
+    return written_task(task, response)
+
+
+CONDITIONAL_WRITE_RESPONSES: dict[int | str, dict[str, Any]] = {
+    400: {"description": "If-Match が不正"},
+    404: {"description": "タスクが存在しない"},
+    409: {"description": "If-Match のバージョンが現在のバージョンと異なる"},
+}
+
+
+@router.patch(
+    "/{task_id}", response_model=TaskResponse, responses=CONDITIONAL_WRITE_RESPONSES
+)
+def update_task(
+    task_id: int,
+    task_in: TaskUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    service: TaskService = Depends(get_task_service),
+) -> Task:
+    """
+    タスクを更新する
+
+    If-Match に GET で得た ETag を指定すると、その後に他の更新があった場合は
+    上書きせずに 409 Conflict を返す（楽観的排他制御）。If-Match がない場合も、
+    読み込みから書き込みまでの間に競合した更新は 409 になる。
+
+    Args:
+        task_id: タスクID
+        task_in: 更新データ（指定した項目だけを更新する）
+        response: レスポンス（更新後の ETag を設定する）
+        if_match: 更新の前提とする ETag
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskResponse: 更新後のタスク
+    """
+    return _conditional_write(
+        lambda task_id, version: service.update(
+            task_id, task_in, expected_version=version
+        ),
+        task_id,
+        if_match,
+        response,
+    )
+
+
+@router.post(
+    "/{task_id}/{action}",
+    response_model=TaskResponse,
+    responses=CONDITIONAL_WRITE_RESPONSES,
+)
+def change_task_completion(
+    task_id: int,
+    action: Literal["complete", "incomplete", "toggle"],
+    response: Response,
+    if_match: str | None = Header(default=None),
+    service: TaskService = Depends(get_task_service),
+) -> Task:
+    """
+    タスクを完了 / 未完了にする、または完了状態をトグルする
+
+    If-Match の扱いは PATCH /tasks/{task_id} と同じ。
+
+    Args:
+        task_id: タスクID
+        action: complete / incomplete / toggle
+        response: レスポンス（更新後の ETag を設定する）
+        if_match: 更新の前提とする ETag
+        service: TaskServiceインスタンス
+
+    Returns:
+        TaskResponse: 更新後のタスク
+    """
+    write = {
+        "complete": service.mark_complete,
+        "incomplete": service.mark_incomplete,
+        "toggle": service.toggle_complete,
+    }[action]
+    return _conditional_write(
+        lambda task_id, version: write(task_id, expected_version=version),
+        task_id,
+        if_match,
+        response,
+    )
+
+
+@router.delete(
+    "/{task_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={404: {"description": "タスクが存在しない"}},
+)
+def delete_task(
+    task_id: int,
+    service: TaskService = Depends(get_task_service),
+) -> Response:
+    """
+    タスクを削除する
+
+    削除は差分同期（GET /tasks/changes）の deleted として通知される。
+
+    Args:
+        task_id: タスクID
+        service: TaskServiceインスタンス
+
+    Returns:
+        Response: 本文なしの 204 No Content
+    """
+    if not service.delete(task_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="タスクが見つかりません"
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
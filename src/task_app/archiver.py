@@ -0,0 +1,109 @@
+"""完了済みタスクのアーカイブ
+
+完了してから保持期間を過ぎたタスクを tasks から tasks_archive に移し、
+よく使われる tasks のテーブル・インデックス・全文検索インデックスを小さく保つ
+（repositories.archive）。ArchiveScheduler はバックグラウンドのスレッドで
+一定の間隔ごとにアーカイブを実行する。同じ処理は scripts/archive_tasks.py で
+手動でも実行できる。
+"""
+
+import logging
+import threading
+from datetime import timedelta
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import sessionmaker
+
+from task_app.metrics import ARCHIVE_FAILURES, TASKS_ARCHIVED
+from task_app.models.task import utc_now
+from task_app.repositories.task import TaskRepository
+from task_app.services.task import TaskService
+
+logger = logging.getLogger(__name__)
+
+# アーカイブを実行する間隔の秒数
+DEFAULT_INTERVAL = 3600.0
+# 1トランザクションで移動する最大のタスク数
+DEFAULT_BATCH_SIZE = 500
+
+
+class ArchiveScheduler:
+    """
+    完了済みタスクのアーカイブを定期的に実行する
+
+    interval 秒ごとに、最後の更新から retention 以上経った完了済みタスクを
+    batch_size 件ずつアーカイブに移す。各バッチは短いトランザクションで
+    コミットするため、アーカイブ中もAPIの書き込みを長く待たせない。
+
+    Args:
+        engine: タスクのデータベースのエンジン
+        retention: 完了済みタスクを tasks に残す期間
+        interval: アーカイブを実行する間隔の秒数
+        batch_size: 1トランザクションで移動する最大のタスク数
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        retention: timedelta,
+        interval: float = DEFAULT_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._session_factory = sessionmaker(bind=engine)
+        self.retention = retention
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> int:
+        """
+        保持期間を過ぎた完了済みタスクをすべてアーカイブする
+
+        Returns:
+            int: アーカイブしたタスク数
+        """
+        cutoff = utc_now() - self.retention
+        archived = 0
+        with self._session_factory() as db:
+            service = TaskService(TaskRepository(db))
+            # stop() で止められるように1バッチずつ実行する
+            while not self._stop.is_set():
+                moved = service.archive_completed(
+                    cutoff, batch_size=self.batch_size, max_batches=1
+                )
+                archived += moved
+                TASKS_ARCHIVED.inc(amount=moved)
+                if moved < self.batch_size:
+                    break
+        if archived:
+            logger.info("Archived %d completed tasks", archived)
+        return archived
+
+    def start(self) -> None:
+        """バックグラウンドのスレッドを開始する（最初のアーカイブはすぐに行う）"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="task-archive-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """スレッドを止める（実行中のバッチは最後までコミットする）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                ARCHIVE_FAILURES.inc()
+                logger.warning("Archiving completed tasks failed", exc_info=True)
+            self._stop.wait(self.interval)
@@ -0,0 +1,298 @@
+"""書き込みのグループコミット
+
+リクエストごとにトランザクションをコミットすると、SQLite ではリクエストごとに
+fsync が発生し、書き込みはデータベースのロックで直列化される。WriteBatcher は
+同時に届いた書き込み操作をキューに集め、バックグラウンドのスレッドで
+1つのトランザクションにまとめてコミットする。書き込みのスループットは
+リクエスト数ではなくコミット（バッチ）の回数で決まるようになる。
+
+各操作は Session を受け取ってフラッシュまで行う関数で、呼び出し側は
+submit が返す Future で自分の操作の結果（作成したタスクなど）を受け取る。
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
+
+from sqlalchemy import CursorResult, Engine, insert, not_, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from task_app.metrics import WRITE_BATCH_FALLBACKS, WRITE_BATCH_SIZE
+from task_app.models.outbox import TaskOutboxEvent
+from task_app.models.task import Task
+from task_app.repositories.outbox import event_rows
+from task_app.repositories.statements import completed_update, task_values
+from task_app.repositories.task import TaskVersionConflictError
+from task_app.schemas.task import TaskCreate, TaskUpdate
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Session を受け取り、変更をフラッシュして結果を返す操作（コミットはしない）
+WriteOp = Callable[[Session], T]
+
+# 1バッチにまとめる最大の操作数
+DEFAULT_MAX_BATCH_SIZE = 100
+# 最初の操作が届いてから、後続の操作を待つ最大時間（ミリ秒）
+DEFAULT_MAX_DELAY_MS = 2.0
+
+_STOP = object()
+
+
+@dataclass
+class _Pending:
+    """キューに入った操作と、その結果を受け取る Future"""
+
+    op: WriteOp[Any]
+    future: Future[Any] = field(default_factory=Future)
+
+
+class WriteBatcher:
+    """
+    書き込み操作をまとめて1トランザクションでコミットする
+
+    最初の操作が届くと、max_delay_ms が経過するか max_batch_size 件に達する
+    まで後続の操作を集め、順に実行してから1回だけコミットする。コミット中に
+    届いた操作は次のバッチになるため、負荷が高いほどバッチが大きくなる。
+
+    操作が変更をフラッシュする前に TaskVersionConflictError を送出した場合は
+    その操作だけを失敗させ、同じバッチの他の操作は続ける。それ以外の例外や
+    コミットの失敗ではバッチをロールバックし、各操作を個別のトランザクションで
+    実行し直す。
+
+    Args:
+        engine: 書き込み先のエンジン
+        max_batch_size: 1バッチにまとめる最大の操作数
+        max_delay_ms: 後続の操作を待つ最大時間（0の場合は待たずに、
+            その時点でキューにある操作だけをまとめる）
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay_ms: float = DEFAULT_MAX_DELAY_MS,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        # コミット後も結果のタスクの属性を読めるように expire しない
+        self._session_factory = sessionmaker(
+            bind=engine, autoflush=False, expire_on_commit=False
+        )
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, op: WriteOp[T]) -> "Future[T]":
+        """
+        操作をキューに入れる
+
+        最初の呼び出しでバックグラウンドのスレッドを開始する。
+
+        Args:
+            op: Session を受け取り、変更をフラッシュして結果を返す関数
+
+        Returns:
+            Future: 操作の結果（コミット後に設定される）
+
+        Raises:
+            RuntimeError: close 後に呼び出した場合
+        """
+        pending = _Pending(op)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("WriteBatcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="task-write-batcher", daemon=True
+                )
+                self._thread.start()
+            self._queue.put(pending)
+        return pending.future
+
+    def execute(self, op: WriteOp[T]) -> T:
+        """操作をキューに入れ、コミットされるまで待って結果を返す"""
+        return self.submit(op).result()
+
+    def close(self) -> None:
+        """キューに残っている操作をすべてコミットしてからスレッドを止める"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(_STOP)
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: list[_Pending]) -> None:
+        """バッチを1トランザクションで実行する"""
+        outcomes: list[tuple[_Pending, object, BaseException | None]] = []
+        try:
+            with self._session_factory() as db:
+                for pending in batch:
+                    try:
+                        outcomes.append((pending, pending.op(db), None))
+                    except TaskVersionConflictError as exc:
+                        # フラッシュが失敗した場合はセッションを使い続けられない
+                        if not db.is_active:
+                            raise
+                        outcomes.append((pending, None, exc))
+                db.commit()
+        except Exception:
+            logger.warning(
+                "Write batch of %d failed; retrying each operation",
+                len(batch),
+                exc_info=True,
+            )
+            WRITE_BATCH_FALLBACKS.inc()
+            for pending in batch:
+                self._run_alone(pending)
+            return
+        WRITE_BATCH_SIZE.observe(len(batch))
+        for pending, result, error in outcomes:
+            if error is not None:
+                pending.future.set_exception(error)
+            else:
+                pending.future.set_result(result)
+
+    def _run_alone(self, pending: _Pending) -> None:
+        """操作を単独のトランザクションで実行する（バッチが失敗した場合）"""
+        try:
+            with self._session_factory() as db:
+                result = pending.op(db)
+                db.commit()
+        except Exception as exc:
+            pending.future.set_exception(exc)
+        else:
+            pending.future.set_result(result)
+
+
+# ---------------------------------------------------------------------------
+# タスクの書き込み操作
+#
+# TaskRepository の同名のメソッドと同じ変更（アウトボックスへのイベントの追加を
+# 含む）を行うが、コミットはバッチに任せる。
+# ---------------------------------------------------------------------------
+
+
+def _record(db: Session, event_type: str, task: Task) -> None:
+    """変更のイベントをアウトボックスに追加する（フラッシュ後に呼び出す）"""
+    db.execute(insert(TaskOutboxEvent), event_rows(event_type, [task.id], [task]))
+
+
+def create_op(task_in: TaskCreate) -> WriteOp[Task]:
+    """タスクを作成する操作"""
+
+    def op(db: Session) -> Task:
+        task = Task(**task_values(task_in))
+        db.add(task)
+        db.flush()
+        _record(db, "created", task)
+        return task
+
+    return op
+
+
+def _existing_task(
+    db: Session, task_id: int, expected_version: int | None
+) -> Task | None:
+    task = db.get(Task, task_id)
+    if task is not None and expected_version is not None:
+        if task.version != expected_version:
+            raise TaskVersionConflictError(task_id, expected_version)
+    return task
+
+
+def _flush_versioned(db: Session, task_id: int, expected_version: int | None) -> None:
+    # 他のプロセスが同じタスクを先に更新していれば version の条件で検出される
+    try:
+        db.flush()
+    except StaleDataError:
+        raise TaskVersionConflictError(task_id, expected_version) from None
+
+
+def update_op(
+    task_id: int, task_in: TaskUpdate, expected_version: int | None = None
+) -> WriteOp[Task | None]:
+    """タスクを更新する操作（存在しない場合は None）"""
+
+    def op(db: Session) -> Task | None:
+        task = _existing_task(db, task_id, expected_version)
+        if task is None:
+            return None
+        for name, value in task_in.model_dump(exclude_unset=True).items():
+            setattr(task, name, value)
+        _flush_versioned(db, task_id, expected_version)
+        _record(db, "updated", task)
+        return task
+
+    return op
+
+
+def completion_op(
+    task_id: int, completed: bool | None, expected_version: int | None = None
+) -> WriteOp[Task | None]:
+    """
+    タスクの完了状態を変更する操作（存在しない場合は None）
+
+    TaskRepository と同じく1つの UPDATE 文（completed_update）で変更する。
+    completed が None の場合は NOT completed でデータベースが反転するため、
+    他のプロセスのトグルと同時に実行されても互いの変更を失わない。
+    version の条件は expected_version を指定した場合だけ付ける。
+    """
+
+    def op(db: Session) -> Task | None:
+        stmt = completed_update(
+            task_id,
+            not_(Task.completed) if completed is None else completed,
+            expected_version,
+        )
+        if db.get_bind().dialect.update_returning:
+            task = db.scalars(
+                stmt.returning(Task), execution_options={"populate_existing": True}
+            ).first()
+        elif cast(CursorResult[Any], db.execute(stmt)).rowcount:
+            task = db.scalars(
+                select(Task).where(Task.id == task_id),
+                execution_options={"populate_existing": True},
+            ).first()
+        else:
+            task = None
+        if task is None:
+            if expected_version is not None and db.get(Task, task_id) is not None:
+                raise TaskVersionConflictError(task_id, expected_version)
+            return None
+        _record(db, "completed", task)
+        return task
+
+    return op
@@ -0,0 +1,184 @@
+"""タスクのキャッシュ層
+
+TaskService の読み込みをキャッシュするためのバックエンドを定義する。
+プロセス内で完結する LRUCache を標準実装とし、Redis などの外部キャッシュは
+CacheBackend プロトコルを実装することで差し替えられる。
+
+データベースから読み込んでキャッシュに保存するまでの間に、別のリクエストが
+同じタスクを更新して無効化すると、読み込んだ古い値が無効化の後に保存されて
+しまう。読み込みの前に generation でキーの世代を取得して set に渡すと、
+その間に無効化されたキーには保存しない。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from task_app.models.task import Task
+
+# キャッシュに保存するTaskのカラム
+TASK_CACHE_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "completed",
+    "created_at",
+    "updated_at",
+    "version",
+)
+
+# 無効化の世代を数えるカウンタの数（キーはハッシュでいずれかに割り当てる）
+GENERATION_STRIPES = 1024
+
+
+@dataclass
+class CacheStats:
+    """キャッシュのヒット/ミス/追い出しのカウンタ"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class CacheBackend(Protocol):
+    """キャッシュバックエンドのインターフェース"""
+
+    stats: CacheStats
+
+    def get(self, key: str) -> Any | None:
+        """キーに対応する値を返す。存在しない/期限切れの場合はNone"""
+        ...
+
+    def generation(self, key: str) -> int:
+        """キーの無効化の世代（delete / clear のたびに進む）"""
+        ...
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        """
+        値を保存する
+
+        generation を指定した場合、キーの世代がそれから進んでいれば
+        （読み込みの間に無効化されていれば）保存しない。
+        """
+        ...
+
+    def delete(self, key: str) -> None:
+        """値を削除する（存在しなくてもよい）"""
+        ...
+
+    def clear(self) -> None:
+        """すべての値を削除する"""
+        ...
+
+
+class LRUCache:
+    """
+    TTLとサイズ上限付きのプロセス内LRUキャッシュ
+
+    スレッドセーフ。サイズ上限を超えると最も長く参照されていないエントリを
+    追い出す。プロセス内のキャッシュのため、複数ワーカー間では無効化が
+    伝播しない（他ワーカーの更新はTTL経過後に反映される）。
+
+    無効化の世代はキーのハッシュで GENERATION_STRIPES 個のカウンタに
+    分けて数えるため、メモリは無効化したキーの数によらず一定。同じカウンタを
+    共有する別のキーの無効化でも保存を見送ることがあるが、次の読み込みで
+    保存される。
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float | None = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        LRUCacheを初期化する
+
+        Args:
+            max_size: 保持する最大エントリ数
+            ttl: エントリの有効期間（秒）。Noneの場合は期限なし
+            clock: 現在時刻（秒）を返す関数
+        """
+        if max_size < 1:
+            raise ValueError("max_size は1以上にしてください")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._generations = [0] * GENERATION_STRIPES
+        self._lock = threading.Lock()
+
+    def _stripe(self, key: str) -> int:
+        return hash(key) % GENERATION_STRIPES
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations[self._stripe(key)]
+
+    def set(self, key: str, value: Any, generation: int | None = None) -> None:
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            if (
+                generation is not None
+                and self._generations[self._stripe(key)] != generation
+            ):
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generations[self._stripe(key)] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generations = [count + 1 for count in self._generations]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def task_cache_key(task_id: int) -> str:
+    """タスクIDのキャッシュキー"""
+    return f"task:{task_id}"
+
+
+def task_to_cache(task: Task) -> dict[str, Any]:
+    """Taskをキャッシュに保存する値（カラムの辞書）に変換する"""
+    return {field: getattr(task, field) for field in TASK_CACHE_FIELDS}
+
+
+def task_from_cache(value: dict[str, Any]) -> Task:
+    """
+    キャッシュの値からTaskを復元する
+
+    セッションに属さない一時的なインスタンスを返すため、呼び出し側が変更しても
+    キャッシュやデータベースには影響しない。
+    """
+    return Task(**value)
@@ -0,0 +1,158 @@
+"""アプリケーション設定（環境変数から読み込む）"""
+
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    """環境変数を整数として読み込む"""
+    value = os.getenv(name)
+    return default if value is None else int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    """環境変数を浮動小数点数として読み込む"""
+    value = os.getenv(name)
+    return default if value is None else float(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """環境変数を真偽値として読み込む"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """アプリケーション設定"""
+
+    # データベースURL（デフォルトはSQLite）
+    database_url: str = "sqlite:///./task_app.db"
+    # 非同期モードを有効にするか
+    async_db: bool = False
+    # 非同期エンジンのURL（Noneの場合は database_url から導出）
+    async_database_url: str | None = None
+    # リードレプリカのURL（環境変数ではカンマ区切り）
+    database_replica_urls: tuple[str, ...] = ()
+    # レプリカの選択方式（round_robin / least_connections）
+    replica_selection: str = "round_robin"
+
+    # コネクションプール（SQLiteのインメモリDBでは無視される）
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    # 接続を再作成するまでの秒数（-1で無効）
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+
+    # SQLite PRAGMA（接続ごとに設定する）
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    # 負の値は KiB 単位（-65536 = 64MiB）
+    sqlite_cache_size: int = -65536
+
+    # SQLのプロファイリング（スロークエリログとN+1検出）
+    query_profiling: bool = False
+    slow_query_ms: float = 100.0
+    n_plus_one_threshold: int = 10
+    query_explain: bool = True
+
+    # タスクキャッシュ（プロセス内LRU、オプトイン）
+    # 無効化はワーカー内だけのため、複数ワーカーでは他のワーカーの更新が
+    # task_cache_ttl の間は反映されない
+    task_cache_enabled: bool = False
+    task_cache_max_size: int = 10_000
+    task_cache_ttl: float = 30.0
+
+    # 書き込みのグループコミット（作成・更新・完了状態の変更をまとめてコミット）
+    # 同期版のエンドポイントだけに適用され、async_db の非同期版のエンドポイントは
+    # バッチを使わずにリクエストごとにコミットする
+    write_batching: bool = False
+    write_batch_max_size: int = 100
+    write_batch_max_delay_ms: float = 2.0
+
+    # 変更フィード（SSE / WebSocket）
+    event_queue_size: int = 100
+    event_heartbeat_seconds: float = 15.0
+
+    # アウトボックスの配信先（file:// または http(s)://。Noneの場合は配信しない）
+    outbox_sink_url: str | None = None
+    outbox_batch_size: int = 100
+    outbox_poll_interval: float = 1.0
+
+    # 完了済みタスクのアーカイブ（保持日数。Noneの場合はアーカイブしない）
+    archive_retention_days: float | None = None
+    archive_interval_seconds: float = 3600.0
+    archive_batch_size: int = 500
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """環境変数から設定を読み込む"""
+        return cls(
+            database_url=os.getenv("DATABASE_URL", cls.database_url),
+            async_db=_env_bool("DATABASE_ASYNC", cls.async_db),
+            async_database_url=os.getenv("ASYNC_DATABASE_URL"),
+            database_replica_urls=tuple(
+                url.strip()
+                for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+                if url.strip()
+            ),
+            replica_selection=os.getenv("REPLICA_SELECTION", cls.replica_selection),
+            pool_size=_env_int("DB_POOL_SIZE", cls.pool_size),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", cls.max_overflow),
+            pool_timeout=_env_float("DB_POOL_TIMEOUT", cls.pool_timeout),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", cls.pool_recycle),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", cls.pool_pre_ping),
+            sqlite_journal_mode=os.getenv(
+                "SQLITE_JOURNAL_MODE", cls.sqlite_journal_mode
+            ),
+            sqlite_synchronous=os.getenv("SQLITE_SYNCHRONOUS", cls.sqlite_synchronous),
+            sqlite_busy_timeout_ms=_env_int(
+                "SQLITE_BUSY_TIMEOUT_MS", cls.sqlite_busy_timeout_ms
+            ),
+            sqlite_mmap_size=_env_int("SQLITE_MMAP_SIZE", cls.sqlite_mmap_size),
+            sqlite_cache_size=_env_int("SQLITE_CACHE_SIZE", cls.sqlite_cache_size),
+            query_profiling=_env_bool("QUERY_PROFILING", cls.query_profiling),
+            slow_query_ms=_env_float("SLOW_QUERY_MS", cls.slow_query_ms),
+            n_plus_one_threshold=_env_int(
+                "N_PLUS_ONE_THRESHOLD", cls.n_plus_one_threshold
+            ),
+            query_explain=_env_bool("QUERY_EXPLAIN", cls.query_explain),
+            task_cache_enabled=_env_bool("TASK_CACHE_ENABLED", cls.task_cache_enabled),
+            task_cache_max_size=_env_int(
+                "TASK_CACHE_MAX_SIZE", cls.task_cache_max_size
+            ),
+            task_cache_ttl=_env_float("TASK_CACHE_TTL", cls.task_cache_ttl),
+            write_batching=_env_bool("WRITE_BATCHING", cls.write_batching),
+            write_batch_max_size=_env_int(
+                "WRITE_BATCH_MAX_SIZE", cls.write_batch_max_size
+            ),
+            write_batch_max_delay_ms=_env_float(
+                "WRITE_BATCH_MAX_DELAY_MS", cls.write_batch_max_delay_ms
+            ),
+            event_queue_size=_env_int("EVENT_QUEUE_SIZE", cls.event_queue_size),
+            event_heartbeat_seconds=_env_float(
+                "EVENT_HEARTBEAT_SECONDS", cls.event_heartbeat_seconds
+            ),
+            outbox_sink_url=os.getenv("OUTBOX_SINK_URL") or None,
+            outbox_batch_size=_env_int("OUTBOX_BATCH_SIZE", cls.outbox_batch_size),
+            outbox_poll_interval=_env_float(
+                "OUTBOX_POLL_INTERVAL", cls.outbox_poll_interval
+            ),
+            archive_retention_days=(
+                float(os.environ["ARCHIVE_RETENTION_DAYS"])
+                if os.getenv("ARCHIVE_RETENTION_DAYS")
+                else None
+            ),
+            archive_interval_seconds=_env_float(
+                "ARCHIVE_INTERVAL_SECONDS", cls.archive_interval_seconds
+            ),
+            archive_batch_size=_env_int("ARCHIVE_BATCH_SIZE", cls.archive_batch_size),
+        )
+
+
+settings = Settings.from_env()
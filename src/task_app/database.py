@@ -1,23 +1,144 @@
 """データベース設定と初期化"""
 
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from collections.abc import AsyncIterator
+from typing import Any
 
-# データベースURL（環境変数から取得、デフォルトはSQLite）
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./task_app.db")
-
-# SQLAlchemy エンジン
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
 )
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+
+from task_app.config import Settings, settings
+from task_app.metrics import instrument_engine
+from task_app.replicas import RoutingSession, make_selector
+
+# データベースURL（環境変数 DATABASE_URL から取得、デフォルトはSQLite）
+DATABASE_URL = settings.database_url
+
+# 同期ドライバ名 → 非同期ドライバ名
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# PRAGMA に埋め込むため、許可する値を限定する
+SQLITE_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    """SQLiteのインメモリデータベースかどうか"""
+    parsed = make_url(url)
+    return parsed.database in (None, "", ":memory:") or (
+        parsed.query.get("mode") == "memory"
+    )
+
+
+def engine_options(url: str, config: Settings = settings) -> dict[str, Any]:
+    """
+    設定からエンジン作成時のオプションを組み立てる。
+
+    SQLiteのインメモリDBは単一接続のプールを使うため、プールサイズ関連の
+    オプションは指定しない。
+    """
+    options: dict[str, Any] = {"pool_pre_ping": config.pool_pre_ping}
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if _is_sqlite_memory(url):
+            return options
+    options.update(
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout,
+        pool_recycle=config.pool_recycle,
+    )
+    return options
+
+
+def install_sqlite_pragmas(
+    target: Engine, config: Settings = settings, memory: bool = False
+) -> None:
+    """
+    接続ごとにSQLiteのPRAGMAを設定するイベントを登録する。
+
+    WALモードでは読み込みが書き込みをブロックせず、synchronous=NORMAL と
+    組み合わせることでコミットごとのfsyncを減らせる。busy_timeout により
+    ロック競合時は即座に "database is locked" にならず待機する。
+    インメモリDBではジャーナルモードとmmapは意味を持たないため設定しない。
+    """
+    journal_mode = config.sqlite_journal_mode.upper()
+    synchronous = config.sqlite_synchronous.upper()
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"不正なSQLITE_JOURNAL_MODEです: {journal_mode}")
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"不正なSQLITE_SYNCHRONOUSです: {synchronous}")
+
+    pragmas = [
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}",
+        f"PRAGMA cache_size={int(config.sqlite_cache_size)}",
+    ]
+    if not memory:
+        pragmas += [
+            f"PRAGMA journal_mode={journal_mode}",
+            f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}",
+        ]
+
+    @event.listens_for(target, "connect")
+    def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def create_db_engine(url: str, config: Settings = settings) -> Engine:
+    """
+    設定に基づいて同期エンジンを作成する。
+
+    Args:
+        url: データベースURL
+        config: 使用する設定
+
+    Returns:
+        Engine: 作成したエンジン
+    """
+    db_engine = create_engine(url, **engine_options(url, config))
+    if db_engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(db_engine, config, memory=_is_sqlite_memory(url))
+    return db_engine
+
+
+# SQLAlchemy エンジン（プライマリ）
+engine = create_db_engine(DATABASE_URL)
+
+# リードレプリカのエンジン
+replica_engines = [create_db_engine(url) for url in settings.database_replica_urls]
 
 # セッションファクトリ
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# レプリカが設定されている場合は、読み込みをレプリカに振り分けるセッションを使う
+SessionLocal: sessionmaker[Session]
+if replica_engines:
+    SessionLocal = sessionmaker(
+        class_=RoutingSession,
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+        replicas=replica_engines,
+        selector=make_selector(settings.replica_selection),
+    )
+else:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 
-# ベースクラス
-Base = declarative_base()
+class Base(DeclarativeBase):
+    """モデルのベースクラス"""
 
 
 def get_db():
@@ -32,6 +153,64 @@ def get_db():
         db.close()
 
 
+def to_async_url(url: str) -> str:
+    """
+    同期用のデータベースURLを非同期ドライバのURLに変換する。
+
+    例: sqlite:///./task_app.db -> sqlite+aiosqlite:///./task_app.db
+    """
+    parsed = make_url(url)
+    if parsed.get_dialect().is_async:
+        return url
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"非同期ドライバが未対応のデータベースです: {url}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    非同期エンジンを取得する（初回呼び出し時に作成）。
+
+    aiosqlite / asyncpg は非同期モードでのみ必要なため、遅延して作成する。
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = settings.async_database_url or to_async_url(DATABASE_URL)
+        _async_engine = create_async_engine(url, **engine_options(url))
+        if _async_engine.dialect.name == "sqlite":
+            install_sqlite_pragmas(
+                _async_engine.sync_engine, memory=_is_sqlite_memory(url)
+            )
+        instrument_engine(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """非同期セッションファクトリを取得する"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        # 非同期セッションでは属性の遅延ロードができないため、
+        # コミット後も読み込み済みの値を保持する
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    非同期データベースセッションを取得するジェネレータ。
+    非同期モードのFastAPIの依存性注入で使用。
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+
 def init_db(engine_instance=None):
     """
     データベースを初期化（テーブル作成）。
@@ -40,7 +219,10 @@ def init_db(engine_instance=None):
         engine_instance: 使用するエンジン。Noneの場合はデフォルトエンジンを使用。
     """
     # モデルをインポートしてテーブル定義を登録
-    from task_app.models.task import Task  # noqa: F401
+    from task_app.models.task import ensure_search_index, ensure_version_column
     
     target_engine = engine_instance or engine
     Base.metadata.create_all(bind=target_engine)
+    with target_engine.begin() as connection:
+        ensure_version_column(connection)
+        ensure_search_index(connection)
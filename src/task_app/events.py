@@ -0,0 +1,266 @@
+"""タスクの変更イベントの配信（プロセス内 pub/sub）
+
+TaskService / AsyncTaskService はコミットしたタスクの変更を EventBroker に
+発行し、EventBroker は購読者（SSE / WebSocket の接続）ごとのキューに配る。
+変更を待つクライアントはポーリングの代わりに接続を1本保持するだけでよく、
+待機中の接続はデータベースへのクエリを発生させない。
+
+イベントは発行時に1回だけJSONにシリアライズし、購読者には同じ文字列を配る。
+購読者のキューは上限付きで、読み出しが追いつかずに溢れた場合は溜まっている
+イベントを捨てて resync イベントを1つ送る。resync を受け取ったクライアントは
+GET /tasks/changes で取りこぼした変更を取得し直す。
+"""
+
+import asyncio
+import itertools
+import threading
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Literal
+
+from task_app.metrics import TASK_EVENT_RESYNCS, TASK_EVENT_SUBSCRIBERS
+from task_app.models.task import Task
+from task_app.serializers import RESPONSE_FIELDS, dumps_json, task_record
+
+# タスクの変更の種類（completed は完了状態の変更。完了 / 未完了は task で判別する）
+TaskEventType = Literal["created", "updated", "completed", "deleted"]
+
+# 取りこぼしが発生したことを通知するイベントの種類
+RESYNC = "resync"
+
+# 購読者ごとのキューに保持する最大イベント数
+DEFAULT_MAX_QUEUE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    """
+    配信するイベント
+
+    Attributes:
+        id: ブローカー内で単調増加する番号
+        type: イベントの種類（TaskEventType または resync）
+        data: {"type", "id", "task"} のJSON文字列
+    """
+
+    id: int
+    type: str
+    data: str
+
+    @cached_property
+    def sse(self) -> bytes:
+        """Server-Sent Events の1イベント分のバイト列"""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n".encode()
+
+
+class Subscription:
+    """
+    1つの接続の購読
+
+    EventBroker.subscribe で作成し、使い終わったら close する（with 文で使える）。
+    イベントループのスレッドからのみ操作する。
+    """
+
+    def __init__(self, broker: "EventBroker", max_queue_size: int) -> None:
+        self._broker = broker
+        self._queue: asyncio.Queue[TaskEvent | None] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+
+    async def get(self) -> TaskEvent | None:
+        """次のイベントを待つ（close された場合は None）"""
+        if self.closed and self._queue.empty():
+            return None
+        return await self._queue.get()
+
+    def _replace_backlog(self, item: TaskEvent | None) -> None:
+        # 溜まっているイベントを捨て、item だけを残す
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
+
+    def push(self, event: TaskEvent) -> None:
+        """イベントをキューに入れる。溢れた場合は resync に置き換える"""
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            TASK_EVENT_RESYNCS.inc("overflow")
+            self._replace_backlog(self._broker.resync_event())
+
+    def close(self) -> None:
+        """購読を解除し、get で待っている呼び出し側に None を返す"""
+        if self.closed:
+            return
+        self.closed = True
+        self._broker._unsubscribe(self)
+        self._replace_backlog(None)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class EventBroker:
+    """
+    タスクの変更イベントをプロセス内の購読者に配信する
+
+    publish はどのスレッドからも呼び出せる（同期版のサービスはスレッドプールで
+    動く）。イベントは購読者のイベントループに call_soon_threadsafe で渡し、
+    ループごとに1回のコールバックでそのループのすべての購読者に配る。
+    購読者がいない場合の publish はシリアライズも行わずに戻る。
+
+    Args:
+        max_queue_size: 購読者ごとのキューに保持する最大イベント数
+    """
+
+    def __init__(self, max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE) -> None:
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be at least 1")
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._subscribers: dict[asyncio.AbstractEventLoop, set[Subscription]] = {}
+        self._sequence = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        """現在の購読者数"""
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self) -> Subscription:
+        """
+        購読を開始する（イベントループ内で呼び出す）
+
+        Returns:
+            Subscription: 以降に発行されたイベントを受け取る購読
+        """
+        subscription = Subscription(self, self.max_queue_size)
+        with self._lock:
+            self._subscribers.setdefault(subscription.loop, set()).add(subscription)
+        TASK_EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(subscription.loop)
+            if subs is None or subscription not in subs:
+                return
+            subs.discard(subscription)
+            if not subs:
+                del self._subscribers[subscription.loop]
+        TASK_EVENT_SUBSCRIBERS.dec()
+
+    def resync_event(self) -> TaskEvent:
+        """取りこぼしを通知するイベント"""
+        data = dumps_json({"type": RESYNC}).decode()
+        return TaskEvent(next(self._sequence), RESYNC, data)
+
+    def publish(
+        self, event_type: TaskEventType, task_id: int, task: Task | None = None
+    ) -> None:
+        """
+        タスクの変更を発行する（コミット後に呼び出す）
+
+        Args:
+            event_type: 変更の種類
+            task_id: タスクID
+            task: 変更後のタスク（削除・一括更新の場合はNone）
+        """
+        if not self._subscribers:
+            return
+        record = None
+        if task is not None:
+            record = task_record([getattr(task, name) for name in RESPONSE_FIELDS])
+        data = dumps_json({"type": event_type, "id": task_id, "task": record})
+        with self._lock:
+            self._dispatch(TaskEvent(next(self._sequence), event_type, data.decode()))
+
+    def publish_many(
+        self,
+        event_type: TaskEventType,
+        task_ids: list[int],
+        tasks: Iterable[Task] | None = None,
+    ) -> None:
+        """
+        複数のタスクの変更を発行する
+
+        件数が購読者のキューの上限を超える場合は、個々のイベントの代わりに
+        resync を1つ発行する（どの購読者のキューにも収まらないため）。
+
+        Args:
+            event_type: 変更の種類
+            task_ids: タスクID
+            tasks: 変更後のタスク（task_ids と同じ順序。Noneの場合は送らない）
+        """
+        if not self._subscribers or not task_ids:
+            return
+        if len(task_ids) > self.max_queue_size:
+            TASK_EVENT_RESYNCS.inc("bulk")
+            with self._lock:
+                self._dispatch(self.resync_event())
+            return
+        if tasks is None:
+            for task_id in task_ids:
+                self.publish(event_type, task_id)
+        else:
+            for task_id, task in zip(task_ids, tasks):
+                self.publish(event_type, task_id, task)
+
+    def _dispatch(self, event: TaskEvent) -> None:
+        # ロックを保持したまま呼び出し、イベントの番号の順に各ループへ渡す
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for loop, subscribers in self._subscribers.items():
+            subs = tuple(subscribers)
+            if loop is running:
+                _deliver(subs, event)
+                continue
+            try:
+                loop.call_soon_threadsafe(_deliver, subs, event)
+            except RuntimeError:
+                # ループが既に閉じている（購読者は close されずに終了した）
+                pass
+
+
+def _deliver(subscriptions: tuple[Subscription, ...], event: TaskEvent) -> None:
+    for subscription in subscriptions:
+        subscription.push(event)
+
+
+async def sse_stream(
+    subscription: Subscription, heartbeat: float
+) -> AsyncIterator[bytes]:
+    """
+    購読したイベントを Server-Sent Events として返す
+
+    最初に接続したことを示すコメントを返し、イベントがない間も heartbeat 秒ごとに
+    コメントを返して、プロキシなどに接続を切られないようにする。
+    終了すると（クライアントの切断を含む）購読を解除する。
+
+    Args:
+        subscription: 購読
+        heartbeat: イベントがない場合にコメントを返す間隔（秒）
+
+    Yields:
+        bytes: SSE のイベントまたはコメント
+    """
+    with subscription:
+        yield b": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield event.sse
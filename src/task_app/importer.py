@@ -0,0 +1,163 @@
+"""タスクの一括インポート
+
+NDJSON / CSV をストリームとして1行ずつ解析し、TaskCreate で検証したうえで
+バッチ単位（1バッチ = 1トランザクション）で一括作成する。
+"""
+
+import csv
+import json
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator, Sized
+from dataclasses import dataclass, field
+from typing import Any, Literal, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from task_app.schemas.task import TaskCreate
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# 1トランザクションで作成する件数のデフォルト
+DEFAULT_BATCH_SIZE = 1000
+# 結果に保持するエラーの最大件数（件数自体はすべて数える）
+MAX_REPORTED_ERRORS = 1000
+
+
+@dataclass
+class RowError:
+    """インポートに失敗した行"""
+
+    line: int
+    error: str
+
+
+@dataclass
+class ImportResult:
+    """インポート結果"""
+
+    imported: int = 0
+    failed: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """1秒あたりの作成件数"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.imported / self.elapsed_seconds
+
+    def add_error(self, line: int, error: str) -> None:
+        """失敗した行を記録する"""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(line=line, error=error))
+
+
+# 解析結果: (行番号, レコード) または (行番号, 解析エラー)
+ParsedRow = tuple[int, dict[str, Any] | Exception]
+
+
+def parse_ndjson(stream: TextIO) -> Iterator[ParsedRow]:
+    """NDJSON を1行ずつ解析する（空行は読み飛ばす）"""
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_no, exc
+            continue
+        if not isinstance(record, dict):
+            yield line_no, ValueError("JSONオブジェクトではありません")
+            continue
+        yield line_no, record
+
+
+def parse_csv(stream: TextIO) -> Iterator[ParsedRow]:
+    """
+    ヘッダ付きCSVを1行ずつ解析する
+
+    空の description は None として扱う。行番号はヘッダを1行目として数える。
+    """
+    reader = csv.DictReader(stream)
+    for record in reader:
+        if record.get("description") == "":
+            record["description"] = None
+        yield reader.line_num, record
+
+
+PARSERS: dict[str, Callable[[TextIO], Iterator[ParsedRow]]] = {
+    "ndjson": parse_ndjson,
+    "csv": parse_csv,
+}
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc']) or 'row'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def import_records(
+    rows: Iterable[ParsedRow],
+    create_many: Callable[[list[TaskCreate]], Sized],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportResult:
+    """
+    解析済みの行を検証し、バッチ単位で作成する
+
+    不正な行はエラーとして記録して読み飛ばす。バッチの保存がデータベースの
+    エラーで失敗した場合は、そのバッチのすべての行をエラーとして記録して続行する
+    （エラーの詳細はログにだけ出力する）。
+
+    Args:
+        rows: parse_ndjson / parse_csv の結果
+        create_many: タスクのリストを1トランザクションで作成する関数
+        batch_size: 1トランザクションで作成する件数
+
+    Returns:
+        ImportResult: 作成件数・エラー・処理時間
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size は1以上にしてください")
+
+    result = ImportResult()
+    started = time.perf_counter()
+    batch: list[TaskCreate] = []
+    batch_lines: list[int] = []
+
+    def flush() -> None:
+        try:
+            result.imported += len(create_many(batch))
+        except SQLAlchemyError:
+            logger.exception(
+                "Saving import rows %d-%d failed", batch_lines[0], batch_lines[-1]
+            )
+            for line in batch_lines:
+                result.add_error(line, "保存に失敗しました")
+        batch.clear()
+        batch_lines.clear()
+
+    for line, parsed in rows:
+        if isinstance(parsed, Exception):
+            result.add_error(line, f"解析に失敗しました: {parsed}")
+            continue
+        try:
+            batch.append(TaskCreate.model_validate(parsed))
+        except ValidationError as exc:
+            result.add_error(line, _format_validation_error(exc))
+            continue
+        batch_lines.append(line)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
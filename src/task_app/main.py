@@ -1,16 +1,104 @@
 """FastAPI アプリケーションのエントリーポイント"""
 
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 
+from task_app import database
+from task_app.api.async_tasks import router as async_tasks_router
 from task_app.api.tasks import router as tasks_router
+from task_app.api.tasks import write_batcher
+from task_app.archiver import ArchiveScheduler
+from task_app.config import settings
+from task_app.metrics import REGISTRY, MetricsMiddleware, instrument_engine
+from task_app.outbox import OutboxDispatcher, sink_from_url
+from task_app.profiling import QueryProfiler, QueryProfilerMiddleware
+
+logger = logging.getLogger(__name__)
+
+# アウトボックスの配信（OUTBOX_SINK_URL を設定した場合）
+outbox_dispatcher = (
+    OutboxDispatcher(
+        database.engine,
+        sink_from_url(settings.outbox_sink_url),
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_interval,
+    )
+    if settings.outbox_sink_url
+    else None
+)
+
+# 完了済みタスクのアーカイブ（ARCHIVE_RETENTION_DAYS を設定した場合）
+archive_scheduler = (
+    ArchiveScheduler(
+        database.engine,
+        timedelta(days=settings.archive_retention_days),
+        interval=settings.archive_interval_seconds,
+        batch_size=settings.archive_batch_size,
+    )
+    if settings.archive_retention_days is not None
+    else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    アウトボックスの配信とアーカイブを開始し、終了時に止める
+
+    終了時には、書き込みバッチに残っている操作もコミットする。
+    """
+    if settings.async_db and write_batcher is not None:
+        # 非同期版のエンドポイントは書き込みバッチを使わない
+        logger.warning(
+            "WRITE_BATCHING does not apply to the async endpoints enabled by "
+            "DATABASE_ASYNC; writes through them commit per request"
+        )
+    if outbox_dispatcher is not None:
+        outbox_dispatcher.start()
+    if archive_scheduler is not None:
+        archive_scheduler.start()
+    yield
+    if archive_scheduler is not None:
+        await run_in_threadpool(archive_scheduler.stop)
+    if write_batcher is not None:
+        await run_in_threadpool(write_batcher.close)
+    if outbox_dispatcher is not None:
+        await run_in_threadpool(outbox_dispatcher.stop)
+
 
 app = FastAPI(
     title="TaskAPP",
     description="タスク管理アプリケーション",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# リクエストとSQLの計測
+app.add_middleware(MetricsMiddleware)
+for db_engine in (database.engine, *database.replica_engines):
+    instrument_engine(db_engine)
+
+# SQLのプロファイリング（オプトイン）
+if settings.query_profiling:
+    profiler = QueryProfiler(
+        slow_query_ms=settings.slow_query_ms,
+        n_plus_one_threshold=settings.n_plus_one_threshold,
+        explain=settings.query_explain,
+    )
+    for db_engine in (database.engine, *database.replica_engines):
+        profiler.install(db_engine)
+    app.add_middleware(QueryProfilerMiddleware)
+
 # ルーターの登録
+# 非同期モードでは、非同期版のエンドポイントを先に登録して同期版より優先させる
+if settings.async_db:
+    app.include_router(async_tasks_router)
 app.include_router(tasks_router)
 
 
@@ -24,3 +112,11 @@ async def root() -> dict[str, str]:
 async def health_check() -> dict[str, str]:
     """ヘルスチェックエンドポイント"""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus形式のメトリクスエンドポイント"""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
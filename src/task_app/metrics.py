@@ -0,0 +1,393 @@
+"""リクエスト単位の性能計測とPrometheus形式のメトリクス
+
+MetricsMiddleware がリクエストごとのレイテンシ・処理中リクエスト数を記録し、
+instrument_engine で登録した SQLAlchemy のイベントが、リクエスト中に実行された
+SQLの件数・時間・行数を集計する。集計結果は /metrics で公開する。
+"""
+
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy import Connection, Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# レイテンシのヒストグラムのバケット（秒）
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# 1リクエストあたりのクエリ数のヒストグラムのバケット
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+# 1回のコミットにまとめた書き込み操作の数
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """ラベル付きメトリクスの基底クラス"""
+
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> tuple[str, ...]:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name} requires labels {self.label_names}")
+        return tuple(str(v) for v in labels)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """単調増加するカウンタ"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """増減する値"""
+
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """バケットごとの観測数を記録するヒストグラム"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # ラベル → (バケットごとの観測数, 合計, 件数)
+        self._values: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def sum(self, *labels: str) -> float:
+        entry = self._values.get(self._key(labels))
+        return entry[1] if entry else 0.0
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(
+                (key, (list(c), t, n)) for key, (c, t, n) in self._values.items()
+            )
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.label_names + ("le",), key + (_format_value(bound),)
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class MetricsRegistry:
+    """メトリクスの登録とPrometheusテキスト形式での出力"""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.register(
+    Counter(
+        "http_requests_total",
+        "Total HTTP requests.",
+        ("method", "route", "status"),
+    )
+)
+REQUEST_LATENCY = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency in seconds.",
+        ("method", "route"),
+    )
+)
+REQUESTS_IN_PROGRESS = REGISTRY.register(
+    Gauge(
+        "http_requests_in_progress",
+        "HTTP requests currently being processed.",
+        ("method",),
+    )
+)
+REQUEST_DB_QUERIES = REGISTRY.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements executed per HTTP request.",
+        ("method", "route"),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+REQUEST_DB_SECONDS = REGISTRY.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Total SQL execution time per HTTP request in seconds.",
+        ("method", "route"),
+    )
+)
+REQUEST_DB_ROWS_AFFECTED = REGISTRY.register(
+    Counter(
+        "http_request_db_rows_affected_total",
+        "Rows changed by INSERT/UPDATE/DELETE statements per route.",
+        ("method", "route"),
+    )
+)
+
+WRITE_BATCH_SIZE = REGISTRY.register(
+    Histogram(
+        "task_write_batch_size",
+        "Write operations committed per group-commit batch.",
+        buckets=BATCH_SIZE_BUCKETS,
+    )
+)
+WRITE_BATCH_FALLBACKS = REGISTRY.register(
+    Counter(
+        "task_write_batch_fallbacks_total",
+        "Group-commit batches retried one operation per transaction.",
+    )
+)
+
+TASK_EVENT_SUBSCRIBERS = REGISTRY.register(
+    Gauge(
+        "task_event_subscribers",
+        "Open task change feed subscriptions (SSE and WebSocket).",
+    )
+)
+TASK_EVENT_RESYNCS = REGISTRY.register(
+    Counter(
+        "task_event_resyncs_total",
+        "Resync events sent instead of task events, by reason (overflow, bulk).",
+        ("reason",),
+    )
+)
+
+OUTBOX_DISPATCHED = REGISTRY.register(
+    Counter(
+        "task_outbox_events_dispatched_total",
+        "Outbox events delivered to the sink and deleted.",
+    )
+)
+OUTBOX_BATCH_SIZE = REGISTRY.register(
+    Histogram(
+        "task_outbox_batch_size",
+        "Outbox events delivered per dispatch.",
+        buckets=BATCH_SIZE_BUCKETS,
+    )
+)
+OUTBOX_FAILURES = REGISTRY.register(
+    Counter(
+        "task_outbox_dispatch_failures_total",
+        "Outbox dispatches that failed and will be retried.",
+    )
+)
+OUTBOX_LAG = REGISTRY.register(
+    Gauge(
+        "task_outbox_lag_seconds",
+        "Age of the oldest undelivered outbox event at the last poll.",
+    )
+)
+
+TASKS_ARCHIVED = REGISTRY.register(
+    Counter(
+        "task_archived_total",
+        "Completed tasks moved to the archive by the archive scheduler.",
+    )
+)
+ARCHIVE_FAILURES = REGISTRY.register(
+    Counter(
+        "task_archive_failures_total",
+        "Archive runs that failed and will be retried at the next interval.",
+    )
+)
+
+
+@dataclass
+class RequestDBStats:
+    """1リクエスト中に実行されたSQLの統計"""
+
+    queries: int = 0
+    seconds: float = 0.0
+    rows_affected: int = 0
+
+
+_request_db_stats: ContextVar[RequestDBStats | None] = ContextVar(
+    "request_db_stats", default=None
+)
+
+
+def current_db_stats() -> RequestDBStats | None:
+    """処理中のリクエストのSQL統計（リクエスト外ではNone）"""
+    return _request_db_stats.get()
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    context._metrics_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    stats = _request_db_stats.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.seconds += time.perf_counter() - context._metrics_query_start
+    # SELECT の rowcount はドライバによって -1 になるため、変更した行数だけを数える
+    is_dml = context.isinsert or context.isupdate or context.isdelete
+    if is_dml and cursor.rowcount > 0:
+        stats.rows_affected += cursor.rowcount
+
+
+def instrument_engine(engine: Engine) -> None:
+    """エンジンにSQL統計を集計するイベントを登録する（重複登録しない）"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """
+    リクエストごとのレイテンシ・処理中リクエスト数・SQL統計を記録する
+    ASGIミドルウェア
+
+    ルートのラベルにはパスのテンプレート（例: /tasks/{task_id}）を使い、
+    どのルートにも一致しなかったリクエストは "unmatched" として集計する。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestDBStats()
+        token = _request_db_stats.set(stats)
+        REQUESTS_IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_PROGRESS.dec(method)
+            _request_db_stats.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUESTS.inc(method, route, str(status_code))
+            REQUEST_LATENCY.observe(elapsed, method, route)
+            REQUEST_DB_QUERIES.observe(stats.queries, method, route)
+            REQUEST_DB_SECONDS.observe(stats.seconds, method, route)
+            if stats.rows_affected:
+                REQUEST_DB_ROWS_AFFECTED.inc(method, route, amount=stats.rows_affected)
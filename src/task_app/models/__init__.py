@@ -1,5 +1,15 @@
 """データモデル"""
 
+from task_app.models.archive import ArchivedTask
+from task_app.models.counter import TaskCounter
+from task_app.models.outbox import TaskOutboxEvent
 from task_app.models.task import Task
+from task_app.models.tombstone import TaskTombstone
 
-__all__ = ["Task"]
+__all__ = [
+    "ArchivedTask",
+    "Task",
+    "TaskCounter",
+    "TaskOutboxEvent",
+    "TaskTombstone",
+]
@@ -0,0 +1,53 @@
+"""ArchivedTaskモデル定義（アーカイブされた完了済みタスク）"""
+
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from task_app.database import Base
+from task_app.models.task import utc_now
+
+
+class ArchivedTask(Base):
+    """
+    アーカイブされた完了済みタスク
+
+    保持期間を過ぎた完了済みタスクは tasks からこのテーブルに移され、
+    一覧・検索・件数の対象から外れる。IDでの取得はこのテーブルに
+    フォールバックする。読み込み専用で、tasks のような検索用のインデックスや
+    トリガーは持たない。
+
+    AUTOINCREMENT なしで作成された既存のデータベースでは、アーカイブした
+    タスクのIDが新しいタスクに再利用されることがある。そのため主キーは
+    アーカイブ独自の id とし、元のタスクのIDは一意でない task_id に保存する
+    （同じ task_id が複数ある場合は最後にアーカイブしたものを返す）。
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        # IDでの取得用（同じ task_id の中では最後にアーカイブしたものを使う）
+        Index("ix_tasks_archive_task_id_id", "task_id", "id"),
+        # 古いアーカイブの削除・集計用
+        Index("ix_tasks_archive_archived_at", "archived_at"),
+        Index("ix_tasks_archive_updated_at", "updated_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    completed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<ArchivedTask(task_id={self.task_id}, title='{self.title}')>"
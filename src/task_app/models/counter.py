@@ -0,0 +1,131 @@
+"""TaskCounterモデル定義（タスク件数の集計値）"""
+
+from typing import Any
+
+from sqlalchemy import Connection, Integer, MetaData, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from task_app.database import Base
+
+# 集計値の名前
+TOTAL = "total"
+COMPLETED = "completed"
+
+
+class TaskCounter(Base):
+    """
+    タスク件数の集計値
+
+    tasks テーブルのトリガーが、行の追加・削除・completed の変更と同じ
+    トランザクションで更新する。件数の取得がテーブルサイズに依存しなくなる。
+    """
+
+    __tablename__ = "task_counters"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TaskCounter(name='{self.name}', value={self.value})>"
+
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_ai AFTER INSERT ON tasks BEGIN
+        UPDATE task_counters SET value = value + 1 WHERE name = 'total';
+        UPDATE task_counters SET value = value + 1
+        WHERE name = 'completed' AND new.completed;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_ad AFTER DELETE ON tasks BEGIN
+        UPDATE task_counters SET value = value - 1 WHERE name = 'total';
+        UPDATE task_counters SET value = value - 1
+        WHERE name = 'completed' AND old.completed;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_counters_au AFTER UPDATE OF completed ON tasks
+    WHEN old.completed <> new.completed BEGIN
+        UPDATE task_counters
+        SET value = value + CASE WHEN new.completed THEN 1 ELSE -1 END
+        WHERE name = 'completed';
+    END
+    """,
+]
+
+# PostgreSQL では遷移テーブルを使った文レベルのトリガーにして、一括作成や
+# 一括更新でも集計値の更新は1文につき1回で済ませる。
+POSTGRESQL_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION task_counters_apply() RETURNS trigger AS $$
+    DECLARE
+        total_delta bigint := 0;
+        completed_delta bigint := 0;
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT count(*), count(*) FILTER (WHERE completed)
+            INTO total_delta, completed_delta FROM new_rows;
+        END IF;
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            SELECT total_delta - count(*),
+                   completed_delta - count(*) FILTER (WHERE completed)
+            INTO total_delta, completed_delta FROM old_rows;
+        END IF;
+        UPDATE task_counters SET value = value + total_delta
+        WHERE name = 'total' AND total_delta <> 0;
+        UPDATE task_counters SET value = value + completed_delta
+        WHERE name = 'completed' AND completed_delta <> 0;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER task_counters_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_apply()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER task_counters_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_apply()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER task_counters_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_apply()
+    """,
+]
+
+TRIGGERS = {"sqlite": SQLITE_TRIGGERS, "postgresql": POSTGRESQL_TRIGGERS}
+
+# 集計値がない場合に tasks から数えて登録する（既存のデータベース向け）
+SEED_COUNTERS = """
+    INSERT INTO task_counters (name, value)
+    SELECT 'total', count(*) FROM tasks
+    UNION ALL
+    SELECT 'completed', count(*) FROM tasks WHERE completed
+    ON CONFLICT (name) DO NOTHING
+"""
+
+
+def ensure_task_counters(connection: Connection) -> None:
+    """
+    集計値を更新するトリガーを作成し、集計値がなければ現在の件数で登録する
+
+    トリガーに対応していないデータベースでは何もしない（件数は都度集計する）。
+    """
+    triggers = TRIGGERS.get(connection.dialect.name)
+    if triggers is None:
+        return
+    for statement in triggers:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(SEED_COUNTERS)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_task_counters(target: MetaData, connection: Connection, **kw: Any) -> None:
+    # create_all のたびに呼ばれるため、テーブルがすでにある場合も
+    # トリガーと集計値がそろう
+    if {"tasks", "task_counters"} <= set(target.tables):
+        ensure_task_counters(connection)
@@ -0,0 +1,48 @@
+"""TaskOutboxEventモデル定義（外部に配信するタスクの変更）"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from task_app.database import Base
+from task_app.models.task import utc_now
+
+
+class TaskOutboxEvent(Base):
+    """
+    配信待ちのタスクの変更（トランザクショナル・アウトボックス）
+
+    タスクの変更と同じトランザクションで追加されるため、コミットされた変更には
+    必ずイベントがあり、ロールバックされた変更にはイベントがない。
+    OutboxDispatcher が id 順にクレームして配信し、配信したものを削除する。
+    """
+
+    __tablename__ = "task_events"
+    # 削除した（配信済みの）イベントのIDを再利用しない。受信側はIDで重複を除く
+    __table_args__ = (
+        # クレームできるイベント（未クレーム・リース切れ）の検索用
+        Index("ix_task_events_claimed_at_id", "claimed_at", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # 変更後のタスク（TaskResponse と同じ形のJSON）。削除・一括更新では NULL
+    payload: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, nullable=False
+    )
+    # 配信中のディスパッチャーのクレーム（トークンと日時）。未配信なら NULL
+    claimed_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<TaskOutboxEvent(id={self.id}, event_type={self.event_type}, "
+            f"task_id={self.task_id})>"
+        )
+
@@ -1,12 +1,32 @@
 """Taskモデル定義"""
 
 from datetime import datetime, UTC
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from typing import Any, cast
+
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Connection,
+    DateTime,
+    Dialect,
+    Function,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    event,
+    func,
+    inspect,
+    literal_column,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column
 
 from task_app.database import Base
 
 
-def utc_now():
+def utc_now() -> datetime:
     """UTC現在時刻を返す"""
     return datetime.now(UTC)
 
@@ -15,18 +35,158 @@ class Task(Base):
     """タスクモデル"""
     
     __tablename__ = "tasks"
+    __table_args__ = (
+        # created_at / updated_at 順のキーセットページネーション用
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        # completed で絞り込んだ一覧（未完了を新しい順など）用
+        Index("ix_tasks_completed_created_at_id", "completed", "created_at", "id"),
+        Index("ix_tasks_completed_id", "completed", "id"),
+        # 削除したタスクのIDを再利用しない（削除の記録と新しいタスクが
+        # 同じIDにならないようにする）
+        {"sqlite_autoincrement": True},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False, index=True)
-    description = Column(Text, nullable=True)
-    completed = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
-    updated_at = Column(
-        DateTime(timezone=True), 
-        default=utc_now, 
-        onupdate=utc_now, 
-        nullable=False
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, onupdate=utc_now, nullable=False
+    )
+    # 楽観的排他制御用のバージョン。ORM の UPDATE は WHERE version = 読み込み時の値
+    # を付けて実行し、他の更新が先にコミットされていれば StaleDataError になる。
+    # ORM を通さない UPDATE 文では呼び出し側が version + 1 を設定する。
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default=text("1")
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', completed={self.completed})>"
+
+
+# ---------------------------------------------------------------------------
+# 全文検索インデックス
+#
+# SQLite: tasks を外部コンテンツとする FTS5 仮想テーブル tasks_fts をトリガーで
+# 同期する。日本語は空白で区切られないため trigram トークナイザを使う
+# （SQLite 3.34 以降）。
+# PostgreSQL: title と description の tsvector 式に GIN インデックスを張る。
+# ---------------------------------------------------------------------------
+
+# FTS5 の trigram トークナイザが使える SQLite のバージョン
+FTS5_TRIGRAM_MIN_VERSION = (3, 34, 0)
+
+
+def fts5_supported(dialect: Dialect) -> bool:
+    """SQLiteで trigram トークナイザの FTS5 が使えるか"""
+    return (
+        dialect.name == "sqlite"
+        and dialect.dbapi is not None
+        and dialect.dbapi.sqlite_version_info >= FTS5_TRIGRAM_MIN_VERSION
+    )
+
+
+def search_document() -> Function[Any]:
+    """PostgreSQL の全文検索対象（GIN インデックスの式と同じ形で組み立てる）"""
+    empty, space = literal_column("''", String), literal_column("' '", String)
+    title = func.coalesce(Task.title, empty)
+    description = func.coalesce(Task.description, empty)
+    return func.to_tsvector(literal_column("'simple'"), title + space + description)
+
+
+search_index = Index(
+    "ix_tasks_search", search_document(), postgresql_using="gin"
+).ddl_if(dialect="postgresql")
+cast(Table, Task.__table__).append_constraint(search_index)
+
+FTS5_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au
+    AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def _fts5_supported(
+    ddl: Any, target: Any, bind: Any, *args: Any, dialect: Dialect, **kw: Any
+) -> bool:
+    return fts5_supported(dialect)
+
+
+for statement in FTS5_DDL:
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(statement).execute_if(callable_=_fts5_supported),
+    )
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(callable_=_fts5_supported),
+)
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """
+    既存のデータベースに全文検索インデックスがなければ作成する
+
+    create_all はすでにある tasks テーブルに対して after_create を発行しないため、
+    インデックス導入前に作成されたデータベースはここで作成し、既存のタスクを
+    登録する。
+    """
+    if connection.dialect.name == "postgresql":
+        search_index.create(connection, checkfirst=True)
+    if not fts5_supported(connection.dialect):
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+    ).first()
+    if exists:
+        return
+    for statement in FTS5_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def ensure_version_column(connection: Connection) -> None:
+    """
+    既存のデータベースに version カラムがなければ追加する
+
+    create_all はすでにある tasks テーブルにカラムを追加しないため、version
+    導入前に作成されたデータベースはここで追加する（既存のタスクは 1 になる）。
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("tasks")}
+    if "version" in columns:
+        return
+    connection.exec_driver_sql(
+        "ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+    )
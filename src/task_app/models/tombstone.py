@@ -0,0 +1,32 @@
+"""TaskTombstoneモデル定義（削除されたタスクの記録）"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from task_app.database import Base
+from task_app.models.task import utc_now
+
+
+class TaskTombstone(Base):
+    """
+    削除されたタスクの記録
+
+    タスクの削除と同じトランザクションで追加され、差分同期
+    （GET /tasks/changes）でクライアントに削除を伝えるために使う。
+    """
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        # deleted_at 順の差分取得用
+        Index("ix_task_tombstones_deleted_at_task_id", "deleted_at", "task_id"),
+    )
+
+    task_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<TaskTombstone(task_id={self.task_id}, deleted_at={self.deleted_at})>"
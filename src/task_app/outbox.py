@@ -0,0 +1,265 @@
+"""アウトボックスのイベントの配信
+
+タスクの変更は同じトランザクションで task_events テーブル（アウトボックス）に
+記録される（repositories.outbox）。OutboxDispatcher はバックグラウンドの
+スレッドでアウトボックスを id 順にまとめて読み出し、シンク（ファイルや HTTP の
+エンドポイント）に渡してから削除する。データベースへの書き込みと外部への通知を
+別々に行う二重書き込みと異なり、コミットされた変更の通知が失われることはない。
+
+ディスパッチャーはイベントをクレームしてから配信するため、ワーカーごとに
+ディスパッチャーを動かしても同じイベントを同時に配信することはない。
+配信は at-least-once で、シンクへの送信後、削除をコミットする前に停止した場合は
+クレームのリースが切れた後に同じイベントが再送される。受信側はイベントの
+event_id で重複を除くこと。
+"""
+
+import json
+import logging
+import threading
+import urllib.request
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Protocol
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import sessionmaker
+
+from task_app.metrics import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_DISPATCHED,
+    OUTBOX_FAILURES,
+    OUTBOX_LAG,
+)
+from task_app.models.outbox import TaskOutboxEvent
+from task_app.models.task import utc_now
+from task_app.repositories.outbox import (
+    claim_statement,
+    claimed_statement,
+    delivered_statement,
+    release_statement,
+)
+from task_app.serializers import dumps_json
+
+logger = logging.getLogger(__name__)
+
+# 1回の配信で読み出す最大のイベント数
+DEFAULT_BATCH_SIZE = 100
+# アウトボックスが空のときに次に確認するまでの秒数
+DEFAULT_POLL_INTERVAL = 1.0
+# 配信に失敗したときに待つ最大の秒数（失敗が続くと poll_interval から倍々に延ばす）
+MAX_RETRY_INTERVAL = 30.0
+# クレームしたディスパッチャーが停止した場合に、他のディスパッチャーが
+# 同じイベントをクレームできるようになるまでの秒数（送信の時間より長くすること）
+DEFAULT_LEASE_SECONDS = 300.0
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite はタイムゾーンを保存しないため、タイムゾーンなしはUTCとみなす
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def event_message(event: TaskOutboxEvent) -> dict[str, Any]:
+    """
+    シンクに渡すイベントの辞書
+
+    Args:
+        event: アウトボックスのイベント
+
+    Returns:
+        dict: event_id / type / task_id / task / created_at
+    """
+    return {
+        "event_id": event.id,
+        "type": event.event_type,
+        "task_id": event.task_id,
+        "task": json.loads(event.payload) if event.payload is not None else None,
+        "created_at": _as_utc(event.created_at),
+    }
+
+
+class OutboxSink(Protocol):
+    """イベントの配信先のインターフェース"""
+
+    def send(self, messages: list[dict[str, Any]]) -> None:
+        """イベントをまとめて配信する。失敗した場合は例外を送出する"""
+        ...
+
+
+class FileSink:
+    """
+    イベントを NDJSON（1行1イベント）としてファイルに追記するシンク
+
+    Args:
+        path: 追記するファイルのパス
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def send(self, messages: list[dict[str, Any]]) -> None:
+        with self.path.open("ab") as f:
+            f.write(b"".join(dumps_json(message) + b"\n" for message in messages))
+
+
+class HTTPSink:
+    """
+    イベントのJSON配列を HTTP POST で送るシンク
+
+    2xx 以外の応答や接続の失敗は例外になり、同じイベントを後で再送する。
+
+    Args:
+        url: 送信先のURL
+        timeout: 応答を待つ秒数
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, messages: list[dict[str, Any]]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=dumps_json(messages),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        # 2xx 以外は urlopen が HTTPError を送出する
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def sink_from_url(url: str) -> OutboxSink:
+    """
+    URLからシンクを作成する
+
+    Args:
+        url: file:///path/to/events.ndjson または http(s)://...
+
+    Returns:
+        OutboxSink: FileSink または HTTPSink
+
+    Raises:
+        ValueError: 対応していないスキームの場合
+    """
+    if url.startswith("file://"):
+        return FileSink(url.removeprefix("file://"))
+    if url.startswith(("http://", "https://")):
+        return HTTPSink(url)
+    raise ValueError(f"Unsupported outbox sink: {url}")
+
+
+class OutboxDispatcher:
+    """
+    アウトボックスのイベントをバックグラウンドで配信する
+
+    batch_size 件ずつ id 順にクレームしてシンクに渡し、成功したら削除する。
+    クレームと削除はそれぞれ短いトランザクションで行い、シンクへの送信中に
+    データベースのトランザクションを保持しない（SQLite の書き込みを妨げない）。
+    クレームしたイベントは他のディスパッチャーに読み出されないため、同じ
+    データベースに対して複数のディスパッチャーを動かしてもよい。送信に
+    失敗した場合はクレームを解除し、次の配信で再送する。
+
+    満杯のバッチを配信した直後は待たずに次のバッチを読み出すため、溜まった
+    イベントはまとめて配信される。
+
+    Args:
+        engine: アウトボックスのあるデータベースのエンジン
+        sink: 配信先
+        batch_size: 1回の配信で読み出す最大のイベント数
+        poll_interval: アウトボックスが空のときに次に確認するまでの秒数
+        lease_seconds: クレームが切れて他のディスパッチャーが再送できるまでの秒数
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        sink: OutboxSink,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._session_factory = sessionmaker(bind=engine)
+        self.sink = sink
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease_seconds)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def dispatch_once(self) -> int:
+        """
+        1バッチ分のイベントを配信する
+
+        Returns:
+            int: 配信したイベント数（アウトボックスが空なら0）
+
+        Raises:
+            Exception: シンクへの送信に失敗した場合（イベントは削除せず、
+                クレームを解除する）
+        """
+        token = uuid.uuid4().hex
+        now = utc_now()
+        with self._session_factory() as db:
+            # クレームの UPDATE を最初の文にして、書き込みロックを待てるようにする
+            db.execute(claim_statement(token, now, now - self.lease, self.batch_size))
+            events = list(db.scalars(claimed_statement(token)))
+            messages = [event_message(event) for event in events]
+            db.commit()
+        if not events:
+            OUTBOX_LAG.set(0)
+            return 0
+        OUTBOX_LAG.set((utc_now() - messages[0]["created_at"]).total_seconds())
+
+        try:
+            self.sink.send(messages)
+        except Exception:
+            with self._session_factory() as db:
+                db.execute(release_statement(token))
+                db.commit()
+            raise
+        with self._session_factory() as db:
+            db.execute(delivered_statement(token))
+            db.commit()
+
+        OUTBOX_DISPATCHED.inc(amount=len(events))
+        OUTBOX_BATCH_SIZE.observe(len(events))
+        return len(events)
+
+    def start(self) -> None:
+        """バックグラウンドのスレッドを開始する"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="task-outbox-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """スレッドを止める（配信中のバッチは最後まで配信する）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        retry_interval = self.poll_interval
+        while not self._stop.is_set():
+            try:
+                dispatched = self.dispatch_once()
+            except Exception:
+                OUTBOX_FAILURES.inc()
+                logger.warning(
+                    "Outbox dispatch failed; retrying in %.1fs",
+                    retry_interval,
+                    exc_info=True,
+                )
+                self._stop.wait(retry_interval)
+                retry_interval = min(retry_interval * 2, MAX_RETRY_INTERVAL)
+                continue
+            retry_interval = self.poll_interval
+            if dispatched < self.batch_size:
+                self._stop.wait(self.poll_interval)
@@ -0,0 +1,227 @@
+"""SQLのプロファイリング（スロークエリログとN+1検出）
+
+QueryProfiler をエンジンに登録すると、しきい値を超えたSQLを、パラメータ・
+実行計画・発行元のリポジトリメソッドとともにログに出力する。
+QueryProfilerMiddleware（または profile_queries()）の範囲内では、同じ形のSQLが
+しきい値を超えて繰り返し実行された場合に N+1 の疑いとして警告する。
+"""
+
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger("task_app.profiling")
+
+# 発行元として扱うモジュール
+ORIGIN_MODULE_PREFIX = "task_app.repositories"
+# ログに出力するパラメータの最大文字数
+MAX_PARAMS_LENGTH = 500
+
+# 実行計画を取得するSQL（方言ごと）
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+EXPLAINABLE = re.compile(r"^\s*(SELECT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|:\w+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    SQLを比較用に正規化する
+
+    空白をまとめ、IN句のプレースホルダの並びと数値リテラルを置き換えて、
+    パラメータ数や定数だけが異なるSQLを同じ形として扱う。
+    """
+    normalized = _WHITESPACE.sub(" ", statement.strip())
+    normalized = _IN_LIST.sub("(?)", normalized)
+    return _NUMBER.sub("N", normalized)
+
+
+def find_origin() -> str | None:
+    """SQLを発行したリポジトリのメソッド名（例: TaskRepository.get_by_id）"""
+    frame: FrameType | None = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(ORIGIN_MODULE_PREFIX):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else name
+        frame = frame.f_back
+    return None
+
+
+@dataclass
+class ProfileScope:
+    """1リクエスト（または profile_queries() の範囲）のSQLの記録"""
+
+    label: str = "-"
+    asgi_scope: Scope | None = None
+    counts: Counter[str] = field(default_factory=Counter)
+    origins: dict[str, str | None] = field(default_factory=dict)
+    flagged: list[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """ログに出力する範囲の名前（リクエストの場合はメソッドとルート）"""
+        if self.asgi_scope is not None:
+            route = getattr(self.asgi_scope.get("route"), "path", None)
+            path = route or self.asgi_scope.get("path", "")
+            return f"{self.asgi_scope.get('method', '')} {path}"
+        return self.label
+
+
+_profile_scope: ContextVar[ProfileScope | None] = ContextVar(
+    "profile_scope", default=None
+)
+
+
+@contextmanager
+def profile_queries(label: str = "-") -> Iterator[ProfileScope]:
+    """ブロック内で実行されたSQLをN+1検出の対象として記録する"""
+    scope = ProfileScope(label=label)
+    token = _profile_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _profile_scope.reset(token)
+
+
+class QueryProfiler:
+    """スロークエリのログ出力とN+1検出を行うエンジンのイベントハンドラ"""
+
+    def __init__(
+        self,
+        slow_query_ms: float = 100.0,
+        n_plus_one_threshold: int = 10,
+        explain: bool = True,
+    ) -> None:
+        """
+        QueryProfilerを初期化する
+
+        Args:
+            slow_query_ms: スロークエリとしてログに出力する実行時間（ミリ秒）
+            n_plus_one_threshold: 同じ形のSQLの実行回数がこれを超えたら警告する
+            explain: スロークエリの実行計画を取得するか
+        """
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.explain = explain
+
+    def install(self, engine: Engine) -> None:
+        """エンジンにイベントを登録する"""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        context._profiling_query_start = time.perf_counter()
+
+    def _after_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        elapsed_ms = (time.perf_counter() - context._profiling_query_start) * 1000
+        scope = _profile_scope.get()
+        if scope is not None:
+            self._record(scope, statement)
+        if elapsed_ms >= self.slow_query_ms:
+            self._log_slow_query(conn, statement, parameters, executemany, elapsed_ms)
+
+    def _record(self, scope: ProfileScope, statement: str) -> None:
+        key = normalize_statement(statement)
+        scope.counts[key] += 1
+        if key not in scope.origins:
+            scope.origins[key] = find_origin()
+        if scope.counts[key] == self.n_plus_one_threshold + 1:
+            scope.flagged.append(key)
+            logger.warning(
+                "Possible N+1: statement executed more than %d times in %s "
+                "(origin: %s): %s",
+                self.n_plus_one_threshold,
+                scope.name,
+                scope.origins[key] or "unknown",
+                key,
+            )
+
+    def _log_slow_query(
+        self,
+        conn: Connection,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        elapsed_ms: float,
+    ) -> None:
+        plan = None
+        if self.explain and not executemany:
+            plan = self._explain(conn, statement, parameters)
+        params = repr(parameters)
+        if len(params) > MAX_PARAMS_LENGTH:
+            params = params[:MAX_PARAMS_LENGTH] + "..."
+        logger.warning(
+            "Slow query (%.1f ms, origin: %s): %s | params: %s%s",
+            elapsed_ms,
+            find_origin() or "unknown",
+            _WHITESPACE.sub(" ", statement.strip()),
+            params,
+            f" | plan: {plan}" if plan else "",
+        )
+
+    def _explain(self, conn: Connection, statement: str, parameters: Any) -> str | None:
+        """実行計画を取得する（取得できない場合はNone）"""
+        prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if prefix is None or not EXPLAINABLE.match(statement):
+            return None
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return " / ".join(str(row[-1]) for row in cursor.fetchall())
+        except Exception:  # 実行計画の取得失敗でリクエストを失敗させない
+            logger.debug("EXPLAIN failed for %s", statement, exc_info=True)
+            return None
+        finally:
+            cursor.close()
+
+
+class QueryProfilerMiddleware:
+    """リクエストごとにN+1検出の範囲を設定するASGIミドルウェア"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _profile_scope.set(ProfileScope(asgi_scope=scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _profile_scope.reset(token)
@@ -0,0 +1,109 @@
+"""リードレプリカへの読み込みの振り分け
+
+書き込みはプライマリ、読み込み（SELECT）はレプリカのエンジンで実行する
+RoutingSession と、複数のレプリカから1つを選ぶセレクタを提供する。
+"""
+
+import itertools
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import Connection, Delete, Engine, Insert, Select, Update
+from sqlalchemy.orm import Session
+
+
+class RoundRobinSelector:
+    """レプリカを順番に選ぶセレクタ"""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self, replicas: Sequence[Engine]) -> Engine:
+        with self._lock:
+            index = next(self._counter)
+        return replicas[index % len(replicas)]
+
+
+class LeastConnectionsSelector:
+    """貸し出し中の接続数が最も少ないレプリカを選ぶセレクタ"""
+
+    def choose(self, replicas: Sequence[Engine]) -> Engine:
+        return min(replicas, key=_checked_out)
+
+
+def _checked_out(engine: Engine) -> int:
+    """エンジンのプールから貸し出し中の接続数"""
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout is not None else 0
+
+
+SELECTORS: dict[str, type[RoundRobinSelector | LeastConnectionsSelector]] = {
+    "round_robin": RoundRobinSelector,
+    "least_connections": LeastConnectionsSelector,
+}
+
+
+def make_selector(name: str) -> RoundRobinSelector | LeastConnectionsSelector:
+    """名前からレプリカのセレクタを作成する"""
+    try:
+        return SELECTORS[name]()
+    except KeyError:
+        raise ValueError(f"不明なレプリカ選択方式です: {name}") from None
+
+
+class RoutingSession(Session):
+    """
+    読み込みをレプリカ、書き込みをプライマリに振り分けるセッション
+
+    - INSERT / UPDATE / DELETE、flush、SELECT ... FOR UPDATE はプライマリで実行する
+    - それ以外の SELECT はセッションごとに選んだ1つのレプリカで実行する
+    - 一度書き込んだセッションは、以降の読み込みもプライマリで実行する
+      （自分の書き込みがレプリカに反映される前に読んでしまうのを防ぐ）
+    - use_primary() で明示的にプライマリへ固定できる
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        replicas: Sequence[Engine] = (),
+        selector: RoundRobinSelector | LeastConnectionsSelector | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = list(replicas)
+        self.selector = selector or RoundRobinSelector()
+        self.force_primary = False
+        self._wrote = False
+        self._replica: Engine | None = None
+
+    def get_bind(
+        self, mapper: Any = None, clause: Any = None, **kwargs: Any
+    ) -> Engine | Connection:
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self._wrote = True
+            return primary
+        if not self.replicas or self.force_primary or self._wrote:
+            return primary
+        if isinstance(clause, Select) and clause._for_update_arg is None:
+            if self._replica is None:
+                self._replica = self.selector.choose(self.replicas)
+            return self._replica
+        return primary
+
+
+@contextmanager
+def use_primary(session: Session) -> Iterator[Session]:
+    """ブロック内の読み込みをプライマリで実行する"""
+    if not isinstance(session, RoutingSession):
+        yield session
+        return
+    previous = session.force_primary
+    session.force_primary = True
+    try:
+        yield session
+    finally:
+        session.force_primary = previous
@@ -1,3 +1,13 @@
-from .task import TaskRepository
+from .async_task import AsyncTaskRepository
+from .pagination import InvalidCursorError, TaskPage
+from .statements import TaskStats
+from .task import TaskRepository, TaskVersionConflictError
 
-__all__ = ["TaskRepository"]
+__all__ = [
+    "TaskRepository",
+    "AsyncTaskRepository",
+    "TaskPage",
+    "TaskStats",
+    "InvalidCursorError",
+    "TaskVersionConflictError",
+]
@@ -0,0 +1,137 @@
+"""Hot/cold archival of completed tasks.
+
+Completed tasks last updated before a retention cutoff are moved from
+``tasks`` to ``tasks_archive`` in bounded batches, so the hot table, its
+indexes and the full-text index only hold tasks that are still in use.
+Archived tasks stay readable by id (``TaskRepository.get_archived``, used by
+``GET /tasks/{task_id}`` when the task is not in ``tasks``) but are read-only,
+and no longer appear in lists, search, stats or delta sync.
+
+The archive has its own primary key and keeps the task's id in the
+non-unique ``task_id`` column: on SQLite databases whose ``tasks`` table
+predates AUTOINCREMENT, the id of an archived task can be reused by a new
+task, which may later be archived too.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Delete,
+    Insert,
+    Row,
+    Select,
+    and_,
+    delete,
+    insert,
+    literal,
+    select,
+)
+
+from task_app.models.archive import ArchivedTask
+from task_app.models.task import Task
+
+# Columns copied from ``tasks`` to ``tasks_archive``.
+ARCHIVE_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "completed",
+    "created_at",
+    "updated_at",
+    "version",
+)
+ARCHIVE_COLUMNS = tuple(getattr(Task, field) for field in ARCHIVE_FIELDS)
+# The ``tasks_archive`` columns ``ARCHIVE_FIELDS`` are copied to.
+ARCHIVE_TARGETS = tuple(
+    "task_id" if field == "id" else field for field in ARCHIVE_FIELDS
+)
+
+
+def archivable_statement(cutoff: datetime, limit: int) -> Select[int]:
+    """SELECT of the ids of the oldest ``limit`` tasks eligible for archiving.
+
+    A task is eligible once it is completed and was last updated before
+    ``cutoff``. Scanning ``ix_tasks_updated_at_id`` from the oldest row stops
+    after ``limit`` matches.
+    """
+    return (
+        select(Task.id)
+        .where(Task.completed, Task.updated_at < cutoff)
+        .order_by(Task.updated_at, Task.id)
+        .limit(limit)
+    )
+
+
+def still_eligible(task_ids: list[int], cutoff: datetime) -> ColumnElement[bool]:
+    """WHERE clause matching the tasks among ``task_ids`` that are still eligible.
+
+    The eligibility check is repeated because a task may have been reopened
+    or updated since its id was selected.
+    """
+    return and_(Task.id.in_(task_ids), Task.completed, Task.updated_at < cutoff)
+
+
+def archive_delete(task_ids: list[int], cutoff: datetime) -> Delete:
+    """DELETE of the tasks among ``task_ids`` that are still eligible."""
+    return (
+        delete(Task)
+        .where(still_eligible(task_ids, cutoff))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def archive_lock(task_ids: list[int], cutoff: datetime) -> Select[int]:
+    """SELECT ... FOR UPDATE of the ids among ``task_ids`` that are still eligible.
+
+    For backends without DELETE ... RETURNING; run it before ``archive_copy``
+    so that a concurrent archiver waits for the rows instead of copying them
+    a second time, then finds them gone.
+    """
+    return select(Task.id).where(still_eligible(task_ids, cutoff)).with_for_update()
+
+
+def archive_copy(
+    task_ids: list[int], cutoff: datetime, archived_at: datetime
+) -> Insert:
+    """INSERT ... SELECT copying the still eligible ``task_ids`` to the archive.
+
+    For backends without DELETE ... RETURNING; run it after ``archive_lock``
+    and before ``archive_delete`` in the same transaction.
+    """
+    archived = literal(archived_at, ArchivedTask.archived_at.type)
+    source = select(*ARCHIVE_COLUMNS, archived).where(still_eligible(task_ids, cutoff))
+    return insert(ArchivedTask).from_select([*ARCHIVE_TARGETS, "archived_at"], source)
+
+
+def archive_rows(
+    rows: Iterable[Row[*tuple[Any, ...]]], archived_at: datetime
+) -> list[dict[str, Any]]:
+    """``tasks_archive`` rows for ``ARCHIVE_COLUMNS`` rows returned by a DELETE."""
+    return [
+        {**dict(zip(ARCHIVE_TARGETS, row)), "archived_at": archived_at} for row in rows
+    ]
+
+
+def archived_statement(task_id: int) -> Select[*tuple[Any, ...]]:
+    """SELECT of an archived task's ``ARCHIVE_FIELDS``.
+
+    If the id was archived more than once, the latest archived row wins.
+    """
+    columns = (
+        getattr(ArchivedTask, target).label(field)
+        for field, target in zip(ARCHIVE_FIELDS, ARCHIVE_TARGETS)
+    )
+    return (
+        select(*columns)
+        .where(ArchivedTask.task_id == task_id)
+        .order_by(ArchivedTask.id.desc())
+        .limit(1)
+    )
+
+
+def archived_task(row: Row[*tuple[Any, ...]]) -> Task:
+    """A transient ``Task`` (not attached to any session) for an archived row."""
+    return Task(**row._mapping)
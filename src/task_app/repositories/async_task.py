@@ -0,0 +1,257 @@
+from collections.abc import Iterable, Sequence
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, Row, Select, insert, not_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from task_app.models.outbox import TaskOutboxEvent
+from task_app.models.task import Task
+from task_app.repositories.archive import archived_statement, archived_task
+from task_app.repositories.changes import tombstone_statements
+from task_app.repositories.outbox import event_rows
+from task_app.repositories.pagination import TaskPage, apply_keyset, build_page
+from task_app.repositories.statements import (
+    apply_filters,
+    completed_update,
+    id_chunks,
+    ordered,
+    parse_order,
+    response_rows,
+    task_values,
+    version_statement,
+)
+from task_app.repositories.task import TaskVersionConflictError
+from task_app.schemas.task import TaskCreate, TaskFilter, TaskUpdate
+
+
+class AsyncTaskRepository:
+    """Task model's database operations on an AsyncSession.
+
+    Mirrors the ``TaskRepository`` operations the async router serves, so that
+    those request handlers can await the database on the event loop instead of
+    occupying a threadpool worker. Statements come from
+    ``repositories.statements``.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _record(
+        self,
+        event_type: str,
+        task_ids: list[int],
+        tasks: Iterable[Task] | None = None,
+    ) -> None:
+        """Add outbox events for ``task_ids`` to the current transaction."""
+        rows = event_rows(event_type, task_ids, tasks)
+        if rows:
+            await self.db.execute(insert(TaskOutboxEvent), rows)
+
+    async def create(self, task_in: TaskCreate) -> Task:
+        """Create a new task and save to database."""
+        db_task = Task(**task_values(task_in))
+        self.db.add(db_task)
+        await self.db.flush()
+        await self._record("created", [db_task.id], [db_task])
+        await self.db.commit()
+        await self.db.refresh(db_task)
+        return db_task
+
+    async def create_many(
+        self, tasks_in: list[TaskCreate], chunk_size: int = 500
+    ) -> list[Task]:
+        """Create many tasks in a single transaction (see TaskRepository)."""
+        rows = [task_values(t) for t in tasks_in]
+        created: list[Task] = []
+        try:
+            if self.db.get_bind().dialect.insert_executemany_returning:
+                stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start : start + chunk_size]
+                    result = await self.db.scalars(stmt, chunk)
+                    created.extend(result.all())
+            else:
+                for start in range(0, len(rows), chunk_size):
+                    new = [Task(**row) for row in rows[start : start + chunk_size]]
+                    self.db.add_all(new)
+                    await self.db.flush()
+                    created.extend(new)
+            await self._record("created", [task.id for task in created], created)
+            for task in created:
+                self.db.expunge(task)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return created
+
+    async def get_by_id(self, task_id: int) -> Task | None:
+        """Get task by ID."""
+        result = await self.db.scalars(select(Task).where(Task.id == task_id))
+        return result.first()
+
+    async def get_archived(self, task_id: int) -> Task | None:
+        """Get an archived task by ID as a detached ``Task``."""
+        row = (await self.db.execute(archived_statement(task_id))).first()
+        return archived_task(row) if row is not None else None
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: TaskFilter | None = None,
+        order_by: str = "id",
+    ) -> list[Task]:
+        """Get tasks matching ``filters`` with pagination support."""
+        stmt = ordered(apply_filters(select(Task), filters), order_by)
+        result = await self.db.scalars(stmt.offset(skip).limit(limit))
+        return list(result.all())
+
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        order_by: str = "id",
+        filters: TaskFilter | None = None,
+        rows: bool = False,
+        fields: Sequence[str] | None = None,
+    ) -> TaskPage:
+        """Get a page of tasks matching ``filters`` using keyset pagination."""
+        columns, descending = parse_order(order_by)
+        stmt, position = apply_keyset(
+            apply_filters(select(Task), filters),
+            columns,
+            cursor,
+            order_by,
+            limit,
+            descending=descending,
+        )
+        items = await self._fetch(stmt, rows, fields, columns)
+        return build_page(items, columns, position, order_by, limit)
+
+    async def get_many(
+        self,
+        ids: list[int],
+        filters: TaskFilter | None = None,
+        fields: Sequence[str] | None = None,
+        chunk_size: int = 500,
+    ) -> list[Row[*tuple[Any, ...]]]:
+        """Get tasks by id as row tuples, in the order of ``ids``."""
+        found: dict[int, Row[*tuple[Any, ...]]] = {}
+        for chunk in id_chunks(ids, chunk_size):
+            stmt = apply_filters(select(Task), filters).where(Task.id.in_(chunk))
+            for row in await self.db.execute(response_rows(stmt, fields)):
+                found[row.id] = row
+        return [found[task_id] for task_id in dict.fromkeys(ids) if task_id in found]
+
+    async def _fetch(
+        self,
+        stmt: Select[Task],
+        rows: bool,
+        fields: Sequence[str] | None = None,
+        keys: tuple[Any, ...] = (),
+    ) -> list[Any]:
+        """Run a ``select(Task)``, as row tuples when ``rows`` is set."""
+        if rows:
+            return list(await self.db.execute(response_rows(stmt, fields, keys)))
+        return list(await self.db.scalars(stmt))
+
+    async def update(
+        self,
+        task_id: int,
+        task_in: TaskUpdate,
+        expected_version: int | None = None,
+    ) -> Task | None:
+        """Update task by ID, detecting concurrent writes by version."""
+        try:
+            db_task = await self.get_by_id(task_id)
+            if not db_task:
+                return None
+            if expected_version is not None and db_task.version != expected_version:
+                raise TaskVersionConflictError(task_id, expected_version)
+
+            for field, value in task_in.model_dump(exclude_unset=True).items():
+                setattr(db_task, field, value)
+
+            await self.db.flush()
+            await self._record("updated", [task_id], [db_task])
+            await self.db.commit()
+        except StaleDataError:
+            await self.db.rollback()
+            raise TaskVersionConflictError(task_id, expected_version) from None
+        except Exception:
+            await self.db.rollback()
+            raise
+        await self.db.refresh(db_task)
+        return db_task
+
+    async def delete(self, task_id: int) -> bool:
+        """Delete task by ID, recording a tombstone for delta sync."""
+        db_task = await self.get_by_id(task_id)
+        if not db_task:
+            return False
+
+        try:
+            await self.db.delete(db_task)
+            for stmt in tombstone_statements([task_id]):
+                await self.db.execute(stmt)
+            await self._record("deleted", [task_id])
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return True
+
+    async def mark_complete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
+        """Mark task as completed."""
+        return await self._update_completed(task_id, True, expected_version)
+
+    async def mark_incomplete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
+        """Mark task as incomplete."""
+        return await self._update_completed(task_id, False, expected_version)
+
+    async def toggle_complete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
+        """Flip the completed flag of a task atomically."""
+        return await self._update_completed(
+            task_id, not_(Task.completed), expected_version
+        )
+
+    async def _update_completed(
+        self, task_id: int, completed: Any, expected_version: int | None = None
+    ) -> Task | None:
+        """Set ``completed`` with a single UPDATE statement."""
+        stmt = completed_update(task_id, completed, expected_version)
+        try:
+            if self.db.get_bind().dialect.update_returning:
+                result = await self.db.scalars(
+                    stmt.returning(Task),
+                    execution_options={"populate_existing": True},
+                )
+                db_task = result.first()
+            elif cast(CursorResult[Any], await self.db.execute(stmt)).rowcount:
+                result = await self.db.scalars(
+                    select(Task)
+                    .where(Task.id == task_id)
+                    .execution_options(populate_existing=True)
+                )
+                db_task = result.first()
+            else:
+                db_task = None
+            if db_task is None and expected_version is not None:
+                if await self.db.scalar(version_statement(task_id)) is not None:
+                    raise TaskVersionConflictError(task_id, expected_version)
+            if db_task is not None:
+                await self._record("completed", [task_id], [db_task])
+                self.db.expunge(db_task)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return db_task
@@ -0,0 +1,183 @@
+"""Delta sync: tasks changed or deleted since a watermark.
+
+Changed tasks are read in ``(updated_at, id)`` order through
+``ix_tasks_updated_at_id`` and deletions in ``(deleted_at, task_id)`` order
+from ``task_tombstones``. The opaque watermark records the last position
+returned in each stream, so a sync costs time proportional to the number of
+changes rather than to the size of the table.
+
+Timestamps are assigned before a write runs, so a transaction that is still
+in flight while a client syncs can later commit a row older than rows that
+sync already returned. The watermark is therefore only advanced over rows
+older than ``SETTLE_TIME`` when the sync started (by then every write that
+assigned such a timestamp has committed or failed). Newer rows are returned
+too, but from the last page only, and are returned again by the next sync;
+clients apply changes by id, so seeing a task twice is harmless.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Executable, Select, delete, insert, select, tuple_
+
+from task_app.models.task import Task, utc_now
+from task_app.models.tombstone import TaskTombstone
+from task_app.repositories.pagination import (
+    InvalidCursorError,
+    decode_token,
+    encode_token,
+)
+
+# Longest a write may take from assigning its timestamp to committing. On
+# SQLite a write can wait up to busy_timeout for the lock after assigning it.
+SETTLE_TIME = timedelta(seconds=10)
+
+
+@dataclass(frozen=True)
+class Watermark:
+    """Last ``(updated_at, id)`` and ``(deleted_at, task_id)`` returned."""
+
+    updated: tuple[datetime, int] | None = None
+    deleted: tuple[datetime, int] | None = None
+
+
+@dataclass
+class ChangeSet:
+    """Tasks changed and ids deleted since a watermark.
+
+    ``changed`` holds ``Task`` objects, or row tuples when fetched with
+    ``rows`` (see ``TaskRepository.get_changes``).
+    """
+
+    changed: list[Any] = field(default_factory=list)
+    deleted: list[int] = field(default_factory=list)
+    watermark: str = ""
+    has_more: bool = False
+
+
+def encode_watermark(watermark: Watermark) -> str:
+    """Encode a watermark as an opaque URL-safe token."""
+    return encode_token(
+        {
+            "u": list(watermark.updated) if watermark.updated else None,
+            "d": list(watermark.deleted) if watermark.deleted else None,
+        }
+    )
+
+
+def _position(value: Any) -> tuple[datetime, int] | None:
+    if value is None:
+        return None
+    if (
+        not isinstance(value, list)
+        or len(value) != 2
+        or not isinstance(value[0], datetime)
+        or not isinstance(value[1], int)
+    ):
+        raise InvalidCursorError("Malformed watermark")
+    return value[0], value[1]
+
+
+def decode_watermark(token: str) -> Watermark:
+    """Decode a watermark token produced by ``encode_watermark``."""
+    payload = decode_token(token)
+    if not isinstance(payload, dict) or payload.keys() != {"u", "d"}:
+        raise InvalidCursorError("Malformed watermark")
+    return Watermark(updated=_position(payload["u"]), deleted=_position(payload["d"]))
+
+
+def changed_statement(after: tuple[datetime, int] | None, limit: int) -> Select[Task]:
+    """SELECT of tasks updated after ``after``, one row beyond ``limit``."""
+    stmt = select(Task).order_by(Task.updated_at, Task.id).limit(limit + 1)
+    if after is not None:
+        stmt = stmt.where(tuple_(Task.updated_at, Task.id) > tuple_(*after))
+    return stmt
+
+
+def deleted_statement(
+    after: tuple[datetime, int] | None, limit: int
+) -> Select[*tuple[Any, ...]]:
+    """SELECT of tombstones recorded after ``after``, one row beyond ``limit``."""
+    key = (TaskTombstone.deleted_at, TaskTombstone.task_id)
+    stmt = select(*key).order_by(*key).limit(limit + 1)
+    if after is not None:
+        stmt = stmt.where(tuple_(*key) > tuple_(*after))
+    return stmt
+
+
+def settled_cutoff() -> datetime:
+    """Rows older than this have committed; take it before running the SELECTs."""
+    return utc_now() - SETTLE_TIME
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite does not store the time zone; naive values are UTC.
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def _advance(
+    rows: Sequence[Any],
+    at: str,
+    key: str,
+    after: tuple[datetime, int] | None,
+    limit: int,
+    settled_before: datetime,
+) -> tuple[list[Any], tuple[datetime, int] | None, bool]:
+    """Rows to return, the next position and whether a full page was settled.
+
+    Rows come in ``(at, key)`` order, so the settled ones are a prefix. A page
+    with unsettled rows is the last one: the position stops before them and
+    fetching again would return the same page.
+    """
+    page = list(rows[:limit])
+    settled = 0
+    while settled < len(page) and _as_utc(getattr(page[settled], at)) < settled_before:
+        settled += 1
+    if settled:
+        last = page[settled - 1]
+        after = (getattr(last, at), getattr(last, key))
+    return page, after, len(rows) > limit and settled == len(page)
+
+
+def build_changes(
+    changed: Sequence[Any],
+    deleted: Sequence[Any],
+    watermark: Watermark,
+    limit: int,
+    settled_before: datetime,
+) -> ChangeSet:
+    """Build a ``ChangeSet`` from rows fetched with the statements above.
+
+    ``settled_before`` is the ``settled_cutoff()`` taken before the fetch.
+    """
+    changed, updated, more_changed = _advance(
+        changed, "updated_at", "id", watermark.updated, limit, settled_before
+    )
+    deleted, removed, more_deleted = _advance(
+        deleted, "deleted_at", "task_id", watermark.deleted, limit, settled_before
+    )
+    return ChangeSet(
+        changed=changed,
+        deleted=[row.task_id for row in deleted],
+        watermark=encode_watermark(Watermark(updated=updated, deleted=removed)),
+        has_more=more_changed or more_deleted,
+    )
+
+
+def tombstone_statements(task_ids: list[int]) -> list[Executable]:
+    """Statements recording ``task_ids`` as deleted now.
+
+    Existing tombstones for the same ids are replaced first. That only
+    happens on databases created before ids stopped being reused.
+    """
+    if not task_ids:
+        return []
+    now = utc_now()
+    return [
+        delete(TaskTombstone).where(TaskTombstone.task_id.in_(task_ids)),
+        insert(TaskTombstone).values(
+            [{"task_id": task_id, "deleted_at": now} for task_id in task_ids]
+        ),
+    ]
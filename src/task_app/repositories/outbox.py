@@ -0,0 +1,105 @@
+"""Transactional outbox of task changes.
+
+Every mutation in ``TaskRepository`` (and the group-commit operations in
+``task_app.batching``) inserts ``task_events`` rows in the same transaction as
+the change itself, so an event exists exactly when the change was committed.
+``task_app.outbox.OutboxDispatcher`` later claims the rows in id order, hands
+them to a sink and deletes them.
+
+A claim stamps a batch with the dispatcher's claim token and time in a short
+transaction of its own, so several dispatchers (one per worker process, or a
+worker and a one-off script) never send the same event concurrently. A claim
+that is not released within the lease, e.g. because its dispatcher crashed,
+can be taken over by another dispatcher.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Delete, Select, Update, delete, or_, select, update
+
+from task_app.models.outbox import TaskOutboxEvent
+from task_app.models.task import Task
+from task_app.serializers import RESPONSE_FIELDS, dumps_json, task_record
+
+
+def task_payload(task: Task) -> str:
+    """JSON of ``task`` in the ``TaskResponse`` shape."""
+    return dumps_json(
+        task_record([getattr(task, name) for name in RESPONSE_FIELDS])
+    ).decode()
+
+
+def event_rows(
+    event_type: str, task_ids: list[int], tasks: Iterable[Task] | None = None
+) -> list[dict[str, Any]]:
+    """``task_events`` rows for a change to ``task_ids``.
+
+    ``tasks`` (in the same order as ``task_ids``) are stored as the payload;
+    without them, e.g. for deletions and bulk updates, the payload is NULL.
+    Insert the rows with ``session.execute(insert(TaskOutboxEvent), rows)``.
+    """
+    if tasks is None:
+        return [
+            {"event_type": event_type, "task_id": task_id, "payload": None}
+            for task_id in task_ids
+        ]
+    return [
+        {"event_type": event_type, "task_id": task_id, "payload": task_payload(task)}
+        for task_id, task in zip(task_ids, tasks)
+    ]
+
+
+def claim_statement(
+    token: str, now: datetime, lease_expired: datetime, limit: int
+) -> Update:
+    """UPDATE claiming the oldest ``limit`` claimable events for ``token``.
+
+    An event is claimable when it is unclaimed or its claim was made before
+    ``lease_expired``. Picking and stamping the batch is one statement, so on
+    SQLite it runs under the database write lock; on PostgreSQL the picked
+    rows are locked with ``FOR UPDATE SKIP LOCKED`` so that concurrent claims
+    take disjoint batches instead of waiting for each other.
+    """
+    claimed_at = TaskOutboxEvent.claimed_at
+    claimable = (
+        select(TaskOutboxEvent.id)
+        .where(or_(claimed_at.is_(None), claimed_at < lease_expired))
+        .order_by(TaskOutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(TaskOutboxEvent)
+        .where(TaskOutboxEvent.id.in_(claimable.scalar_subquery()))
+        .values(claimed_by=token, claimed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def claimed_statement(token: str) -> Select[TaskOutboxEvent]:
+    """SELECT of the events claimed by ``token``, in id order."""
+    return (
+        select(TaskOutboxEvent)
+        .where(TaskOutboxEvent.claimed_by == token)
+        .order_by(TaskOutboxEvent.id)
+    )
+
+
+def delivered_statement(token: str) -> Delete:
+    """DELETE of the events delivered under the claim ``token``.
+
+    Events whose claim was taken over after the lease expired are left for
+    the dispatcher that now holds them.
+    """
+    return delete(TaskOutboxEvent).where(TaskOutboxEvent.claimed_by == token)
+
+
+def release_statement(token: str) -> Update:
+    """UPDATE releasing the claim ``token`` after a failed send."""
+    return (
+        update(TaskOutboxEvent)
+        .where(TaskOutboxEvent.claimed_by == token)
+        .values(claimed_by=None, claimed_at=None)
+    )
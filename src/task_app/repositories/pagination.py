@@ -0,0 +1,150 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+
+from task_app.models.task import Task
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class TaskPage:
+    """A page of tasks with opaque cursors to the neighbouring pages.
+
+    ``items`` are ``Task`` objects, or row tuples when fetched with ``rows``
+    (see ``TaskRepository.get_page`` and ``get_many``).
+    """
+
+    items: list[Any] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class CursorPosition:
+    """Decoded cursor: sort key values of the boundary row and direction."""
+
+    order_by: str
+    values: tuple[Any, ...]
+    backwards: bool = False
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a token")
+
+
+def _json_object_hook(obj: dict[str, Any]) -> Any:
+    if obj.keys() == {"dt"}:
+        return datetime.fromisoformat(obj["dt"])
+    return obj
+
+
+def encode_token(payload: Any) -> str:
+    """Encode a JSON payload (datetimes allowed) as an opaque URL-safe token."""
+    raw = json.dumps(payload, separators=(",", ":"), default=_json_default)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> Any:
+    """Decode a token produced by ``encode_token``."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded)
+        return json.loads(raw, object_hook=_json_object_hook)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorError("Malformed token") from exc
+
+
+def encode_cursor(position: CursorPosition) -> str:
+    """Encode a cursor position as an opaque URL-safe token."""
+    return encode_token(
+        {"o": position.order_by, "v": list(position.values), "b": position.backwards}
+    )
+
+
+def decode_cursor(token: str, order_by: str) -> CursorPosition:
+    """Decode a cursor token, checking that it was issued for ``order_by``."""
+    payload = decode_token(token)
+    try:
+        position = CursorPosition(
+            order_by=payload["o"],
+            values=tuple(payload["v"]),
+            backwards=bool(payload["b"]),
+        )
+    except (KeyError, TypeError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+    if position.order_by != order_by:
+        raise InvalidCursorError(
+            f"Cursor was issued for order_by={position.order_by!r}"
+        )
+    return position
+
+
+def apply_keyset(
+    stmt: Select[*tuple[Any, ...]],
+    columns: tuple[Any, ...],
+    cursor: str | None,
+    order_by: str,
+    limit: int,
+    descending: bool = False,
+) -> tuple[Select[*tuple[Any, ...]], CursorPosition | None]:
+    """Restrict and order ``stmt`` to the page after (or before) ``cursor``.
+
+    With ``descending`` the page order is reversed on every sort column, which
+    an index on ``columns`` serves as a backward scan. One extra row beyond
+    ``limit`` is requested so that ``build_page`` can tell whether another page
+    exists.
+    """
+    position = decode_cursor(cursor, order_by) if cursor else None
+    if position is not None and len(position.values) != len(columns):
+        raise InvalidCursorError("Malformed cursor")
+    backwards = position is not None and position.backwards
+    reverse = backwards != descending
+
+    if position is not None:
+        if len(columns) > 1:
+            key, bound = tuple_(*columns), tuple_(*position.values)
+        else:
+            key, bound = columns[0], position.values[0]
+        stmt = stmt.where(key < bound if reverse else key > bound)
+    ordering = [c.desc() for c in columns] if reverse else list(columns)
+    return stmt.order_by(*ordering).limit(limit + 1), position
+
+
+def build_page(
+    rows: list[Any],
+    columns: tuple[Any, ...],
+    position: CursorPosition | None,
+    order_by: str,
+    limit: int,
+) -> TaskPage:
+    """Build a ``TaskPage`` from rows fetched with ``apply_keyset``."""
+    backwards = position is not None and position.backwards
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    if backwards:
+        items.reverse()
+
+    def cursor_for(task: Task, backwards: bool) -> str:
+        values = tuple(getattr(task, c.key) for c in columns)
+        return encode_cursor(CursorPosition(order_by, values, backwards))
+
+    page = TaskPage(items=items)
+    if items:
+        if has_more or backwards:
+            page.next_cursor = cursor_for(items[-1], backwards=False)
+        if position is not None and (has_more or not backwards):
+            page.prev_cursor = cursor_for(items[0], backwards=True)
+    return page
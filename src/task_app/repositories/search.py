@@ -0,0 +1,84 @@
+"""Full-text search query construction.
+
+SQLite searches the ``tasks_fts`` FTS5 table (trigram tokenizer) and ranks by
+bm25; PostgreSQL matches the GIN-indexed tsvector expression and ranks by
+ts_rank. Other backends fall back to unindexed LIKE matching.
+"""
+
+from sqlalchemy import (
+    ColumnElement,
+    Dialect,
+    Select,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+
+from task_app.models.task import Task, fts5_supported, search_document
+
+TASKS_FTS = table("tasks_fts", column("rowid"), column("tasks_fts"))
+
+# bm25 column weights (title, description): title matches rank higher.
+BM25_WEIGHTS = (10.0, 1.0)
+
+# The trigram tokenizer cannot match terms shorter than three characters.
+TRIGRAM_LENGTH = 3
+
+
+def search_terms(q: str) -> list[str]:
+    """Split a search query into distinct whitespace-separated terms."""
+    return list(dict.fromkeys(q.split()))
+
+
+def fts5_match(terms: list[str]) -> str:
+    """FTS5 MATCH expression requiring every term as a literal phrase.
+
+    Quoting each term keeps user input from being parsed as FTS5 query syntax
+    (AND/OR/NEAR, column filters, ``*``).
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _contains(term: str) -> ColumnElement[bool]:
+    return or_(
+        Task.title.contains(term, autoescape=True),
+        Task.description.contains(term, autoescape=True),
+    )
+
+
+def search_statement(dialect: Dialect, q: str) -> Select[Task]:
+    """SELECT of tasks matching every term of ``q``, best matches first."""
+    terms = search_terms(q)
+    stmt = select(Task)
+
+    if fts5_supported(dialect):
+        indexed = [t for t in terms if len(t) >= TRIGRAM_LENGTH]
+        if indexed:
+            rank = func.bm25(literal_column("tasks_fts"), *BM25_WEIGHTS)
+            stmt = (
+                stmt.join(TASKS_FTS, TASKS_FTS.c.rowid == Task.id)
+                .where(TASKS_FTS.c.tasks_fts.op("MATCH")(fts5_match(indexed)))
+                .order_by(rank, Task.id)
+            )
+        else:
+            stmt = stmt.order_by(Task.id)
+        # Short terms only narrow the rows already found through the index
+        # (or, when every term is short, scan the table).
+        for term in terms:
+            if len(term) < TRIGRAM_LENGTH:
+                stmt = stmt.where(_contains(term))
+        return stmt
+
+    if dialect.name == "postgresql":
+        document = search_document()
+        query = func.websearch_to_tsquery(literal_column("'simple'"), q)
+        return stmt.where(document.op("@@")(query)).order_by(
+            func.ts_rank(document, query).desc(), Task.id
+        )
+
+    for term in terms:
+        stmt = stmt.where(_contains(term))
+    return stmt.order_by(Task.id)
@@ -0,0 +1,219 @@
+"""Statement builders shared by ``TaskRepository`` and ``AsyncTaskRepository``.
+
+Nothing here touches a session: the functions build statements or interpret
+their results, so the sync and async repositories issue the same SQL.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, TypeVar, overload
+
+from sqlalchemy import Delete, Select, Update, case, func, select, update
+
+from task_app.models.counter import COMPLETED, TOTAL, TaskCounter
+from task_app.models.task import Task
+from task_app.schemas.task import TaskCreate, TaskFilter
+from task_app.serializers import RESPONSE_COLUMNS
+
+FilterableT = TypeVar("FilterableT", Select[*tuple[Any, ...]], Update, Delete)
+WriteT = TypeVar("WriteT", Update, Delete)
+
+# Keyset sort keys. Each key ends with the primary key so that it is unique.
+# A leading "-" on the key name (e.g. "-created_at") sorts descending.
+SORT_KEYS = {
+    "id": (Task.id,),
+    "created_at": (Task.created_at, Task.id),
+    "updated_at": (Task.updated_at, Task.id),
+}
+
+
+def parse_order(order_by: str) -> tuple[tuple[Any, ...], bool]:
+    """Sort key columns for ``order_by`` and whether it is descending."""
+    return SORT_KEYS[order_by.removeprefix("-")], order_by.startswith("-")
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """Smallest string that sorts after every string starting with ``prefix``.
+
+    Returns None when there is no such string (the prefix consists only of
+    the highest code point).
+    """
+    stripped = prefix.rstrip(chr(0x10FFFF))
+    if not stripped:
+        return None
+    successor = ord(stripped[-1]) + 1
+    if 0xD800 <= successor <= 0xDFFF:
+        # Surrogates cannot be encoded; skip to the next valid code point.
+        successor = 0xE000
+    return stripped[:-1] + chr(successor)
+
+
+def apply_filters(stmt: FilterableT, filters: TaskFilter | None) -> FilterableT:
+    """Add a WHERE clause for each condition set on ``filters``.
+
+    Every condition is an equality or range on an indexed column. The title
+    prefix in particular is expressed as ``title >= prefix AND title < next``
+    rather than LIKE, so it is an index range scan on any backend (assuming a
+    binary collation, the SQLite default).
+    """
+    if filters is None:
+        return stmt
+    if filters.completed is not None:
+        stmt = stmt.where(Task.completed == filters.completed)
+    if filters.created_after is not None:
+        stmt = stmt.where(Task.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        stmt = stmt.where(Task.created_at < filters.created_before)
+    if filters.updated_after is not None:
+        stmt = stmt.where(Task.updated_at >= filters.updated_after)
+    if filters.updated_before is not None:
+        stmt = stmt.where(Task.updated_at < filters.updated_before)
+    if filters.title_prefix:
+        stmt = stmt.where(Task.title >= filters.title_prefix)
+        upper = prefix_upper_bound(filters.title_prefix)
+        if upper is not None:
+            stmt = stmt.where(Task.title < upper)
+    return stmt
+
+
+@overload
+def id_chunks(ids: list[int], chunk_size: int) -> Iterator[list[int]]: ...
+
+
+@overload
+def id_chunks(ids: list[int] | None, chunk_size: int) -> Iterator[list[int] | None]: ...
+
+
+def id_chunks(ids: list[int] | None, chunk_size: int) -> Iterator[list[int] | None]:
+    """Split ``ids`` (deduplicated) into IN-list sized chunks.
+
+    ``None`` (no id restriction) yields a single ``None``.
+    """
+    if ids is None:
+        yield None
+        return
+    unique = list(dict.fromkeys(ids))
+    for start in range(0, len(unique), chunk_size):
+        yield unique[start : start + chunk_size]
+
+
+def response_rows(
+    stmt: Select[*tuple[Any, ...]],
+    fields: Sequence[str] | None = None,
+    keys: tuple[Any, ...] = (),
+) -> Select[*tuple[Any, ...]]:
+    """Narrow a ``select(Task)`` to the response columns, yielding row tuples.
+
+    Read endpoints serialize these rows directly (``serializers.task_record``),
+    skipping ORM object and Pydantic model construction per task.
+
+    With ``fields`` (names from ``RESPONSE_FIELDS``) only those columns are
+    selected, plus ``id``, ``version`` and the ``keys`` columns that ETags and
+    cursors are built from, so e.g. the unbounded ``description`` is neither
+    read nor decoded unless asked for. Such rows are serialized by name
+    (``serializers.partial_record``).
+    """
+    if fields is None:
+        return stmt.with_only_columns(*RESPONSE_COLUMNS)
+    names = {*fields, "id", "version", *(column.key for column in keys)}
+    return stmt.with_only_columns(
+        *(column for column in RESPONSE_COLUMNS if column.key in names)
+    )
+
+
+def ordered(stmt: Select[*tuple[Any, ...]], order_by: str) -> Select[*tuple[Any, ...]]:
+    """Order ``stmt`` by the sort key ``order_by``."""
+    columns, descending = parse_order(order_by)
+    return stmt.order_by(*(c.desc() if descending else c for c in columns))
+
+
+@dataclass(frozen=True)
+class TaskStats:
+    """Aggregate task counts."""
+
+    total: int
+    completed: int
+
+    @property
+    def open(self) -> int:
+        return self.total - self.completed
+
+
+def is_unfiltered(filters: TaskFilter | None) -> bool:
+    """Whether ``filters`` matches every task."""
+    return filters is None or not filters.model_dump(exclude_none=True)
+
+
+def completed_only(filters: TaskFilter | None) -> bool | None:
+    """The ``completed`` condition if it is the only one set on ``filters``."""
+    if filters is None or filters.model_dump(exclude_none=True).keys() != {"completed"}:
+        return None
+    return filters.completed
+
+
+def counters_statement() -> Select[*tuple[Any, ...]]:
+    """SELECT of the trigger-maintained counters (see ``models.counter``)."""
+    return select(TaskCounter.name, TaskCounter.value).where(
+        TaskCounter.name.in_((TOTAL, COMPLETED))
+    )
+
+
+def count_statement(filters: TaskFilter | None) -> Select[int]:
+    """SELECT counting tasks matching ``filters``."""
+    return apply_filters(select(func.count(Task.id)), filters)
+
+
+def stats_statement(filters: TaskFilter | None) -> Select[*tuple[Any, ...]]:
+    """SELECT computing total and completed counts of tasks matching ``filters``."""
+    completed = func.coalesce(func.sum(case((Task.completed, 1), else_=0)), 0)
+    return apply_filters(select(func.count(Task.id), completed), filters)
+
+
+def stats_from_counters(rows: Iterable[Sequence[Any]]) -> TaskStats | None:
+    """Build ``TaskStats`` from counter rows, or None if they are missing."""
+    values = {name: value for name, value in rows}
+    if TOTAL not in values or COMPLETED not in values:
+        return None
+    return TaskStats(total=values[TOTAL], completed=values[COMPLETED])
+
+
+def task_values(task_in: TaskCreate) -> dict[str, Any]:
+    """Column values for inserting a new task."""
+    return {
+        "title": task_in.title,
+        "description": task_in.description,
+        "completed": False,
+    }
+
+
+def bumped(values: dict[str, Any]) -> dict[str, Any]:
+    """``values`` plus the version increment the ORM applies on its own UPDATEs.
+
+    Statement-level UPDATEs bypass ``version_id_col``, so they must bump the
+    version themselves for concurrent ORM writers to detect the change.
+    """
+    return {**values, "version": Task.version + 1}
+
+
+def completed_update(
+    task_id: int, completed: Any, expected_version: int | None = None
+) -> Update:
+    """UPDATE statement setting ``completed`` (a value or SQL expression).
+
+    With ``expected_version`` the row is only updated while it still has
+    that version.
+    """
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(bumped({"completed": completed}))
+        .execution_options(synchronize_session=False)
+    )
+    if expected_version is not None:
+        stmt = stmt.where(Task.version == expected_version)
+    return stmt
+
+
+def version_statement(task_id: int) -> Select[int]:
+    """SELECT of the current version of a task."""
+    return select(Task.version).where(Task.id == task_id)
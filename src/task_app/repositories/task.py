@@ -1,8 +1,70 @@
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, Row, Select, delete, insert, not_, select, update
 from sqlalchemy.orm import Session
-from datetime import datetime, UTC
+from sqlalchemy.orm.exc import StaleDataError
+
+from task_app.models.archive import ArchivedTask
+from task_app.models.outbox import TaskOutboxEvent
+from task_app.models.task import Task, utc_now
+from task_app.repositories.archive import (
+    ARCHIVE_COLUMNS,
+    archivable_statement,
+    archive_copy,
+    archive_delete,
+    archive_lock,
+    archive_rows,
+    archived_statement,
+    archived_task,
+)
+from task_app.repositories.changes import (
+    ChangeSet,
+    Watermark,
+    build_changes,
+    changed_statement,
+    decode_watermark,
+    deleted_statement,
+    settled_cutoff,
+    tombstone_statements,
+)
+from task_app.repositories.outbox import event_rows
+from task_app.repositories.pagination import TaskPage, apply_keyset, build_page
+from task_app.repositories.search import search_statement
+from task_app.repositories.statements import (
+    TaskStats,
+    WriteT,
+    apply_filters,
+    bumped,
+    completed_only,
+    completed_update,
+    count_statement,
+    counters_statement,
+    id_chunks,
+    is_unfiltered,
+    ordered,
+    parse_order,
+    response_rows,
+    stats_from_counters,
+    stats_statement,
+    task_values,
+    version_statement,
+)
+from task_app.schemas.task import TaskCreate, TaskFilter, TaskUpdate
+from task_app.serializers import TASK_COLUMNS
+
 
-from task_app.models.task import Task
-from task_app.schemas.task import TaskCreate, TaskUpdate
+class TaskVersionConflictError(Exception):
+    """Raised when a task no longer has the version the caller expected."""
+
+    def __init__(self, task_id: int, expected_version: int | None = None):
+        message = f"Task {task_id} was modified concurrently"
+        if expected_version is not None:
+            message += f" (expected version {expected_version})"
+        super().__init__(message)
+        self.task_id = task_id
+        self.expected_version = expected_version
 
 
 class TaskRepository:
@@ -11,6 +73,17 @@ class TaskRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def _record(
+        self,
+        event_type: str,
+        task_ids: list[int],
+        tasks: Iterable[Task] | None = None,
+    ) -> None:
+        """Add outbox events for ``task_ids`` to the current transaction."""
+        rows = event_rows(event_type, task_ids, tasks)
+        if rows:
+            self.db.execute(insert(TaskOutboxEvent), rows)
+
     def create(self, task_in: TaskCreate) -> Task:
         """Create a new task and save to database."""
         db_task = Task(
@@ -19,66 +92,357 @@ class TaskRepository:
             completed=False,
         )
         self.db.add(db_task)
+        self.db.flush()
+        self._record("created", [db_task.id], [db_task])
         self.db.commit()
         self.db.refresh(db_task)
         return db_task
 
+    def create_many(
+        self, tasks_in: list[TaskCreate], chunk_size: int = 500
+    ) -> list[Task]:
+        """Create many tasks in one transaction, detached and in input order."""
+        rows = [task_values(t) for t in tasks_in]
+        created: list[Task] = []
+        try:
+            if self.db.get_bind().dialect.insert_executemany_returning:
+                stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start : start + chunk_size]
+                    created.extend(self.db.scalars(stmt, chunk).all())
+            else:
+                # Without RETURNING, let the unit of work fetch generated ids.
+                for start in range(0, len(rows), chunk_size):
+                    new = [Task(**row) for row in rows[start : start + chunk_size]]
+                    self.db.add_all(new)
+                    self.db.flush()
+                    created.extend(new)
+            self._record("created", [task.id for task in created], created)
+            for task in created:
+                self.db.expunge(task)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return created
+
     def get_by_id(self, task_id: int) -> Task | None:
         """Get task by ID."""
         return self.db.query(Task).filter(Task.id == task_id).first()
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> list[Task]:
-        """Get all tasks with pagination support."""
-        return self.db.query(Task).offset(skip).limit(limit).all()
+    def get_archived(self, task_id: int) -> Task | None:
+        """Get an archived task by ID as a detached ``Task``."""
+        row = self.db.execute(archived_statement(task_id)).first()
+        return archived_task(row) if row is not None else None
 
-    def update(self, task_id: int, task_in: TaskUpdate) -> Task | None:
-        """Update task by ID."""
-        db_task = self.get_by_id(task_id)
-        if not db_task:
-            return None
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: TaskFilter | None = None,
+        order_by: str = "id",
+    ) -> list[Task]:
+        """Get tasks matching ``filters`` with pagination support."""
+        stmt = ordered(apply_filters(select(Task), filters), order_by)
+        return list(self.db.scalars(stmt.offset(skip).limit(limit)).all())
 
-        update_data = task_in.model_dump(exclude_unset=True)
+    def get_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        order_by: str = "id",
+        filters: TaskFilter | None = None,
+        rows: bool = False,
+        fields: Sequence[str] | None = None,
+    ) -> TaskPage:
+        """Get a page of tasks matching ``filters`` using keyset pagination."""
+        columns, descending = parse_order(order_by)
+        stmt, position = apply_keyset(
+            apply_filters(select(Task), filters),
+            columns,
+            cursor,
+            order_by,
+            limit,
+            descending=descending,
+        )
+        items = self._fetch(stmt, rows, fields, columns)
+        return build_page(items, columns, position, order_by, limit)
 
-        for field, value in update_data.items():
-            setattr(db_task, field, value)
+    def get_many(
+        self,
+        ids: list[int],
+        filters: TaskFilter | None = None,
+        fields: Sequence[str] | None = None,
+        chunk_size: int = 500,
+    ) -> list[Row[*tuple[Any, ...]]]:
+        """Get tasks by id as row tuples, in the order of ``ids``."""
+        found: dict[int, Row[*tuple[Any, ...]]] = {}
+        for chunk in id_chunks(ids, chunk_size):
+            stmt = apply_filters(select(Task), filters).where(Task.id.in_(chunk))
+            for row in self.db.execute(response_rows(stmt, fields)):
+                found[row.id] = row
+        return [found[task_id] for task_id in dict.fromkeys(ids) if task_id in found]
 
-        self.db.add(db_task)
-        self.db.commit()
+    def count(self, filters: TaskFilter | None = None) -> int:
+        """Count tasks matching ``filters``, from the counters when possible."""
+        if is_unfiltered(filters):
+            return self.get_stats().total
+        completed = completed_only(filters)
+        if completed is not None:
+            stats = self.get_stats()
+            return stats.completed if completed else stats.open
+        return self.db.execute(count_statement(filters)).scalar_one()
+
+    def get_stats(self, filters: TaskFilter | None = None) -> TaskStats:
+        """Get total/completed/open counts of tasks matching ``filters``."""
+        if is_unfiltered(filters):
+            stats = stats_from_counters(self.db.execute(counters_statement()))
+            if stats is not None:
+                return stats
+        total, completed = self.db.execute(stats_statement(filters)).one()
+        return TaskStats(total=total, completed=completed)
+
+    def search(
+        self, q: str, limit: int = 20, offset: int = 0, rows: bool = False
+    ) -> list[Any]:
+        """Full-text search over title and description, best matches first."""
+        stmt = search_statement(self.db.get_bind().dialect, q)
+        return self._fetch(stmt.offset(offset).limit(limit), rows)
+
+    def get_changes(
+        self, since: str | None = None, limit: int = 500, rows: bool = False
+    ) -> ChangeSet:
+        """Get tasks created/updated and ids deleted since the ``since`` watermark."""
+        watermark = decode_watermark(since) if since else Watermark()
+        settled_before = settled_cutoff()
+        changed = self._fetch(changed_statement(watermark.updated, limit), rows)
+        deleted = self.db.execute(deleted_statement(watermark.deleted, limit)).all()
+        return build_changes(changed, deleted, watermark, limit, settled_before)
+
+    def _fetch(
+        self,
+        stmt: Select[Task],
+        rows: bool,
+        fields: Sequence[str] | None = None,
+        keys: tuple[Any, ...] = (),
+    ) -> list[Any]:
+        """Run a ``select(Task)``, as row tuples when ``rows`` is set."""
+        if rows:
+            return list(self.db.execute(response_rows(stmt, fields, keys)))
+        return list(self.db.scalars(stmt))
+
+    def stream_all(self, batch_size: int = 1000) -> Iterator[Row[*tuple[Any, ...]]]:
+        """Stream every task as a row tuple ordered by id, without ORM objects."""
+        stmt = (
+            select(*TASK_COLUMNS)
+            .order_by(Task.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.db.execute(stmt)
+
+    def update(
+        self,
+        task_id: int,
+        task_in: TaskUpdate,
+        expected_version: int | None = None,
+    ) -> Task | None:
+        """Update task by ID, detecting concurrent writes by version."""
+        try:
+            db_task = self.get_by_id(task_id)
+            if not db_task:
+                return None
+            if expected_version is not None and db_task.version != expected_version:
+                raise TaskVersionConflictError(task_id, expected_version)
+
+            update_data = task_in.model_dump(exclude_unset=True)
+
+            for field, value in update_data.items():
+                setattr(db_task, field, value)
+
+            self.db.add(db_task)
+            self.db.flush()
+            self._record("updated", [task_id], [db_task])
+            self.db.commit()
+        except StaleDataError:
+            self.db.rollback()
+            raise TaskVersionConflictError(task_id, expected_version) from None
+        except Exception:
+            self.db.rollback()
+            raise
         self.db.refresh(db_task)
         return db_task
 
     def delete(self, task_id: int) -> bool:
-        """Delete task by ID."""
+        """Delete task by ID, recording a tombstone for delta sync."""
         db_task = self.get_by_id(task_id)
         if not db_task:
             return False
 
-        self.db.delete(db_task)
-        self.db.commit()
+        try:
+            self.db.delete(db_task)
+            for stmt in tombstone_statements([task_id]):
+                self.db.execute(stmt)
+            self._record("deleted", [task_id])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         return True
 
-    def mark_complete(self, task_id: int) -> Task | None:
-        """Mark task as completed."""
-        db_task = self.get_by_id(task_id)
-        if not db_task:
-            return None
+    def archive_completed(
+        self,
+        older_than: datetime,
+        batch_size: int = 500,
+        max_batches: int | None = None,
+    ) -> int:
+        """Move completed tasks last updated before ``older_than`` to the archive."""
+        archived = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            stmt = archivable_statement(older_than, batch_size)
+            task_ids = list(self.db.scalars(stmt))
+            if not task_ids:
+                break
+            try:
+                archived += self._archive_batch(task_ids, older_than)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            batches += 1
+            if len(task_ids) < batch_size:
+                break
+        return archived
 
-        db_task.completed = True
+    def _archive_batch(self, task_ids: list[int], older_than: datetime) -> int:
+        """Move the still eligible ``task_ids`` to the archive; no commit."""
+        archived_at = utc_now()
+        if self.db.get_bind().dialect.delete_returning:
+            stmt = archive_delete(task_ids, older_than).returning(*ARCHIVE_COLUMNS)
+            rows = archive_rows(self.db.execute(stmt), archived_at)
+            if rows:
+                self.db.execute(insert(ArchivedTask), rows)
+            return len(rows)
+        locked = list(self.db.scalars(archive_lock(task_ids, older_than)))
+        if not locked:
+            return 0
+        self.db.execute(archive_copy(locked, older_than, archived_at))
+        result = self.db.execute(archive_delete(locked, older_than))
+        return cast(CursorResult[Any], result).rowcount
 
-        self.db.add(db_task)
-        self.db.commit()
-        self.db.refresh(db_task)
-        return db_task
+    def update_many(
+        self,
+        task_in: TaskUpdate,
+        ids: list[int] | None = None,
+        filters: TaskFilter | None = None,
+        chunk_size: int = 500,
+    ) -> list[int]:
+        """Apply the same update to many tasks in a single transaction."""
+        stmt = (
+            update(Task)
+            .values(bumped(task_in.model_dump(exclude_unset=True)))
+            .execution_options(synchronize_session=False)
+        )
+        returning = self.db.get_bind().dialect.update_returning
+        return self._execute_many(stmt, ids, filters, chunk_size, returning, "updated")
 
-    def mark_incomplete(self, task_id: int) -> Task | None:
+    def delete_many(
+        self,
+        ids: list[int] | None = None,
+        filters: TaskFilter | None = None,
+        chunk_size: int = 500,
+    ) -> list[int]:
+        """Delete many tasks in a single transaction, recording tombstones."""
+        stmt = delete(Task).execution_options(synchronize_session=False)
+        returning = self.db.get_bind().dialect.delete_returning
+        return self._execute_many(
+            stmt, ids, filters, chunk_size, returning, "deleted", record_deletions=True
+        )
+
+    def _execute_many(
+        self,
+        stmt: WriteT,
+        ids: list[int] | None,
+        filters: TaskFilter | None,
+        chunk_size: int,
+        returning: bool,
+        event_type: str,
+        record_deletions: bool = False,
+    ) -> list[int]:
+        """Run ``stmt`` per id chunk with RETURNING id, then commit once."""
+        affected: list[int] = []
+        try:
+            for chunk in id_chunks(ids, chunk_size):
+                target = apply_filters(stmt, filters)
+                if chunk is not None:
+                    target = target.where(Task.id.in_(chunk))
+                if returning:
+                    affected.extend(self.db.scalars(target.returning(Task.id)))
+                    continue
+                matched = apply_filters(select(Task.id), filters)
+                if chunk is not None:
+                    matched = matched.where(Task.id.in_(chunk))
+                matched_ids = list(self.db.scalars(matched))
+                for part in id_chunks(matched_ids, chunk_size):
+                    self.db.execute(stmt.where(Task.id.in_(part)))
+                affected.extend(matched_ids)
+            if record_deletions:
+                for part in id_chunks(affected, chunk_size):
+                    for tombstone in tombstone_statements(part):
+                        self.db.execute(tombstone)
+            self._record(event_type, sorted(affected))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return sorted(affected)
+
+    def mark_complete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
+        """Mark task as completed."""
+        return self._update_completed(task_id, True, expected_version)
+
+    def mark_incomplete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
         """Mark task as incomplete."""
-        db_task = self.get_by_id(task_id)
-        if not db_task:
-            return None
+        return self._update_completed(task_id, False, expected_version)
 
-        db_task.completed = False
+    def toggle_complete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
+        """Flip the completed flag of a task atomically."""
+        return self._update_completed(task_id, not_(Task.completed), expected_version)
 
-        self.db.add(db_task)
-        self.db.commit()
-        self.db.refresh(db_task)
+    def _update_completed(
+        self, task_id: int, completed: Any, expected_version: int | None = None
+    ) -> Task | None:
+        """Set ``completed`` with a single UPDATE statement."""
+        stmt = completed_update(task_id, completed, expected_version)
+        try:
+            if self.db.get_bind().dialect.update_returning:
+                db_task = self.db.scalars(
+                    stmt.returning(Task),
+                    execution_options={"populate_existing": True},
+                ).first()
+            elif cast(CursorResult[Any], self.db.execute(stmt)).rowcount:
+                db_task = (
+                    self.db.query(Task)
+                    .populate_existing()
+                    .filter(Task.id == task_id)
+                    .first()
+                )
+            else:
+                db_task = None
+            if db_task is None and expected_version is not None:
+                if self.db.scalar(version_statement(task_id)) is not None:
+                    raise TaskVersionConflictError(task_id, expected_version)
+            if db_task is not None:
+                self._record("completed", [task_id], [db_task])
+                self.db.expunge(db_task)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         return db_task
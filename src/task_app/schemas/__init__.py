@@ -1,5 +1,35 @@
 """Pydanticスキーマ定義"""
 
-from task_app.schemas.task import TaskBase, TaskCreate, TaskUpdate, TaskResponse
+from task_app.schemas.task import (
+    TaskBase,
+    TaskBulkDelete,
+    TaskBulkResponse,
+    TaskBulkUpdate,
+    TaskChangesResponse,
+    TaskCreate,
+    TaskFilter,
+    TaskImportError,
+    TaskImportResponse,
+    TaskOrderBy,
+    TaskPageResponse,
+    TaskResponse,
+    TaskStatsResponse,
+    TaskUpdate,
+)
 
-__all__ = ["TaskBase", "TaskCreate", "TaskUpdate", "TaskResponse"]
+__all__ = [
+    "TaskBase",
+    "TaskCreate",
+    "TaskUpdate",
+    "TaskBulkUpdate",
+    "TaskBulkDelete",
+    "TaskBulkResponse",
+    "TaskFilter",
+    "TaskOrderBy",
+    "TaskResponse",
+    "TaskPageResponse",
+    "TaskChangesResponse",
+    "TaskStatsResponse",
+    "TaskImportError",
+    "TaskImportResponse",
+]
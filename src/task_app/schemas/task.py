@@ -1,9 +1,9 @@
 """Taskスキーマ定義"""
 
-from datetime import datetime
-from typing import Optional
+from datetime import UTC, datetime
+from typing import Literal, Optional, Self
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class TaskBase(BaseModel):
@@ -48,6 +48,84 @@ class TaskUpdate(BaseModel):
         return v
 
 
+# タスク一覧の並び順のキー（"-" 付きは降順）
+TaskOrderBy = Literal[
+    "id", "-id", "created_at", "-created_at", "updated_at", "-updated_at"
+]
+
+
+class TaskFilter(BaseModel):
+    """
+    タスク一覧の絞り込み条件（すべてOptional、指定した条件のAND）
+
+    日時の範囲は *_after を含み、*_before を含まない。
+    """
+
+    completed: bool | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+    updated_before: datetime | None = None
+    title_prefix: str | None = Field(None, min_length=1, max_length=255)
+
+    @field_validator(
+        "created_after", "created_before", "updated_after", "updated_before"
+    )
+    @classmethod
+    def to_utc(cls, v: datetime | None) -> datetime | None:
+        """日時をUTCにそろえる（タイムゾーンなしはUTCとみなす）"""
+        if v is None:
+            return v
+        if v.tzinfo is None:
+            return v.replace(tzinfo=UTC)
+        return v.astimezone(UTC)
+
+
+# 一括更新・一括削除で1リクエストあたりに指定できる最大ID数
+MAX_BULK_IDS = 10_000
+
+
+class TaskBulkSelection(BaseModel):
+    """一括操作の対象（ids と filters のどちらか一方を指定する）"""
+
+    ids: list[int] | None = Field(None, max_length=MAX_BULK_IDS)
+    filters: TaskFilter | None = None
+
+    @model_validator(mode="after")
+    def validate_selection(self) -> Self:
+        """対象の指定方法のバリデーション"""
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("ids か filters のどちらか一方を指定してください")
+        # 条件のない filters はすべてのタスクに一致するため受け付けない
+        if self.filters is not None and not self.filters.model_dump(exclude_none=True):
+            raise ValueError("filters には1つ以上の条件を指定してください")
+        return self
+
+
+class TaskBulkUpdate(TaskBulkSelection):
+    """タスク一括更新用スキーマ"""
+
+    changes: TaskUpdate
+
+    @field_validator("changes")
+    @classmethod
+    def validate_changes(cls, v: TaskUpdate) -> TaskUpdate:
+        """更新内容が空でないこと"""
+        if not v.model_fields_set:
+            raise ValueError("更新内容を指定してください")
+        return v
+
+
+class TaskBulkDelete(TaskBulkSelection):
+    """タスク一括削除用スキーマ"""
+
+
+class TaskBulkResponse(BaseModel):
+    """一括更新・一括削除の結果レスポンス用スキーマ"""
+
+    ids: list[int]
+
+
 class TaskResponse(BaseModel):
     """タスクレスポンス用スキーマ"""
     
@@ -59,3 +137,56 @@ class TaskResponse(BaseModel):
     completed: bool
     created_at: datetime
     updated_at: datetime
+    version: int
+
+
+class TaskPageResponse(BaseModel):
+    """タスク一覧（カーソルページネーション）レスポンス用スキーマ"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[TaskResponse]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+class TaskChangesResponse(BaseModel):
+    """差分同期レスポンス用スキーマ"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    changed: list[TaskResponse]
+    deleted: list[int]
+    watermark: str
+    has_more: bool
+
+
+class TaskStatsResponse(BaseModel):
+    """タスク件数の集計レスポンス用スキーマ"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    total: int
+    completed: int
+    open: int
+
+
+class TaskImportError(BaseModel):
+    """インポートに失敗した行"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    line: int
+    error: str
+
+
+class TaskImportResponse(BaseModel):
+    """タスクインポート結果のレスポンス用スキーマ"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    imported: int
+    failed: int
+    errors: list[TaskImportError]
+    elapsed_seconds: float
+    rows_per_second: float
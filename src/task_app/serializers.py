@@ -0,0 +1,134 @@
+"""タスクのシリアライズ（エクスポート・APIレスポンス用）
+
+ORMオブジェクトやPydanticモデルを経由せず、行タプルから直接
+NDJSON / CSV や TaskResponse と同じ形のJSONを組み立てる。
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Row
+
+from task_app.models.task import Task
+
+try:
+    import orjson
+except ImportError:  # 任意の依存（pip install "task-app[fast]"）
+    orjson = None  # type: ignore[assignment]
+
+# エクスポートするカラム（この順序で出力する）
+TASK_FIELDS = ("id", "title", "description", "completed", "created_at", "updated_at")
+TASK_COLUMNS = tuple(getattr(Task, field) for field in TASK_FIELDS)
+
+# APIレスポンス（TaskResponse）のフィールド
+RESPONSE_FIELDS = (*TASK_FIELDS, "version")
+RESPONSE_COLUMNS = tuple(getattr(Task, field) for field in RESPONSE_FIELDS)
+
+# 1チャンクにまとめる行数
+DEFAULT_CHUNK_ROWS = 500
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def task_record(row: Sequence[Any]) -> dict[str, Any]:
+    """RESPONSE_FIELDS の順に並んだ行タプルを TaskResponse と同じ形の辞書にする"""
+    return dict(zip(RESPONSE_FIELDS, row))
+
+
+def partial_record(row: Row[*tuple[Any, ...]], fields: Sequence[str]) -> dict[str, Any]:
+    """行から fields のフィールドだけを取り出した辞書（疎なフィールドセット用）"""
+    mapping = row._mapping
+    return {name: mapping[name] for name in fields}
+
+
+def _response_default(value: Any) -> Any:
+    # Pydantic と同じく UTC は "Z" で表す
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        if value.utcoffset() == timedelta(0):
+            text = text.removesuffix("+00:00") + "Z"
+        return text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    APIレスポンス用のJSONバイト列
+
+    orjson がインストールされていれば使い、なければ標準の json で同じ形式に
+    する。日時は Pydantic（TaskResponse）と同じ ISO 8601 形式で出力する。
+
+    Args:
+        content: 辞書・リスト・文字列・数値・日時からなる値
+
+    Returns:
+        bytes: UTF-8 のJSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"), default=_response_default
+    ).encode()
+
+
+def iter_ndjson(
+    rows: Iterable[Sequence[Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """
+    行タプルを NDJSON（1行1オブジェクト）のバイト列チャンクとして返す
+
+    Args:
+        rows: TASK_FIELDS の順に並んだ行タプル
+        chunk_rows: 1チャンクにまとめる行数
+
+    Yields:
+        bytes: 改行区切りのJSONのチャンク
+    """
+    lines: list[str] = []
+    for row in rows:
+        record = dict(zip(TASK_FIELDS, row))
+        lines.append(json.dumps(record, ensure_ascii=False, default=_json_default))
+        if len(lines) >= chunk_rows:
+            yield ("\n".join(lines) + "\n").encode()
+            lines.clear()
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def iter_csv(
+    rows: Iterable[Sequence[Any]], chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """
+    行タプルをヘッダ付きCSVのバイト列チャンクとして返す
+
+    Args:
+        rows: TASK_FIELDS の順に並んだ行タプル
+        chunk_rows: 1チャンクにまとめる行数
+
+    Yields:
+        bytes: CSVのチャンク（先頭チャンクにヘッダ行を含む）
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(TASK_FIELDS)
+    count = 0
+    for row in rows:
+        writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else value for value in row
+        )
+        count += 1
+        if count >= chunk_rows:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -1,5 +1,6 @@
 """サービス層"""
 
+from task_app.services.async_task import AsyncTaskService
 from task_app.services.task import TaskService
 
-__all__ = ["TaskService"]
+__all__ = ["TaskService", "AsyncTaskService"]
@@ -0,0 +1,203 @@
+"""AsyncTaskService - タスクのビジネスロジック層（非同期版）"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Row
+
+from task_app.cache import CacheBackend, task_cache_key, task_from_cache, task_to_cache
+from task_app.events import EventBroker, TaskEventType
+from task_app.models.task import Task
+from task_app.repositories.async_task import AsyncTaskRepository
+from task_app.repositories.pagination import TaskPage
+from task_app.schemas.task import TaskCreate, TaskFilter, TaskUpdate
+
+
+class AsyncTaskService:
+    """
+    タスクに関するビジネスロジックを提供するサービスクラス（非同期版）
+
+    AsyncTaskRepositoryをラップし、非同期ルーターが使うTaskServiceの操作を
+    コルーチンとして提供する。キャッシュとイベントの扱いもTaskServiceと同じ。
+    """
+
+    def __init__(
+        self,
+        repository: AsyncTaskRepository,
+        cache: CacheBackend | None = None,
+        events: EventBroker | None = None,
+    ) -> None:
+        """
+        AsyncTaskServiceを初期化する
+
+        Args:
+            repository: 非同期タスクリポジトリのインスタンス
+            cache: タスクのキャッシュ（Noneの場合はキャッシュしない）
+            events: 変更イベントの発行先（Noneの場合は発行しない）
+        """
+        self._repository = repository
+        self._cache = cache
+        self._events = events
+
+    def _invalidate(self, *task_ids: int) -> None:
+        """指定したタスクのキャッシュを無効化する"""
+        if self._cache is None:
+            return
+        for task_id in task_ids:
+            self._cache.delete(task_cache_key(task_id))
+
+    def _publish(self, event_type: TaskEventType, task: Task | None) -> None:
+        """変更したタスクのイベントを発行する（task が None の場合は何もしない）"""
+        if self._events is not None and task is not None:
+            self._events.publish(event_type, task.id, task)
+
+    def _publish_many(
+        self,
+        event_type: TaskEventType,
+        task_ids: list[int],
+        tasks: list[Task] | None = None,
+    ) -> None:
+        """複数のタスクの変更イベントを発行する"""
+        if self._events is not None:
+            self._events.publish_many(event_type, task_ids, tasks)
+
+    async def create(self, task_in: TaskCreate) -> Task:
+        """新しいタスクを作成する（TaskService.create を参照）"""
+        task = await self._repository.create(task_in)
+        self._invalidate(task.id)
+        self._publish("created", task)
+        return task
+
+    async def create_many(self, tasks_in: list[TaskCreate]) -> list[Task]:
+        """複数のタスクを1トランザクションで一括作成する"""
+        tasks = await self._repository.create_many(tasks_in)
+        task_ids = [task.id for task in tasks]
+        self._invalidate(*task_ids)
+        self._publish_many("created", task_ids, tasks)
+        return tasks
+
+    async def get_by_id(self, task_id: int) -> Task | None:
+        """IDでタスクを取得する"""
+        if self._cache is None:
+            return await self._repository.get_by_id(task_id)
+
+        key = task_cache_key(task_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return task_from_cache(cached)
+        # 読み込みの間に更新・無効化された場合は、読み込んだ古い値を保存しない
+        generation = self._cache.generation(key)
+        task = await self._repository.get_by_id(task_id)
+        if task is not None:
+            self._cache.set(key, task_to_cache(task), generation)
+        return task
+
+    async def get_including_archived(self, task_id: int) -> Task | None:
+        """IDでタスクを取得する（アーカイブ済みのタスクも読み取り専用で返す）"""
+        task = await self.get_by_id(task_id)
+        if task is not None:
+            return task
+        return await self._repository.get_archived(task_id)
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: TaskFilter | None = None,
+        order_by: str = "id",
+    ) -> list[Task]:
+        """条件に合うタスクを取得する"""
+        return await self._repository.get_all(
+            skip=skip, limit=limit, filters=filters, order_by=order_by
+        )
+
+    async def get_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        order_by: str = "id",
+        filters: TaskFilter | None = None,
+        rows: bool = False,
+        fields: Sequence[str] | None = None,
+    ) -> TaskPage:
+        """カーソルページネーションで条件に合うタスクを取得する"""
+        return await self._repository.get_page(
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            filters=filters,
+            rows=rows,
+            fields=fields,
+        )
+
+    async def get_many(
+        self,
+        ids: list[int],
+        filters: TaskFilter | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> list[Row[*tuple[Any, ...]]]:
+        """IDを指定して複数のタスクを1回のクエリで取得する"""
+        return await self._repository.get_many(ids, filters=filters, fields=fields)
+
+    async def update(
+        self,
+        task_id: int,
+        task_in: TaskUpdate,
+        expected_version: int | None = None,
+    ) -> Task | None:
+        """タスクを更新する（競合時は TaskVersionConflictError）"""
+        try:
+            task = await self._repository.update(
+                task_id, task_in, expected_version=expected_version
+            )
+        finally:
+            self._invalidate(task_id)
+        self._publish("updated", task)
+        return task
+
+    async def delete(self, task_id: int) -> bool:
+        """タスクを削除する"""
+        deleted = await self._repository.delete(task_id)
+        self._invalidate(task_id)
+        if deleted:
+            self._publish_many("deleted", [task_id])
+        return deleted
+
+    async def mark_complete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
+        """タスクを完了状態にする"""
+        try:
+            task = await self._repository.mark_complete(
+                task_id, expected_version=expected_version
+            )
+        finally:
+            self._invalidate(task_id)
+        self._publish("completed", task)
+        return task
+
+    async def mark_incomplete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
+        """タスクを未完了状態にする"""
+        try:
+            task = await self._repository.mark_incomplete(
+                task_id, expected_version=expected_version
+            )
+        finally:
+            self._invalidate(task_id)
+        self._publish("completed", task)
+        return task
+
+    async def toggle_complete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
+        """タスクの完了状態をトグルする"""
+        try:
+            task = await self._repository.toggle_complete(
+                task_id, expected_version=expected_version
+            )
+        finally:
+            self._invalidate(task_id)
+        self._publish("completed", task)
+        return task
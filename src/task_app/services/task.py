@@ -1,10 +1,35 @@
 """TaskService - タスクのビジネスロジック層"""
 
-from typing import Optional
-
+from collections.abc import Callable, Iterator, Sequence
+from datetime import datetime
+from typing import Any, Optional, TextIO, TypeVar
+
+from sqlalchemy import Row
+
+from task_app.batching import (
+    WriteBatcher,
+    WriteOp,
+    completion_op,
+    create_op,
+    update_op,
+)
+from task_app.cache import CacheBackend, task_cache_key, task_from_cache, task_to_cache
+from task_app.events import EventBroker, TaskEventType
+from task_app.importer import (
+    DEFAULT_BATCH_SIZE,
+    PARSERS,
+    ImportFormat,
+    ImportResult,
+    import_records,
+)
 from task_app.models.task import Task
+from task_app.repositories.changes import ChangeSet
+from task_app.repositories.pagination import TaskPage
+from task_app.repositories.statements import TaskStats
 from task_app.repositories.task import TaskRepository
-from task_app.schemas.task import TaskCreate, TaskUpdate
+from task_app.schemas.task import TaskCreate, TaskFilter, TaskUpdate
+
+T = TypeVar("T")
 
 
 class TaskService:
@@ -13,16 +38,61 @@ class TaskService:
 
     TaskRepositoryをラップし、ビジネスロジックを追加する。
     依存性注入によりリポジトリを受け取ることで、テスト容易性を確保。
+    キャッシュが渡された場合、get_by_idはキャッシュを読み通し、
+    タスクを変更する操作は対象タスクのキャッシュを無効化する。
+    書き込みバッチが渡された場合、1件ずつの作成・更新・完了状態の変更は
+    同時に行われた他の書き込みとまとめてコミットする。
+    イベントブローカーが渡された場合、コミットした変更をイベントとして発行する。
     """
 
-    def __init__(self, repository: TaskRepository) -> None:
+    def __init__(
+        self,
+        repository: TaskRepository,
+        cache: CacheBackend | None = None,
+        batcher: WriteBatcher | None = None,
+        events: EventBroker | None = None,
+    ) -> None:
         """
         TaskServiceを初期化する
 
         Args:
             repository: タスクリポジトリのインスタンス
+            cache: タスクのキャッシュ（Noneの場合はキャッシュしない）
+            batcher: 書き込みバッチ（Noneの場合は操作ごとにコミットする）
+            events: 変更イベントの発行先（Noneの場合は発行しない）
         """
         self._repository = repository
+        self._cache = cache
+        self._batcher = batcher
+        self._events = events
+
+    def _invalidate(self, *task_ids: int) -> None:
+        """指定したタスクのキャッシュを無効化する"""
+        if self._cache is None:
+            return
+        for task_id in task_ids:
+            self._cache.delete(task_cache_key(task_id))
+
+    def _publish(self, event_type: TaskEventType, task: Task | None) -> None:
+        """変更したタスクのイベントを発行する（task が None の場合は何もしない）"""
+        if self._events is not None and task is not None:
+            self._events.publish(event_type, task.id, task)
+
+    def _publish_many(
+        self,
+        event_type: TaskEventType,
+        task_ids: list[int],
+        tasks: list[Task] | None = None,
+    ) -> None:
+        """複数のタスクの変更イベントを発行する"""
+        if self._events is not None:
+            self._events.publish_many(event_type, task_ids, tasks)
+
+    def _write(self, op: WriteOp[T], direct: Callable[[], T]) -> T:
+        """書き込みバッチがあれば op をまとめてコミットし、なければ direct を実行する"""
+        if self._batcher is not None:
+            return self._batcher.execute(op)
+        return direct()
 
     def create(self, task_in: TaskCreate) -> Task:
         """
@@ -34,7 +104,49 @@ class TaskService:
         Returns:
             Task: 作成されたタスクモデル
         """
-        return self._repository.create(task_in)
+        task = self._write(create_op(task_in), lambda: self._repository.create(task_in))
+        # SQLiteなどでは削除済みのIDが再利用されることがあるため無効化しておく
+        self._invalidate(task.id)
+        self._publish("created", task)
+        return task
+
+    def create_many(self, tasks_in: list[TaskCreate]) -> list[Task]:
+        """
+        複数のタスクを1トランザクションで一括作成する
+
+        Args:
+            tasks_in: タスク作成用スキーマのリスト
+
+        Returns:
+            list[Task]: 作成されたタスクモデルのリスト（入力と同じ順序）
+        """
+        tasks = self._repository.create_many(tasks_in)
+        task_ids = [task.id for task in tasks]
+        self._invalidate(*task_ids)
+        self._publish_many("created", task_ids, tasks)
+        return tasks
+
+    def import_tasks(
+        self,
+        stream: TextIO,
+        format: ImportFormat = "ndjson",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> ImportResult:
+        """
+        NDJSON / CSV のストリームからタスクを一括インポートする
+
+        ストリームは1行ずつ読み込まれ、batch_size 件ごとに create_many で
+        1トランザクションとして作成される。
+
+        Args:
+            stream: テキストストリーム
+            format: 入力形式（ndjson または csv）
+            batch_size: 1トランザクションで作成する件数
+
+        Returns:
+            ImportResult: 作成件数・行ごとのエラー・処理速度
+        """
+        return import_records(PARSERS[format](stream), self.create_many, batch_size)
 
     def get_by_id(self, task_id: int) -> Optional[Task]:
         """
@@ -46,33 +158,228 @@ class TaskService:
         Returns:
             Task | None: 見つかったタスク、存在しない場合はNone
         """
-        return self._repository.get_by_id(task_id)
+        if self._cache is None:
+            return self._repository.get_by_id(task_id)
+
+        key = task_cache_key(task_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return task_from_cache(cached)
+        # 読み込みの間に更新・無効化された場合は、読み込んだ古い値を保存しない
+        generation = self._cache.generation(key)
+        task = self._repository.get_by_id(task_id)
+        if task is not None:
+            self._cache.set(key, task_to_cache(task), generation)
+        return task
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> list[Task]:
+    def get_including_archived(self, task_id: int) -> Task | None:
         """
-        すべてのタスクを取得する
+        IDでタスクを取得する（アーカイブ済みのタスクも読み取り専用で返す）
+
+        Args:
+            task_id: タスクID
+
+        Returns:
+            Task | None: 見つかったタスク、どちらにも存在しない場合はNone
+        """
+        task = self.get_by_id(task_id)
+        if task is not None:
+            return task
+        return self._repository.get_archived(task_id)
+
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: TaskFilter | None = None,
+        order_by: str = "id",
+    ) -> list[Task]:
+        """
+        条件に合うタスクを取得する
 
         Args:
             skip: スキップする件数（デフォルト: 0）
             limit: 取得する最大件数（デフォルト: 100）
+            filters: 絞り込み条件（Noneの場合はすべて）
+            order_by: 並び順のキー（"-" を付けると降順。例: "-created_at"）
 
         Returns:
             list[Task]: タスクのリスト
         """
-        return self._repository.get_all(skip=skip, limit=limit)
+        return self._repository.get_all(
+            skip=skip, limit=limit, filters=filters, order_by=order_by
+        )
+
+    def get_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        order_by: str = "id",
+        filters: TaskFilter | None = None,
+        rows: bool = False,
+        fields: Sequence[str] | None = None,
+    ) -> TaskPage:
+        """
+        カーソルページネーションで条件に合うタスクを取得する
+
+        オフセット方式と異なり、ページの深さに関わらず一定コストで取得できる。
+        カーソルには絞り込み条件が含まれないため、各ページで同じ条件を渡すこと。
+
+        Args:
+            limit: 取得する最大件数（デフォルト: 100）
+            cursor: 前回レスポンスの next_cursor / prev_cursor（先頭ページはNone）
+            order_by: 並び順のキー（id / created_at / updated_at、"-" で降順）
+            filters: 絞り込み条件（Noneの場合はすべて）
+            rows: Trueの場合は Task の代わりに RESPONSE_COLUMNS の行タプルを返す
+            fields: rows の場合に取得するフィールド（Noneの場合はすべて）
+
+        Returns:
+            TaskPage: タスクのリストと前後ページのカーソル
+
+        Raises:
+            InvalidCursorError: カーソルが不正な場合
+        """
+        return self._repository.get_page(
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            filters=filters,
+            rows=rows,
+            fields=fields,
+        )
+
+    def get_many(
+        self,
+        ids: list[int],
+        filters: TaskFilter | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> list[Row[*tuple[Any, ...]]]:
+        """
+        IDを指定して複数のタスクを1回のクエリで取得する
 
-    def update(self, task_id: int, task_in: TaskUpdate) -> Optional[Task]:
+        存在しないID・アーカイブしたタスク・条件に合わないタスクは含まれない。
+
+        Args:
+            ids: タスクID（この順序で返す）
+            filters: 絞り込み条件（Noneの場合はすべて）
+            fields: 取得するフィールド（Noneの場合はすべて）
+
+        Returns:
+            list[Row]: RESPONSE_COLUMNS（fields の場合はその一部）の行タプル
+        """
+        return self._repository.get_many(ids, filters=filters, fields=fields)
+
+    def count(self, filters: TaskFilter | None = None) -> int:
+        """
+        条件に合うタスクの件数を取得する
+
+        Args:
+            filters: 絞り込み条件（Noneの場合はすべて）
+
+        Returns:
+            int: タスクの件数
+        """
+        return self._repository.count(filters)
+
+    def get_stats(self, filters: TaskFilter | None = None) -> TaskStats:
+        """
+        タスクの件数（全体・完了・未完了）を取得する
+
+        絞り込み条件がない場合は集計テーブルから定数時間で取得する。
+
+        Args:
+            filters: 絞り込み条件（Noneの場合はすべて）
+
+        Returns:
+            TaskStats: タスクの件数
+        """
+        return self._repository.get_stats(filters)
+
+    def search(
+        self, q: str, limit: int = 20, offset: int = 0, rows: bool = False
+    ) -> list[Any]:
+        """
+        タイトルと説明を全文検索する
+
+        空白で区切った語をすべて含むタスクを、関連度の高い順に返す。
+
+        Args:
+            q: 検索語（空白区切りでAND）
+            limit: 取得する最大件数（デフォルト: 20）
+            offset: スキップする件数（デフォルト: 0）
+            rows: Trueの場合は Task の代わりに RESPONSE_COLUMNS の行タプルを返す
+
+        Returns:
+            list[Task]: 関連度順のタスクのリスト
+        """
+        return self._repository.search(q, limit=limit, offset=offset, rows=rows)
+
+    def get_changes(
+        self, since: str | None = None, limit: int = 500, rows: bool = False
+    ) -> ChangeSet:
+        """
+        前回の同期以降に作成・更新・削除されたタスクを取得する（差分同期用）
+
+        Args:
+            since: 前回レスポンスの watermark（初回はNoneで全件）
+            limit: 作成・更新、削除それぞれの最大件数（デフォルト: 500）
+            rows: Trueの場合は Task の代わりに RESPONSE_COLUMNS の行タプルを返す
+
+        Returns:
+            ChangeSet: 変更されたタスク、削除されたタスクのID、次回の watermark
+
+        Raises:
+            InvalidCursorError: watermark が不正な場合
+        """
+        return self._repository.get_changes(since=since, limit=limit, rows=rows)
+
+    def stream_all(self, batch_size: int = 1000) -> Iterator[Row[*tuple[Any, ...]]]:
+        """
+        すべてのタスクを行タプルとして順に返す（エクスポート用）
+
+        Args:
+            batch_size: データベースから一度に取得する件数
+
+        Returns:
+            Iterator[Row]: serializers.TASK_FIELDS の順に並んだ行のイテレータ
+        """
+        return self._repository.stream_all(batch_size=batch_size)
+
+    def update(
+        self,
+        task_id: int,
+        task_in: TaskUpdate,
+        expected_version: int | None = None,
+    ) -> Task | None:
         """
         タスクを更新する
 
+        読み込みから書き込みまでの間に他の更新がコミットされた場合や、
+        expected_version を指定してタスクのバージョンが異なる場合は更新しない。
+        競合した場合もキャッシュは破棄する（他のプロセスが更新した可能性がある）。
+
         Args:
             task_id: 更新対象のタスクID
             task_in: 更新データ
+            expected_version: 更新の前提とするバージョン（Noneの場合は確認しない）
 
         Returns:
             Task | None: 更新されたタスク、存在しない場合はNone
+
+        Raises:
+            TaskVersionConflictError: 他の更新と競合した場合
         """
-        return self._repository.update(task_id, task_in)
+        try:
+            task = self._write(
+                update_op(task_id, task_in, expected_version),
+                lambda: self._repository.update(
+                    task_id, task_in, expected_version=expected_version
+                ),
+            )
+        finally:
+            self._invalidate(task_id)
+        self._publish("updated", task)
+        return task
 
     def delete(self, task_id: int) -> bool:
         """
@@ -84,50 +391,165 @@ class TaskService:
         Returns:
             bool: 削除に成功した場合True、タスクが存在しない場合False
         """
-        return self._repository.delete(task_id)
+        deleted = self._repository.delete(task_id)
+        self._invalidate(task_id)
+        if deleted:
+            self._publish_many("deleted", [task_id])
+        return deleted
+
+    def update_many(
+        self,
+        task_in: TaskUpdate,
+        ids: list[int] | None = None,
+        filters: TaskFilter | None = None,
+    ) -> list[int]:
+        """
+        複数のタスクを一括更新する
+
+        対象は ids または filters で指定し、1トランザクションで更新する。
 
-    def mark_complete(self, task_id: int) -> Optional[Task]:
+        Args:
+            task_in: 更新データ（すべての対象に同じ内容を適用する）
+            ids: 更新対象のタスクID
+            filters: 更新対象の絞り込み条件
+
+        Returns:
+            list[int]: 更新したタスクのID（昇順）
+        """
+        task_ids = self._repository.update_many(task_in, ids=ids, filters=filters)
+        self._invalidate(*task_ids)
+        self._publish_many("updated", task_ids)
+        return task_ids
+
+    def delete_many(
+        self, ids: list[int] | None = None, filters: TaskFilter | None = None
+    ) -> list[int]:
+        """
+        複数のタスクを一括削除する
+
+        対象は ids または filters で指定し、1トランザクションで削除する。
+
+        Args:
+            ids: 削除対象のタスクID
+            filters: 削除対象の絞り込み条件
+
+        Returns:
+            list[int]: 削除したタスクのID（昇順）
+        """
+        task_ids = self._repository.delete_many(ids=ids, filters=filters)
+        self._invalidate(*task_ids)
+        self._publish_many("deleted", task_ids)
+        return task_ids
+
+    def archive_completed(
+        self,
+        older_than: datetime,
+        batch_size: int = 500,
+        max_batches: int | None = None,
+    ) -> int:
+        """
+        完了してから更新されていない古いタスクをアーカイブに移動する
+
+        アーカイブしたタスクは一覧・検索・集計・差分同期に含まれなくなるが、
+        IDでの取得はできる（読み取り専用）。内容は変わらないため、キャッシュの
+        無効化やイベントの発行は行わない。
+
+        Args:
+            older_than: この日時より前に最後に更新された完了済みタスクが対象
+            batch_size: 1トランザクションで移動する最大の件数
+            max_batches: 1回の呼び出しで処理する最大のバッチ数（Noneの場合は無制限）
+
+        Returns:
+            int: アーカイブしたタスク数
+        """
+        return self._repository.archive_completed(
+            older_than, batch_size=batch_size, max_batches=max_batches
+        )
+
+    def mark_complete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
         """
         タスクを完了状態にする
 
         Args:
             task_id: 対象のタスクID
+            expected_version: 更新の前提とするバージョン（Noneの場合は確認しない）
 
         Returns:
             Task | None: 更新されたタスク、存在しない場合はNone
-        """
-        return self._repository.mark_complete(task_id)
 
-    def mark_incomplete(self, task_id: int) -> Optional[Task]:
+        Raises:
+            TaskVersionConflictError: バージョンが expected_version と異なる場合
+        """
+        try:
+            task = self._write(
+                completion_op(task_id, True, expected_version),
+                lambda: self._repository.mark_complete(
+                    task_id, expected_version=expected_version
+                ),
+            )
+        finally:
+            self._invalidate(task_id)
+        self._publish("completed", task)
+        return task
+
+    def mark_incomplete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
         """
         タスクを未完了状態にする
 
         Args:
             task_id: 対象のタスクID
+            expected_version: 更新の前提とするバージョン（Noneの場合は確認しない）
 
         Returns:
             Task | None: 更新されたタスク、存在しない場合はNone
-        """
-        return self._repository.mark_incomplete(task_id)
 
-    def toggle_complete(self, task_id: int) -> Optional[Task]:
+        Raises:
+            TaskVersionConflictError: バージョンが expected_version と異なる場合
+        """
+        try:
+            task = self._write(
+                completion_op(task_id, False, expected_version),
+                lambda: self._repository.mark_incomplete(
+                    task_id, expected_version=expected_version
+                ),
+            )
+        finally:
+            self._invalidate(task_id)
+        self._publish("completed", task)
+        return task
+
+    def toggle_complete(
+        self, task_id: int, expected_version: int | None = None
+    ) -> Task | None:
         """
         タスクの完了状態をトグルする
 
         現在の状態に応じて完了/未完了を切り替える。
-        これはビジネスロジックとして、Repositoryにはないサービス固有のメソッド。
+        切り替えはリポジトリの単一のUPDATE文で行うため、同時に実行されても
+        状態の読み込みと書き込みの間に競合が発生しない。
 
         Args:
             task_id: 対象のタスクID
+            expected_version: 更新の前提とするバージョン（Noneの場合は確認しない）
 
         Returns:
             Task | None: 更新されたタスク、存在しない場合はNone
-        """
-        task = self._repository.get_by_id(task_id)
-        if task is None:
-            return None
 
-        if task.completed:
-            return self._repository.mark_incomplete(task_id)
-        else:
-            return self._repository.mark_complete(task_id)
+        Raises:
+            TaskVersionConflictError: バージョンが expected_version と異なる場合
+        """
+        try:
+            task = self._write(
+                completion_op(task_id, None, expected_version),
+                lambda: self._repository.toggle_complete(
+                    task_id, expected_version=expected_version
+                ),
+            )
+        finally:
+            self._invalidate(task_id)
+        self._publish("completed", task)
+        return task
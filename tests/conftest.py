@@ -1,13 +1,18 @@
 """pytest 共通設定・フィクスチャ"""
 
+from datetime import timedelta
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from task_app.api.tasks import get_task_cache
+from task_app.cache import LRUCache
 from task_app.main import app
 from task_app.database import Base, get_db
+from task_app.repositories import changes
 
 
 @pytest.fixture
@@ -37,6 +42,12 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def no_settle_time(monkeypatch):
+    """差分同期で、直前に書き込んだ行も確定済みとして watermark を進める"""
+    monkeypatch.setattr(changes, "SETTLE_TIME", timedelta(0))
+
+
 @pytest.fixture
 def test_client(db_session):
     """テスト用クライアント（DBセッションをオーバーライド）"""
@@ -46,6 +57,9 @@ def test_client(db_session):
         finally:
             pass
 
+    # テストごとにDBが作り直されるため、キャッシュもテストごとに分ける
+    cache = LRUCache()
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_task_cache] = lambda: cache
     yield TestClient(app)
     app.dependency_overrides.clear()
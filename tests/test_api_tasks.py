@@ -1,4 +1,8 @@
-"""タスクAPI (POST /tasks) のテスト"""
+"""タスクAPI (/tasks) のテスト"""
+
+import csv
+import io
+import json
 
 import pytest
 from fastapi.testclient import TestClient
@@ -90,3 +94,655 @@ class TestCreateTaskAPI:
         assert response2.status_code == 201
         assert response1.json()["id"] != response2.json()["id"]
 
+
+
+class TestCreateTasksBulkAPI:
+    """POST /tasks/bulk - タスク一括作成APIのテスト"""
+
+    def test_create_tasks_bulk_success(self, test_client):
+        """複数タスクを一括作成できること"""
+        response = test_client.post(
+            "/tasks/bulk",
+            json=[{"title": "タスク1"}, {"title": "タスク2", "description": "説明"}],
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert [t["title"] for t in data] == ["タスク1", "タスク2"]
+        assert data[1]["description"] == "説明"
+        assert data[0]["id"] != data[1]["id"]
+        assert all(t["completed"] is False for t in data)
+
+    def test_create_tasks_bulk_invalid_item_fails(self, test_client):
+        """1件でも不正なデータがあれば422になり、何も作成されないこと"""
+        response = test_client.post(
+            "/tasks/bulk", json=[{"title": "タスク1"}, {"title": ""}]
+        )
+
+        assert response.status_code == 422
+        assert test_client.get("/tasks").json()["items"] == []
+
+
+class TestBulkUpdateDeleteAPI:
+    """PATCH / DELETE /tasks/bulk - 一括更新・一括削除APIのテスト"""
+
+    def _create_tasks(self, test_client, count=3):
+        response = test_client.post(
+            "/tasks/bulk", json=[{"title": f"タスク{i}"} for i in range(count)]
+        )
+        return [t["id"] for t in response.json()]
+
+    def test_update_tasks_bulk_by_ids(self, test_client):
+        """IDを指定して一括更新できること"""
+        ids = self._create_tasks(test_client)
+
+        response = test_client.patch(
+            "/tasks/bulk",
+            json={"ids": ids[:2], "changes": {"completed": True}},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"ids": ids[:2]}
+        stats = test_client.get("/tasks/stats").json()
+        assert stats == {"total": 3, "completed": 2, "open": 1}
+
+    def test_update_tasks_bulk_by_filter(self, test_client):
+        """絞り込み条件を指定して一括更新できること"""
+        ids = self._create_tasks(test_client)
+
+        response = test_client.patch(
+            "/tasks/bulk",
+            json={
+                "filters": {"title_prefix": "タスク"},
+                "changes": {"description": "スプリント1"},
+            },
+        )
+
+        assert response.json() == {"ids": ids}
+
+    def test_update_tasks_bulk_requires_one_selection(self, test_client):
+        """ids と filters の両方または一方もない場合は422になること"""
+        both = test_client.patch(
+            "/tasks/bulk",
+            json={"ids": [1], "filters": {}, "changes": {"completed": True}},
+        )
+        neither = test_client.patch(
+            "/tasks/bulk", json={"changes": {"completed": True}}
+        )
+
+        assert both.status_code == 422
+        assert neither.status_code == 422
+
+    def test_bulk_rejects_empty_filters(self, test_client):
+        """条件のない filters では一括更新・一括削除が422になり、何も変わらないこと"""
+        self._create_tasks(test_client)
+
+        updated = test_client.patch(
+            "/tasks/bulk", json={"filters": {}, "changes": {"completed": True}}
+        )
+        deleted = test_client.request("DELETE", "/tasks/bulk", json={"filters": {}})
+
+        assert updated.status_code == 422
+        assert deleted.status_code == 422
+        stats = test_client.get("/tasks/stats").json()
+        assert stats == {"total": 3, "completed": 0, "open": 3}
+
+    def test_update_tasks_bulk_requires_changes(self, test_client):
+        """更新内容が空の場合は422になること"""
+        response = test_client.patch("/tasks/bulk", json={"ids": [1], "changes": {}})
+
+        assert response.status_code == 422
+
+    def test_delete_tasks_bulk(self, test_client):
+        """IDを指定して一括削除できること"""
+        ids = self._create_tasks(test_client)
+
+        response = test_client.request(
+            "DELETE", "/tasks/bulk", json={"ids": [ids[0], ids[2], 999]}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"ids": [ids[0], ids[2]]}
+        remaining = test_client.get("/tasks").json()["items"]
+        assert [t["id"] for t in remaining] == [ids[1]]
+
+
+class TestListTasksAPI:
+    """GET /tasks - タスク一覧APIのテスト"""
+
+    def test_list_tasks_empty(self, test_client):
+        """タスクがない場合は空のページが返ること"""
+        response = test_client.get("/tasks")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "items": [],
+            "next_cursor": None,
+            "prev_cursor": None,
+        }
+
+    def test_list_tasks_follows_cursor(self, test_client):
+        """next_cursorで次のページを取得できること"""
+        ids = [
+            test_client.post("/tasks", json={"title": f"タスク{i}"}).json()["id"]
+            for i in range(5)
+        ]
+
+        page1 = test_client.get("/tasks", params={"limit": 3}).json()
+        page2 = test_client.get(
+            "/tasks", params={"limit": 3, "cursor": page1["next_cursor"]}
+        ).json()
+
+        assert [t["id"] for t in page1["items"]] == ids[:3]
+        assert [t["id"] for t in page2["items"]] == ids[3:]
+        assert page2["next_cursor"] is None
+        assert page2["prev_cursor"] is not None
+
+    def test_list_tasks_invalid_cursor(self, test_client):
+        """不正なカーソルで400になること"""
+        response = test_client.get("/tasks", params={"cursor": "invalid"})
+
+        assert response.status_code == 400
+
+    def test_list_tasks_invalid_limit(self, test_client):
+        """limitが範囲外の場合は422になること"""
+        response = test_client.get("/tasks", params={"limit": 0})
+
+        assert response.status_code == 422
+
+    def test_list_tasks_filtered_newest_first(self, test_client):
+        """絞り込み条件と降順の並び順で取得できること"""
+        titles = ["買い物A", "掃除", "買い物B", "買い物C"]
+        test_client.post("/tasks/bulk", json=[{"title": t} for t in titles])
+        params = {
+            "completed": "false",
+            "title_prefix": "買い物",
+            "order_by": "-id",
+            "limit": 2,
+        }
+
+        page1 = test_client.get("/tasks", params=params).json()
+        page2 = test_client.get(
+            "/tasks", params={**params, "cursor": page1["next_cursor"]}
+        ).json()
+
+        assert [t["title"] for t in page1["items"]] == ["買い物C", "買い物B"]
+        assert [t["title"] for t in page2["items"]] == ["買い物A"]
+
+    def test_list_tasks_filter_completed(self, test_client):
+        """completed=true で完了済みのタスクのみ返ること"""
+        test_client.post("/tasks", json={"title": "未完了タスク"})
+
+        response = test_client.get("/tasks", params={"completed": "true"})
+
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+
+    def test_list_tasks_filter_created_range(self, test_client):
+        """作成日時の範囲で絞り込めること"""
+        test_client.post("/tasks", json={"title": "タスク"})
+
+        future = test_client.get(
+            "/tasks", params={"created_after": "2999-01-01T00:00:00Z"}
+        ).json()
+        past = test_client.get(
+            "/tasks", params={"created_after": "2000-01-01T09:00:00+09:00"}
+        ).json()
+
+        assert future["items"] == []
+        assert len(past["items"]) == 1
+
+    def test_list_tasks_conditional_get(self, test_client):
+        """一覧のETagが一致すれば304、タスクが増えれば200が返ること"""
+        test_client.post("/tasks", json={"title": "タスク1"})
+        etag = test_client.get("/tasks").headers["ETag"]
+
+        unchanged = test_client.get("/tasks", headers={"If-None-Match": etag})
+        test_client.post("/tasks", json={"title": "タスク2"})
+        changed = test_client.get("/tasks", headers={"If-None-Match": etag})
+
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert changed.status_code == 200
+        assert len(changed.json()["items"]) == 2
+
+    def test_list_tasks_items_match_get_task(self, test_client):
+        """一覧の各タスクが GET /tasks/{task_id} と同じ表現であること"""
+        task_id = test_client.post(
+            "/tasks", json={"title": "タスク", "description": "説明"}
+        ).json()["id"]
+        test_client.post(f"/tasks/{task_id}/complete")
+
+        listed = test_client.get("/tasks").json()["items"]
+        changed = test_client.get("/tasks/changes").json()["changed"]
+        found = test_client.get("/tasks/search", params={"q": "タスク"}).json()
+
+        expected = test_client.get(f"/tasks/{task_id}").json()
+        assert listed == changed == found == [expected]
+
+    def test_list_tasks_by_ids(self, test_client):
+        """ids で指定したタスクを指定した順に返すこと"""
+        test_client.post(
+            "/tasks/bulk", json=[{"title": f"タスク{i}"} for i in range(4)]
+        )
+
+        response = test_client.get("/tasks", params={"ids": "3,1,99,3"})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [t["title"] for t in body["items"]] == ["タスク2", "タスク0"]
+        assert body["next_cursor"] is None
+        assert body["items"][0] == test_client.get("/tasks/3").json()
+
+    def test_list_tasks_fields(self, test_client):
+        """fields で指定したフィールドだけを返し、ETagも別になること"""
+        test_client.post("/tasks", json={"title": "タスク", "description": "説明"})
+
+        full = test_client.get("/tasks")
+        sparse = test_client.get("/tasks", params={"fields": "title,completed"})
+        by_ids = test_client.get("/tasks", params={"ids": "1", "fields": "id,title"})
+
+        assert sparse.json()["items"] == [{"title": "タスク", "completed": False}]
+        assert by_ids.json()["items"] == [{"id": 1, "title": "タスク"}]
+        assert sparse.headers["ETag"] != full.headers["ETag"]
+        cached = test_client.get(
+            "/tasks",
+            params={"fields": "title,completed"},
+            headers={"If-None-Match": sparse.headers["ETag"]},
+        )
+        assert cached.status_code == 304
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"ids": "1,abc"},
+            {"ids": ","},
+            {"ids": ",".join(str(i) for i in range(1, 502))},
+            {"fields": "title,secret"},
+            {"fields": ""},
+        ],
+    )
+    def test_list_tasks_invalid_ids_or_fields(self, test_client, params):
+        """不正な ids / fields で400になること"""
+        response = test_client.get("/tasks", params=params)
+
+        assert response.status_code == 400
+
+    def test_list_tasks_invalid_order_by(self, test_client):
+        """未対応の並び順キーで422になること"""
+        response = test_client.get("/tasks", params={"order_by": "title"})
+
+        assert response.status_code == 422
+
+
+class TestGetTaskAPI:
+    """GET /tasks/{task_id} - タスク取得APIのテスト"""
+
+    def test_get_task(self, test_client):
+        """タスクとETag / Last-Modifiedヘッダが返ること"""
+        created = test_client.post("/tasks", json={"title": "タスク"}).json()
+
+        response = test_client.get(f"/tasks/{created['id']}")
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "タスク"
+        assert response.headers["ETag"] == f'"{created["id"]}-1"'
+        assert response.headers["Last-Modified"].endswith(" GMT")
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    def test_get_task_not_found(self, test_client):
+        """存在しないタスクは404になること"""
+        response = test_client.get("/tasks/999")
+
+        assert response.status_code == 404
+
+    def test_get_task_if_none_match(self, test_client):
+        """ETagが一致すれば本文なしの304が返ること"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+        etag = test_client.get(f"/tasks/{task_id}").headers["ETag"]
+
+        response = test_client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_get_task_if_modified_since(self, test_client):
+        """Last-Modified以降の日時を指定すると304が返ること"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+        last_modified = test_client.get(f"/tasks/{task_id}").headers["Last-Modified"]
+
+        response = test_client.get(
+            f"/tasks/{task_id}", headers={"If-Modified-Since": last_modified}
+        )
+
+        assert response.status_code == 304
+
+    def test_get_task_modified_after_update(self, test_client):
+        """更新後は古いETagでは304にならないこと"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+        etag = test_client.get(f"/tasks/{task_id}").headers["ETag"]
+        test_client.patch(
+            "/tasks/bulk", json={"ids": [task_id], "changes": {"completed": True}}
+        )
+
+        response = test_client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json()["completed"] is True
+        assert response.headers["ETag"] != etag
+
+
+class TestUpdateTaskAPI:
+    """PATCH /tasks/{task_id} - タスク更新APIのテスト"""
+
+    def test_update_task(self, test_client):
+        """指定した項目だけが更新され、新しいETagが返ること"""
+        created = test_client.post(
+            "/tasks", json={"title": "タスク", "description": "説明"}
+        ).json()
+
+        response = test_client.patch(f"/tasks/{created['id']}", json={"title": "更新"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["title"], data["description"]) == ("更新", "説明")
+        assert data["version"] == 2
+        assert response.headers["ETag"] == f'"{created["id"]}-2"'
+
+    def test_update_task_if_match(self, test_client):
+        """If-MatchのETagが最新なら更新でき、古ければ409になること"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+        etag = test_client.get(f"/tasks/{task_id}").headers["ETag"]
+
+        first = test_client.patch(
+            f"/tasks/{task_id}", json={"title": "先"}, headers={"If-Match": etag}
+        )
+        second = test_client.patch(
+            f"/tasks/{task_id}", json={"title": "後"}, headers={"If-Match": etag}
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 409
+        assert test_client.get(f"/tasks/{task_id}").json()["title"] == "先"
+
+    def test_update_task_if_match_wildcard(self, test_client):
+        """If-Match: * はバージョンを問わず更新できること"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+
+        response = test_client.patch(
+            f"/tasks/{task_id}", json={"title": "更新"}, headers={"If-Match": "*"}
+        )
+
+        assert response.status_code == 200
+
+    def test_update_task_invalid_if_match(self, test_client):
+        """他のタスクのETagや不正な形式のIf-Matchは400になること"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+
+        response = test_client.patch(
+            f"/tasks/{task_id}",
+            json={"title": "更新"},
+            headers={"If-Match": f'"{task_id + 1}-1"'},
+        )
+
+        assert response.status_code == 400
+
+    def test_update_task_not_found(self, test_client):
+        """存在しないタスクは404になること"""
+        response = test_client.patch("/tasks/999", json={"title": "更新"})
+
+        assert response.status_code == 404
+
+
+class TestTaskCompletionAPI:
+    """POST /tasks/{task_id}/complete|incomplete|toggle のテスト"""
+
+    @pytest.mark.parametrize(
+        "action, completed",
+        [("complete", True), ("incomplete", False), ("toggle", True)],
+    )
+    def test_change_completion(self, test_client, action, completed):
+        """完了状態が変わり、新しいETagが返ること"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+
+        response = test_client.post(f"/tasks/{task_id}/{action}")
+
+        assert response.status_code == 200
+        assert response.json()["completed"] is completed
+        assert response.headers["ETag"] == f'"{task_id}-2"'
+
+    def test_toggle_if_match_conflict(self, test_client):
+        """古いETagでのトグルは409になり、状態が変わらないこと"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+        etag = test_client.get(f"/tasks/{task_id}").headers["ETag"]
+        test_client.patch(f"/tasks/{task_id}", json={"title": "更新"})
+
+        response = test_client.post(
+            f"/tasks/{task_id}/toggle", headers={"If-Match": etag}
+        )
+
+        assert response.status_code == 409
+        assert test_client.get(f"/tasks/{task_id}").json()["completed"] is False
+
+    def test_change_completion_not_found(self, test_client):
+        """存在しないタスクは404になること"""
+        response = test_client.post("/tasks/999/complete", headers={"If-Match": "*"})
+
+        assert response.status_code == 404
+
+    def test_unknown_action(self, test_client):
+        """未知の操作は422になること"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+
+        assert test_client.post(f"/tasks/{task_id}/archive").status_code == 422
+
+
+class TestTaskChangesAPI:
+    """GET /tasks/changes - 差分同期APIのテスト"""
+
+    @pytest.mark.usefixtures("no_settle_time")
+    def test_changes_since_watermark(self, test_client):
+        """watermark 以降の作成・更新・削除だけが返ること"""
+        ids = [
+            t["id"]
+            for t in test_client.post(
+                "/tasks/bulk", json=[{"title": "タスク1"}, {"title": "タスク2"}]
+            ).json()
+        ]
+        initial = test_client.get("/tasks/changes").json()
+        assert [t["id"] for t in initial["changed"]] == ids
+
+        test_client.patch(
+            "/tasks/bulk", json={"ids": [ids[0]], "changes": {"completed": True}}
+        )
+        test_client.request("DELETE", "/tasks/bulk", json={"ids": [ids[1]]})
+        response = test_client.get(
+            "/tasks/changes", params={"since": initial["watermark"]}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [t["id"] for t in body["changed"]] == [ids[0]]
+        assert body["changed"][0]["completed"] is True
+        assert body["deleted"] == [ids[1]]
+        assert body["has_more"] is False
+        assert body["watermark"] != initial["watermark"]
+
+    def test_delete_task_is_reported_as_deleted(self, test_client):
+        """DELETE /tasks/{task_id} で削除したタスクが deleted に含まれること"""
+        task_id = test_client.post("/tasks", json={"title": "タスク"}).json()["id"]
+        watermark = test_client.get("/tasks/changes").json()["watermark"]
+
+        deleted = test_client.delete(f"/tasks/{task_id}")
+        missing = test_client.delete(f"/tasks/{task_id}")
+        changes = test_client.get("/tasks/changes", params={"since": watermark})
+
+        assert deleted.status_code == 204
+        assert missing.status_code == 404
+        assert changes.json()["deleted"] == [task_id]
+        assert test_client.get(f"/tasks/{task_id}").status_code == 404
+
+    def test_changes_invalid_watermark(self, test_client):
+        """不正な watermark で400になること"""
+        response = test_client.get("/tasks/changes", params={"since": "invalid"})
+
+        assert response.status_code == 400
+
+
+class TestTaskStatsAPI:
+    """GET /tasks/stats - タスク件数APIのテスト"""
+
+    def test_stats_empty(self, test_client):
+        """タスクがない場合はすべて0であること"""
+        response = test_client.get("/tasks/stats")
+
+        assert response.status_code == 200
+        assert response.json() == {"total": 0, "completed": 0, "open": 0}
+
+    def test_stats_counts_tasks(self, test_client):
+        """作成したタスクが件数に反映されること"""
+        test_client.post("/tasks/bulk", json=[{"title": "買い物"}, {"title": "掃除"}])
+
+        assert test_client.get("/tasks/stats").json() == {
+            "total": 2,
+            "completed": 0,
+            "open": 2,
+        }
+
+    def test_stats_with_filters(self, test_client):
+        """絞り込み条件に合うタスクの件数を返すこと"""
+        test_client.post("/tasks/bulk", json=[{"title": "買い物"}, {"title": "掃除"}])
+
+        response = test_client.get("/tasks/stats", params={"title_prefix": "買"})
+
+        assert response.json() == {"total": 1, "completed": 0, "open": 1}
+
+
+class TestSearchTasksAPI:
+    """GET /tasks/search - タスク検索APIのテスト"""
+
+    def test_search_tasks(self, test_client):
+        """検索語を含むタスクが関連度順に返ること"""
+        test_client.post(
+            "/tasks/bulk",
+            json=[
+                {"title": "会議の準備", "description": "資料を印刷する"},
+                {"title": "資料を印刷する"},
+                {"title": "掃除"},
+            ],
+        )
+
+        response = test_client.get("/tasks/search", params={"q": "資料を"})
+
+        assert response.status_code == 200
+        titles = [t["title"] for t in response.json()]
+        assert titles == ["資料を印刷する", "会議の準備"]
+
+    def test_search_tasks_pagination(self, test_client):
+        """limit と offset でページを指定できること"""
+        test_client.post(
+            "/tasks/bulk", json=[{"title": f"レポート{i}"} for i in range(3)]
+        )
+
+        response = test_client.get(
+            "/tasks/search", params={"q": "レポート", "limit": 2, "offset": 2}
+        )
+
+        assert [t["title"] for t in response.json()] == ["レポート2"]
+
+    def test_search_tasks_requires_query(self, test_client):
+        """検索語が空の場合は422になること"""
+        assert test_client.get("/tasks/search").status_code == 422
+        assert test_client.get("/tasks/search", params={"q": "  "}).status_code == 422
+
+
+class TestExportTasksAPI:
+    """GET /tasks/export - タスクエクスポートAPIのテスト"""
+
+    def test_export_ndjson(self, test_client):
+        """NDJSON形式でエクスポートできること"""
+        test_client.post(
+            "/tasks/bulk", json=[{"title": "タスク1"}, {"title": "タスク2"}]
+        )
+
+        response = test_client.get("/tasks/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["title"] for r in records] == ["タスク1", "タスク2"]
+        assert set(records[0]) == {
+            "id",
+            "title",
+            "description",
+            "completed",
+            "created_at",
+            "updated_at",
+        }
+
+    def test_export_csv(self, test_client):
+        """CSV形式でエクスポートできること"""
+        test_client.post("/tasks", json={"title": "タスク1", "description": "説明"})
+
+        response = test_client.get("/tasks/export", params={"format": "csv"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "tasks.csv" in response.headers["content-disposition"]
+        records = list(csv.DictReader(io.StringIO(response.text)))
+        assert records[0]["title"] == "タスク1"
+        assert records[0]["description"] == "説明"
+
+    def test_export_invalid_format(self, test_client):
+        """未対応の形式では422になること"""
+        response = test_client.get("/tasks/export", params={"format": "xml"})
+
+        assert response.status_code == 422
+
+
+class TestImportTasksAPI:
+    """POST /tasks/import - タスクインポートAPIのテスト"""
+
+    def test_import_ndjson(self, test_client):
+        """NDJSONからインポートできること"""
+        body = '{"title": "タスク1"}\n{"title": ""}\n{"title": "タスク2"}\n'
+
+        response = test_client.post(
+            "/tasks/import", content=body.encode(), params={"batch_size": 1}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 1
+        assert data["errors"][0]["line"] == 2
+        titles = [t["title"] for t in test_client.get("/tasks").json()["items"]]
+        assert titles == ["タスク1", "タスク2"]
+
+    def test_import_streams_body_in_chunks(self, test_client):
+        """チャンクに分かれたボディ（文字の途中での分割を含む）をインポートできること"""
+        body = "".join(f'{{"title": "タスク{i}"}}\n' for i in range(100)).encode()
+
+        def chunks():
+            for start in range(0, len(body), 7):
+                yield body[start : start + 7]
+
+        response = test_client.post("/tasks/import", content=chunks())
+
+        assert response.status_code == 200
+        assert response.json()["imported"] == 100
+        assert test_client.get("/tasks/stats").json()["total"] == 100
+
+    def test_import_csv_round_trip(self, test_client):
+        """エクスポートしたCSVをそのままインポートできること"""
+        test_client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}])
+        exported = test_client.get("/tasks/export", params={"format": "csv"}).content
+
+        response = test_client.post(
+            "/tasks/import", content=exported, params={"format": "csv"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["imported"] == 2
+        assert len(test_client.get("/tasks").json()["items"]) == 4
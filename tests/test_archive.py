@@ -0,0 +1,233 @@
+"""完了済みタスクのアーカイブのテスト"""
+
+import threading
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from task_app.archiver import ArchiveScheduler
+from task_app.database import init_db
+from task_app.metrics import TASKS_ARCHIVED
+from task_app.models.archive import ArchivedTask
+from task_app.models.outbox import TaskOutboxEvent
+from task_app.models.task import Task, utc_now
+from task_app.repositories.archive import archive_lock
+from task_app.repositories.task import TaskRepository
+from task_app.schemas.task import TaskCreate, TaskUpdate
+from task_app.services.task import TaskService
+
+RETENTION = timedelta(days=30)
+
+
+def age(db_session, task_ids: list[int], days: int = 60) -> None:
+    """タスクの最終更新日時を days 日前にする"""
+    db_session.execute(
+        update(Task)
+        .where(Task.id.in_(task_ids))
+        .values(updated_at=utc_now() - timedelta(days=days))
+    )
+    db_session.commit()
+
+
+def completed_tasks(db_session, count: int, days: int = 60) -> list[int]:
+    """days 日前に完了したタスクを count 件作成する"""
+    repo = TaskRepository(db_session)
+    tasks = repo.create_many([TaskCreate(title=f"タスク{i}") for i in range(count)])
+    ids = [task.id for task in tasks]
+    repo.update_many(TaskUpdate(completed=True), ids=ids)
+    age(db_session, ids, days)
+    return ids
+
+
+def archived_ids(db_session) -> list[int]:
+    stmt = select(ArchivedTask.task_id).order_by(ArchivedTask.id)
+    return list(db_session.scalars(stmt))
+
+
+class TestArchiveCompleted:
+    """TaskRepository.archive_completedのテスト"""
+
+    def test_archives_only_old_completed_tasks(self, db_session):
+        """保持期間を過ぎた完了済みタスクだけが移動すること"""
+        repo = TaskRepository(db_session)
+        old_done = completed_tasks(db_session, 2)
+        old_open = repo.create(TaskCreate(title="未完了")).id
+        age(db_session, [old_open])
+        recent_done = repo.mark_complete(repo.create(TaskCreate(title="最近")).id).id
+
+        archived = repo.archive_completed(utc_now() - RETENTION)
+
+        assert archived == 2
+        assert archived_ids(db_session) == old_done
+        assert [task.id for task in repo.get_all()] == [old_open, recent_done]
+
+    def test_get_archived(self, db_session):
+        """アーカイブしたタスクもIDで同じ内容を取得できること"""
+        repo = TaskRepository(db_session)
+        [task_id] = completed_tasks(db_session, 1)
+        before = repo.get_by_id(task_id)
+        expected = (before.title, before.created_at, before.updated_at, before.version)
+        db_session.expunge(before)
+
+        repo.archive_completed(utc_now() - RETENTION)
+        task = repo.get_archived(task_id)
+
+        assert task is not None
+        assert task not in db_session
+        assert (task.title, task.created_at, task.updated_at, task.version) == expected
+        assert task.completed is True
+        assert repo.get_by_id(task_id) is None
+        assert repo.get_archived(task_id + 1) is None
+
+    def test_reused_id_without_autoincrement(self, tmp_path, monkeypatch):
+        """再利用されたIDのタスクもアーカイブでき、IDで正しいタスクを取得できること"""
+        # AUTOINCREMENT 導入前に作成されたデータベース
+        monkeypatch.setitem(
+            Task.__table__.dialect_options["sqlite"], "autoincrement", False
+        )
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+        init_db(engine)
+        with Session(engine) as db:
+            repo = TaskRepository(db)
+            [task_id] = completed_tasks(db, 1)
+            repo.archive_completed(utc_now() - RETENTION)
+
+            reused = repo.create(TaskCreate(title="新しいタスク"))
+            assert reused.id == task_id
+            assert repo.get_by_id(task_id).title == "新しいタスク"
+
+            repo.mark_complete(task_id)
+            age(db, [task_id])
+            assert repo.archive_completed(utc_now() - RETENTION) == 1
+            assert archived_ids(db) == [task_id, task_id]
+            task = repo.get_archived(task_id)
+        engine.dispose()
+        assert (task.title, task.completed) == ("新しいタスク", True)
+
+    @pytest.mark.usefixtures("no_settle_time")
+    def test_archived_tasks_leave_hot_reads(self, db_session):
+        """一覧・件数・集計・検索・差分同期に含まれなくなること"""
+        repo = TaskRepository(db_session)
+        completed_tasks(db_session, 2)
+        repo.create(TaskCreate(title="タスク残り"))
+        changes = repo.get_changes()
+
+        repo.archive_completed(utc_now() - RETENTION)
+        stats = repo.get_stats()
+
+        assert (stats.total, stats.completed) == (1, 0)
+        assert repo.count() == 1
+        assert [task.title for task in repo.search("タスク残り")] == ["タスク残り"]
+        assert repo.search("タスク0") == []
+        later = repo.get_changes(since=changes.watermark)
+        assert (later.changed, later.deleted) == ([], [])
+
+    def test_archived_task_is_read_only(self, db_session):
+        """アーカイブしたタスクは更新・削除できず、イベントも記録されないこと"""
+        repo = TaskRepository(db_session)
+        [task_id] = completed_tasks(db_session, 1)
+        repo.archive_completed(utc_now() - RETENTION)
+        events = db_session.scalar(select(func.count(TaskOutboxEvent.id)))
+
+        assert repo.update(task_id, TaskUpdate(title="更新")) is None
+        assert repo.mark_incomplete(task_id) is None
+        assert repo.delete(task_id) is False
+        assert repo.get_archived(task_id).title == "タスク0"
+        assert db_session.scalar(select(func.count(TaskOutboxEvent.id))) == events
+
+    def test_batches(self, db_session):
+        """batch_size 件ずつ古い順に移動し、max_batches で止まること"""
+        repo = TaskRepository(db_session)
+        ids = completed_tasks(db_session, 5)
+
+        assert repo.archive_completed(utc_now(), batch_size=2, max_batches=2) == 4
+        assert archived_ids(db_session) == ids[:4]
+        assert repo.archive_completed(utc_now(), batch_size=2) == 1
+        assert repo.archive_completed(utc_now(), batch_size=2) == 0
+
+    def test_without_delete_returning(self, db_session, monkeypatch):
+        """DELETE ... RETURNING がないバックエンドではコピーしてから削除すること"""
+        monkeypatch.setattr(db_session.get_bind().dialect, "delete_returning", False)
+        repo = TaskRepository(db_session)
+        ids = completed_tasks(db_session, 3)
+
+        assert repo.archive_completed(utc_now() - RETENTION, batch_size=2) == 3
+        assert archived_ids(db_session) == ids
+        assert repo.get_all() == []
+
+    def test_copy_locks_rows_first(self):
+        """コピーの前に対象の行をロックし、並行するアーカイブと二重にコピーしないこと"""
+        stmt = archive_lock([1, 2], utc_now())
+
+        assert "FOR UPDATE" in str(stmt.compile(dialect=postgresql.dialect()))
+
+    def test_service(self, db_session):
+        """サービスからアーカイブできること"""
+        service = TaskService(TaskRepository(db_session))
+        task_ids = completed_tasks(db_session, 2)
+
+        assert service.archive_completed(utc_now() - RETENTION, batch_size=1) == 2
+        assert service.get_by_id(task_ids[0]) is None
+        assert service.get_including_archived(task_ids[0]).completed is True
+
+
+class TestArchiveScheduler:
+    """ArchiveSchedulerのテスト"""
+
+    def test_run_once(self, db_session):
+        """保持期間を過ぎた完了済みタスクをすべてアーカイブすること"""
+        ids = completed_tasks(db_session, 3)
+        completed_tasks(db_session, 1, days=1)
+        scheduler = ArchiveScheduler(db_session.get_bind(), RETENTION, batch_size=2)
+        archived = TASKS_ARCHIVED.value()
+
+        assert scheduler.run_once() == 3
+        assert archived_ids(db_session) == ids
+        assert TASKS_ARCHIVED.value() == archived + 3
+
+    def test_background_thread(self, db_session, monkeypatch):
+        """start したスレッドがアーカイブし、stop で止まること"""
+        completed_tasks(db_session, 1)
+        scheduler = ArchiveScheduler(db_session.get_bind(), RETENTION, interval=60)
+        done = threading.Event()
+        run_once = scheduler.run_once
+
+        def run_and_signal():
+            try:
+                return run_once()
+            finally:
+                done.set()
+
+        monkeypatch.setattr(scheduler, "run_once", run_and_signal)
+        scheduler.start()
+        try:
+            assert done.wait(timeout=5)
+        finally:
+            scheduler.stop()
+        assert len(archived_ids(db_session)) == 1
+
+    def test_invalid_batch_size(self, db_session):
+        """batch_size が1未満の場合はエラーになること"""
+        with pytest.raises(ValueError):
+            ArchiveScheduler(db_session.get_bind(), RETENTION, batch_size=0)
+
+
+class TestArchivedTasksAPI:
+    """アーカイブしたタスクのAPIのテスト"""
+
+    def test_get_archived_task(self, test_client, db_session):
+        """GETでは取得でき、一覧には含まれず、変更は404になること"""
+        [task_id] = completed_tasks(db_session, 1)
+        TaskRepository(db_session).archive_completed(utc_now() - RETENTION)
+
+        response = test_client.get(f"/tasks/{task_id}")
+
+        assert response.status_code == 200
+        assert response.json()["completed"] is True
+        assert test_client.get("/tasks").json()["items"] == []
+        patched = test_client.patch(f"/tasks/{task_id}", json={"title": "更新"})
+        assert patched.status_code == 404
+        assert test_client.delete(f"/tasks/{task_id}").status_code == 404
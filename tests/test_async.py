@@ -0,0 +1,300 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.pool import NullPool, StaticPool
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from task_app.api.async_tasks import router as async_tasks_router
+from task_app.api.tasks import get_task_service
+from task_app.api.tasks import router as tasks_router
+from task_app.database import Base, get_async_db, get_db, to_async_url
+from task_app.events import EventBroker
+from task_app.models.outbox import TaskOutboxEvent
+from task_app.models.task import utc_now
+from task_app.repositories.async_task import AsyncTaskRepository
+from task_app.repositories.task import TaskRepository, TaskVersionConflictError
+from task_app.schemas.task import TaskCreate, TaskFilter, TaskUpdate
+from task_app.services.async_task import AsyncTaskService
+
+
+def sync_router_used():
+    raise AssertionError("handled by the sync router")
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+class TestAsyncTaskRepository:
+    async def test_create_and_get_by_id(self, db):
+        repo = AsyncTaskRepository(db)
+
+        task = await repo.create(TaskCreate(title="Task", description="desc"))
+        result = await repo.get_by_id(task.id)
+
+        assert result is not None
+        assert result.title == "Task"
+        assert result.description == "desc"
+        assert result.completed is False
+
+    async def test_create_many(self, db):
+        repo = AsyncTaskRepository(db)
+
+        result = await repo.create_many(
+            [TaskCreate(title=f"Task {i}") for i in range(3)], chunk_size=2
+        )
+
+        assert [t.title for t in result] == ["Task 0", "Task 1", "Task 2"]
+        assert len(await repo.get_all()) == 3
+
+    async def test_get_page(self, db):
+        repo = AsyncTaskRepository(db)
+        ids = [(await repo.create(TaskCreate(title=f"T{i}"))).id for i in range(5)]
+
+        page1 = await repo.get_page(limit=2)
+        page2 = await repo.get_page(limit=2, cursor=page1.next_cursor)
+
+        assert [t.id for t in page1.items + page2.items] == ids[:4]
+
+    async def test_get_page_filtered_descending(self, db):
+        repo = AsyncTaskRepository(db)
+        for title in ["ab", "b", "ac", "ad"]:
+            await repo.create(TaskCreate(title=title))
+        filters = TaskFilter(title_prefix="a")
+
+        page1 = await repo.get_page(limit=2, order_by="-id", filters=filters)
+        page2 = await repo.get_page(
+            limit=2, cursor=page1.next_cursor, order_by="-id", filters=filters
+        )
+
+        assert [t.title for t in page1.items + page2.items] == ["ad", "ac", "ab"]
+        all_items = await repo.get_all(filters=filters, order_by="-id")
+        assert all_items == page1.items + page2.items
+
+    async def test_update_and_delete(self, db):
+        repo = AsyncTaskRepository(db)
+        task = await repo.create(TaskCreate(title="Task"))
+
+        updated = await repo.update(task.id, TaskUpdate(title="Updated"))
+        assert updated.title == "Updated"
+
+        assert await repo.delete(task.id) is True
+        assert await repo.get_by_id(task.id) is None
+        assert await repo.delete(task.id) is False
+
+    async def test_toggle_complete(self, db):
+        repo = AsyncTaskRepository(db)
+        task = await repo.create(TaskCreate(title="Task"))
+
+        assert (await repo.toggle_complete(task.id)).completed is True
+        assert (await repo.mark_incomplete(task.id)).completed is False
+        assert (await repo.mark_complete(task.id)).completed is True
+        assert await repo.toggle_complete(9999) is None
+
+    async def test_expected_version(self, db):
+        repo = AsyncTaskRepository(db)
+        task_id = (await repo.create(TaskCreate(title="Task"))).id
+
+        updated = await repo.update(
+            task_id, TaskUpdate(title="Mine"), expected_version=1
+        )
+        assert updated.version == 2
+        with pytest.raises(TaskVersionConflictError):
+            await repo.update(task_id, TaskUpdate(title="Stale"), expected_version=1)
+        with pytest.raises(TaskVersionConflictError):
+            await repo.mark_complete(task_id, expected_version=1)
+        assert (await repo.mark_complete(task_id, expected_version=2)).version == 3
+
+    async def test_mutations_record_outbox_events(self, db):
+        repo = AsyncTaskRepository(db)
+
+        task = await repo.create(TaskCreate(title="Task"))
+        await repo.update(task.id, TaskUpdate(title="Renamed"))
+        await repo.toggle_complete(task.id)
+        await repo.delete(task.id)
+
+        events = await db.scalars(
+            select(TaskOutboxEvent.event_type).order_by(TaskOutboxEvent.id)
+        )
+        assert list(events) == ["created", "updated", "completed", "deleted"]
+
+    async def test_get_many(self, db):
+        repo = AsyncTaskRepository(db)
+        for i in range(3):
+            await repo.create(TaskCreate(title=f"Task {i}", description="desc"))
+
+        rows = await repo.get_many([3, 1, 3], fields=["title"])
+        page = await repo.get_page(limit=1, rows=True, fields=["title"])
+
+        assert [tuple(row) for row in rows] == [(3, "Task 2", 1), (1, "Task 0", 1)]
+        assert [tuple(row) for row in page.items] == [(1, "Task 0", 1)]
+        assert page.next_cursor is not None
+
+    async def test_archived_task_is_read_only(self, db):
+        repo = AsyncTaskRepository(db)
+        task = await repo.create(TaskCreate(title="Task"))
+        await repo.mark_complete(task.id)
+        await db.run_sync(
+            lambda session: TaskRepository(session).archive_completed(
+                utc_now() + timedelta(days=1)
+            )
+        )
+
+        archived = await repo.get_archived(task.id)
+
+        assert (archived.title, archived.completed) == ("Task", True)
+        assert await repo.get_by_id(task.id) is None
+        assert await repo.get_all() == []
+        assert await repo.update(task.id, TaskUpdate(title="Renamed")) is None
+        assert await repo.delete(task.id) is False
+
+
+class TestAsyncTaskService:
+    async def test_service_delegates_to_repository(self, db):
+        service = AsyncTaskService(AsyncTaskRepository(db))
+
+        task = await service.create(TaskCreate(title="Task"))
+        toggled = await service.toggle_complete(task.id)
+
+        assert toggled.completed is True
+        assert (await service.get_by_id(task.id)).completed is True
+
+    async def test_service_publishes_events(self, db):
+        events = EventBroker()
+        subscription = events.subscribe()
+        service = AsyncTaskService(AsyncTaskRepository(db), events=events)
+
+        task = await service.create(TaskCreate(title="Task"))
+        await service.mark_complete(task.id)
+        await service.delete(task.id)
+
+        received = [await subscription.get() for _ in range(3)]
+        assert [event.type for event in received] == ["created", "completed", "deleted"]
+
+
+class TestAsyncTasksAPI:
+    @pytest.fixture
+    def async_client(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'async.db'}"
+        sync_engine = create_engine(url)
+        Base.metadata.create_all(sync_engine)
+        engine = create_async_engine(to_async_url(url), poolclass=NullPool)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with session_factory() as session:
+                yield session
+
+        def override_get_db():
+            with Session(sync_engine) as session:
+                yield session
+
+        # main.py と同じく、非同期版のルーターを同期版より先に登録する
+        app = FastAPI()
+        app.include_router(async_tasks_router)
+        app.include_router(tasks_router)
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        app.dependency_overrides[get_db] = override_get_db
+        yield TestClient(app)
+        sync_engine.dispose()
+
+    def test_create_and_list_tasks(self, async_client):
+        response = async_client.post("/tasks", json={"title": "非同期タスク"})
+        assert response.status_code == 201
+
+        bulk = async_client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}])
+        assert bulk.status_code == 201
+
+        page = async_client.get("/tasks", params={"limit": 2}).json()
+        assert [t["title"] for t in page["items"]] == ["非同期タスク", "A"]
+        assert page["next_cursor"] is not None
+
+    def test_list_tasks_conditional_get(self, async_client):
+        async_client.post("/tasks", json={"title": "非同期タスク"})
+
+        first = async_client.get("/tasks")
+        etag = first.headers["ETag"]
+        cached = async_client.get("/tasks", headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    def test_invalid_cursor(self, async_client):
+        response = async_client.get("/tasks", params={"cursor": "invalid"})
+
+        assert response.status_code == 400
+
+    def test_single_task_routes(self, async_client):
+        async_client.app.dependency_overrides[get_task_service] = sync_router_used
+        created = async_client.post("/tasks", json={"title": "非同期タスク"})
+        task_id = created.json()["id"]
+
+        fetched = async_client.get(f"/tasks/{task_id}")
+        etag = fetched.headers["ETag"]
+        cached = async_client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+        patched = async_client.patch(
+            f"/tasks/{task_id}", json={"title": "更新"}, headers={"If-Match": etag}
+        )
+        stale = async_client.patch(
+            f"/tasks/{task_id}", json={"title": "古い"}, headers={"If-Match": etag}
+        )
+        toggled = async_client.post(f"/tasks/{task_id}/toggle")
+
+        assert fetched.json()["title"] == "非同期タスク"
+        assert cached.status_code == 304
+        assert patched.json()["title"] == "更新"
+        assert patched.headers["ETag"] != etag
+        assert stale.status_code == 409
+        assert toggled.json()["completed"] is True
+        assert async_client.delete(f"/tasks/{task_id}").status_code == 204
+        assert async_client.get(f"/tasks/{task_id}").status_code == 404
+        assert async_client.delete(f"/tasks/{task_id}").status_code == 404
+        assert async_client.post(f"/tasks/{task_id}/complete").status_code == 404
+
+    def test_invalid_if_match(self, async_client):
+        created = async_client.post("/tasks", json={"title": "非同期タスク"})
+        task_id = created.json()["id"]
+
+        response = async_client.patch(
+            f"/tasks/{task_id}", json={"title": "更新"}, headers={"If-Match": "x"}
+        )
+
+        assert response.status_code == 400
+
+    def test_named_routes_are_left_to_sync_router(self, async_client):
+        # /{task_id:int} は数字だけに一致し、同期版の /tasks/changes などに譲る
+        created = async_client.post("/tasks", json={"title": "非同期タスク"})
+        task_id = created.json()["id"]
+
+        changes = async_client.get("/tasks/changes")
+        bulk = async_client.patch(
+            "/tasks/bulk", json={"ids": [task_id], "changes": {"completed": True}}
+        )
+
+        assert changes.status_code == 200
+        assert bulk.status_code == 200
+
+
+def test_to_async_url():
+    assert (
+        to_async_url("sqlite:///./task_app.db") == "sqlite+aiosqlite:///./task_app.db"
+    )
+    assert to_async_url("postgresql://u:p@localhost/db") == (
+        "postgresql+asyncpg://u:p@localhost/db"
+    )
+    with pytest.raises(ValueError):
+        to_async_url("mysql://localhost/db")
@@ -0,0 +1,210 @@
+"""書き込みのグループコミットのテスト"""
+
+import logging
+from dataclasses import replace
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from task_app import main
+from task_app.batching import WriteBatcher, completion_op, create_op, update_op
+from task_app.database import Base
+from task_app.metrics import WRITE_BATCH_FALLBACKS
+from task_app.models.task import Task
+from task_app.repositories.task import TaskRepository, TaskVersionConflictError
+from task_app.schemas.task import TaskCreate, TaskUpdate
+from task_app.services.task import TaskService
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def commits(engine) -> list[None]:
+    """コミットの回数を記録する"""
+    recorded: list[None] = []
+    event.listen(engine, "commit", lambda conn: recorded.append(None))
+    return recorded
+
+
+@pytest.fixture
+def batcher(engine):
+    # 待ち時間を長くして、テストで投入した操作が必ず同じバッチに入るようにする
+    batcher = WriteBatcher(engine, max_batch_size=5, max_delay_ms=200)
+    yield batcher
+    batcher.close()
+
+
+def stored(engine, task_id: int) -> Task:
+    with Session(engine) as db:
+        return db.get(Task, task_id)
+
+
+class TestWriteBatcher:
+    """WriteBatcherのテスト"""
+
+    def test_groups_operations_into_one_commit(self, batcher, commits):
+        """同時に投入した操作が1回のコミットにまとまること"""
+        futures = [
+            batcher.submit(create_op(TaskCreate(title=f"タスク{i}"))) for i in range(5)
+        ]
+
+        tasks = [future.result(timeout=5) for future in futures]
+
+        assert len(commits) == 1
+        assert [task.title for task in tasks] == [f"タスク{i}" for i in range(5)]
+        assert len({task.id for task in tasks}) == 5
+        # 結果はセッションから切り離されても属性を読める
+        assert tasks[0].version == 1
+        assert tasks[0].created_at is not None
+
+    def test_max_batch_size(self, engine, commits):
+        """max_batch_size 件ごとにコミットすること"""
+        batcher = WriteBatcher(engine, max_batch_size=2, max_delay_ms=200)
+        futures = [
+            batcher.submit(create_op(TaskCreate(title="タスク"))) for _ in range(5)
+        ]
+        batcher.close()
+
+        assert all(future.done() for future in futures)
+        assert len(commits) == 3
+
+    def test_conflict_fails_only_that_operation(self, engine, batcher):
+        """バージョンが異なる操作だけが失敗し、他の操作はコミットされること"""
+        task_id = batcher.execute(create_op(TaskCreate(title="タスク"))).id
+
+        stale = batcher.submit(update_op(task_id, TaskUpdate(title="古い"), 99))
+        fresh = batcher.submit(update_op(task_id, TaskUpdate(title="新しい"), 1))
+        created = batcher.submit(create_op(TaskCreate(title="別のタスク")))
+
+        with pytest.raises(TaskVersionConflictError):
+            stale.result(timeout=5)
+        assert fresh.result(timeout=5).version == 2
+        assert stored(engine, task_id).title == "新しい"
+        assert stored(engine, created.result(timeout=5).id) is not None
+
+    def test_failed_batch_falls_back_to_one_transaction_per_operation(
+        self, engine, batcher
+    ):
+        """バッチが失敗した場合は操作ごとに実行し直し、失敗した操作だけがエラーになること"""
+
+        def broken(db: Session):
+            raise ValueError("broken")
+
+        fallbacks = WRITE_BATCH_FALLBACKS.value()
+        first = batcher.submit(create_op(TaskCreate(title="前")))
+        failing = batcher.submit(broken)
+        last = batcher.submit(create_op(TaskCreate(title="後")))
+
+        with pytest.raises(ValueError):
+            failing.result(timeout=5)
+        assert stored(engine, first.result(timeout=5).id).title == "前"
+        assert stored(engine, last.result(timeout=5).id).title == "後"
+        assert WRITE_BATCH_FALLBACKS.value() == fallbacks + 1
+
+    def test_completion_ops_apply_in_order(self, engine, batcher, commits):
+        """同じバッチ内のトグルが順に適用されること"""
+        task_id = batcher.execute(create_op(TaskCreate(title="タスク"))).id
+
+        futures = [
+            batcher.submit(completion_op(task_id, None)),
+            batcher.submit(completion_op(task_id, None)),
+            batcher.submit(completion_op(task_id, False)),
+        ]
+        results = [future.result(timeout=5) for future in futures]
+
+        assert len(commits) == 2
+        assert results[-1].completed is False
+        assert stored(engine, task_id).version == 4
+
+    def test_toggle_is_one_update_statement(self, engine, batcher):
+        """トグルは読み出さずに、データベースが反転する UPDATE 1文で行うこと"""
+        task_id = batcher.execute(create_op(TaskCreate(title="タスク"))).id
+        statements: list[str] = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        task = batcher.execute(completion_op(task_id, None))
+
+        assert task.completed is True
+        assert statements[0].startswith("UPDATE tasks")
+        assert "completed=tasks.completed = 0" in statements[0]
+        assert "tasks.version =" not in statements[0]
+        assert not any(s.startswith("SELECT") for s in statements)
+
+    def test_completion_without_update_returning(self, engine, batcher, monkeypatch):
+        """UPDATE ... RETURNING がないバックエンドでも変更後のタスクを返すこと"""
+        monkeypatch.setattr(engine.dialect, "update_returning", False)
+        task_id = batcher.execute(create_op(TaskCreate(title="タスク"))).id
+
+        task = batcher.execute(completion_op(task_id, None, expected_version=1))
+
+        assert (task.completed, task.version) == (True, 2)
+        with pytest.raises(TaskVersionConflictError):
+            batcher.execute(completion_op(task_id, None, expected_version=1))
+        assert batcher.execute(completion_op(999, True, expected_version=1)) is None
+
+    def test_missing_task(self, batcher):
+        """存在しないタスクの操作は None になること"""
+        assert batcher.execute(completion_op(999, True)) is None
+        assert batcher.execute(update_op(999, TaskUpdate(title="更新"))) is None
+
+    def test_close_commits_pending_operations(self, engine, batcher):
+        """close は残っている操作をコミットし、その後の投入はエラーになること"""
+        future = batcher.submit(create_op(TaskCreate(title="タスク")))
+
+        batcher.close()
+
+        assert stored(engine, future.result(timeout=0).id) is not None
+        with pytest.raises(RuntimeError):
+            batcher.submit(create_op(TaskCreate(title="タスク")))
+
+
+class TestTaskServiceWithBatcher:
+    """書き込みバッチを使うTaskServiceのテスト"""
+
+    def test_writes_go_through_batcher(self, engine, batcher):
+        """作成・更新・完了状態の変更がリポジトリではなくバッチで行われること"""
+        mock_repo = Mock(spec=TaskRepository)
+        service = TaskService(mock_repo, batcher=batcher)
+
+        task = service.create(TaskCreate(title="タスク"))
+        service.update(task.id, TaskUpdate(title="更新"), expected_version=1)
+        completed = service.mark_complete(task.id)
+
+        assert completed.completed is True
+        assert completed.version == 3
+        assert not mock_repo.create.called
+        assert not mock_repo.update.called
+        assert not mock_repo.mark_complete.called
+        with pytest.raises(TaskVersionConflictError):
+            service.toggle_complete(task.id, expected_version=1)
+
+
+class TestAsyncModeWarning:
+    """非同期モードと書き込みバッチの併用のテスト"""
+
+    async def test_startup_warns_that_async_endpoints_skip_batcher(
+        self, batcher, monkeypatch, caplog
+    ):
+        """DATABASE_ASYNC と WRITE_BATCHING を併用すると起動時に警告すること"""
+        monkeypatch.setattr(main, "settings", replace(main.settings, async_db=True))
+        monkeypatch.setattr(main, "write_batcher", batcher)
+        monkeypatch.setattr(main, "outbox_dispatcher", None)
+        monkeypatch.setattr(main, "archive_scheduler", None)
+
+        with caplog.at_level(logging.WARNING, logger="task_app.main"):
+            async with main.lifespan(main.app):
+                pass
+
+        assert "WRITE_BATCHING does not apply" in caplog.text
@@ -0,0 +1,118 @@
+"""タスクキャッシュのテスト"""
+
+import pytest
+
+from task_app.cache import LRUCache, task_from_cache, task_to_cache
+from task_app.models.task import Task
+
+
+class FakeClock:
+    """テスト用の時計"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUCache:
+    """LRUCacheのテスト"""
+
+    def test_get_returns_stored_value(self):
+        """保存した値を取得できること"""
+        cache = LRUCache()
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 0
+
+    def test_get_missing_key(self):
+        """存在しないキーではNoneが返りミスとして数えること"""
+        cache = LRUCache()
+
+        assert cache.get("missing") is None
+        assert cache.stats.misses == 1
+
+    def test_evicts_least_recently_used(self):
+        """サイズ上限を超えると最も古く参照されたエントリが追い出されること"""
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats.evictions == 1
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self):
+        """TTLを過ぎたエントリは取得できないこと"""
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10.0
+        assert cache.get("a") is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    def test_delete_and_clear(self):
+        """削除とクリアができること"""
+        cache = LRUCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.delete("a")
+        cache.delete("missing")
+        assert cache.get("a") is None
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_set_skips_key_invalidated_since_generation(self):
+        """取得した世代から無効化されたキーには保存しないこと"""
+        cache = LRUCache()
+        generation = cache.generation("a")
+        other = cache.generation("b")
+
+        cache.delete("a")
+        cache.set("a", "古い値", generation)
+        cache.set("b", 2, other)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        cache.set("a", 1, cache.generation("a"))
+        assert cache.get("a") == 1
+
+    def test_clear_advances_every_generation(self):
+        """clear の後は、それ以前に取得した世代では保存しないこと"""
+        cache = LRUCache()
+        generation = cache.generation("a")
+
+        cache.clear()
+        cache.set("a", 1, generation)
+
+        assert cache.get("a") is None
+
+    def test_invalid_max_size(self):
+        """max_sizeが0以下の場合はエラーになること"""
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
+
+
+def test_task_round_trip():
+    """Taskをキャッシュ値に変換して復元できること"""
+    task = Task(id=1, title="タスク", description=None, completed=True)
+
+    restored = task_from_cache(task_to_cache(task))
+
+    assert restored is not task
+    assert restored.id == 1
+    assert restored.title == "タスク"
+    assert restored.completed is True
@@ -0,0 +1,120 @@
+"""条件付きリクエストヘルパーのテスト"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.requests import Request
+
+from task_app.api.conditional import (
+    etag_matches,
+    http_date,
+    if_match_version,
+    is_not_modified,
+    page_etag,
+    task_etag,
+)
+from task_app.models.task import Task
+from task_app.repositories.pagination import TaskPage
+
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+
+def make_request(**headers: str) -> Request:
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def make_task(
+    task_id: int = 1, updated_at: datetime = UPDATED_AT, version: int = 1
+) -> Task:
+    return Task(id=task_id, title="タスク", updated_at=updated_at, version=version)
+
+
+class TestETag:
+    """ETagの生成と比較のテスト"""
+
+    def test_task_etag_changes_with_version(self):
+        """バージョンが変わるとETagが変わること"""
+        assert task_etag(make_task()) == '"1-1"'
+        assert task_etag(make_task(version=2)) == '"1-2"'
+
+    def test_page_etag_reflects_membership_and_cursors(self):
+        """ページの内容やカーソルが変わるとETagが変わること"""
+        page = TaskPage(items=[make_task(1), make_task(2)])
+        same = TaskPage(items=[make_task(1), make_task(2)])
+        updated = TaskPage(items=[make_task(1), make_task(2, version=2)])
+
+        assert page_etag(page) == page_etag(same)
+        assert page_etag(page) != page_etag(updated)
+        assert page_etag(page) != page_etag(TaskPage(items=[make_task(1)]))
+        assert page_etag(page) != page_etag(
+            TaskPage(items=[make_task(1), make_task(2)], next_cursor="next")
+        )
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ('W/"1-a"', True),
+            ('"1-a"', True),
+            ('"x", W/"1-a"', True),
+            ("*", True),
+            ('W/"1-b"', False),
+        ],
+    )
+    def test_etag_matches(self, header, expected):
+        """If-None-Matchを弱い比較で判定すること"""
+        assert etag_matches(header, 'W/"1-a"') is expected
+
+
+class TestIfMatchVersion:
+    """if_match_versionのテスト"""
+
+    def test_version_from_etag(self):
+        """タスクのETagからバージョンを求めること"""
+        assert if_match_version(' "7-3" ', 7) == 3
+
+    def test_wildcard(self):
+        """* はバージョンを問わないこと"""
+        assert if_match_version("*", 7) is None
+
+    @pytest.mark.parametrize(
+        "header", ['W/"7-3"', '"8-3"', '"7-x"', '"7-3", "7-4"', "7-3", '"']
+    )
+    def test_invalid(self, header):
+        """弱いETag・他のタスクのETag・不正な形式はエラーになること"""
+        with pytest.raises(ValueError):
+            if_match_version(header, 7)
+
+
+class TestIsNotModified:
+    """is_not_modifiedのテスト"""
+
+    def test_without_conditions(self):
+        """条件ヘッダがなければ変更ありとみなすこと"""
+        assert not is_not_modified(make_request(), 'W/"1"', UPDATED_AT)
+
+    def test_if_modified_since(self):
+        """If-Modified-Sinceは秒単位で比較すること"""
+        same_second = http_date(UPDATED_AT)
+        before = http_date(UPDATED_AT - timedelta(seconds=1))
+
+        assert is_not_modified(
+            make_request(if_modified_since=same_second), 'W/"1"', UPDATED_AT
+        )
+        assert not is_not_modified(
+            make_request(if_modified_since=before), 'W/"1"', UPDATED_AT
+        )
+
+    def test_if_none_match_takes_precedence(self):
+        """If-None-MatchがあればIf-Modified-Sinceは無視すること"""
+        request = make_request(
+            if_none_match='W/"old"', if_modified_since=http_date(UPDATED_AT)
+        )
+
+        assert not is_not_modified(request, 'W/"1"', UPDATED_AT)
+
+    def test_invalid_date_is_ignored(self):
+        """不正な日時は変更ありとみなすこと"""
+        request = make_request(if_modified_since="yesterday")
+
+        assert not is_not_modified(request, 'W/"1"', UPDATED_AT)
@@ -4,7 +4,15 @@ import pytest
 from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 
-from task_app.database import Base, get_db, init_db, DATABASE_URL
+from task_app.config import Settings
+from task_app.database import (
+    Base,
+    create_db_engine,
+    engine_options,
+    get_db,
+    init_db,
+    DATABASE_URL,
+)
 from task_app.models.task import Task
 
 
@@ -22,6 +30,63 @@ class TestDatabaseSetup:
         assert hasattr(Base, "registry")
 
 
+class TestEngineFactory:
+    """設定に基づくエンジン作成のテスト"""
+
+    def test_sqlite_file_pragmas(self, tmp_path):
+        """ファイルDBでWALなどのPRAGMAが設定されること"""
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", Settings())
+        with engine.connect() as conn:
+
+            def pragma(name):
+                return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == 5000
+            assert pragma("cache_size") == -65536
+        engine.dispose()
+
+    def test_sqlite_pragmas_follow_settings(self, tmp_path):
+        """設定値がPRAGMAに反映されること"""
+        config = Settings(
+            sqlite_journal_mode="delete",
+            sqlite_synchronous="full",
+            sqlite_busy_timeout_ms=1234,
+        )
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", config)
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 2
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 1234
+        engine.dispose()
+
+    def test_invalid_journal_mode_fails(self, tmp_path):
+        """不正なジャーナルモードでエラーになること"""
+        with pytest.raises(ValueError):
+            create_db_engine(
+                f"sqlite:///{tmp_path / 'test.db'}",
+                Settings(sqlite_journal_mode="WAL; DROP TABLE tasks"),
+            )
+
+    def test_pool_settings_applied(self, tmp_path):
+        """プール設定がエンジンに反映されること"""
+        engine = create_db_engine(
+            f"sqlite:///{tmp_path / 'test.db'}", Settings(pool_size=3)
+        )
+        assert engine.pool.size() == 3
+        engine.dispose()
+
+    def test_memory_database_skips_pool_sizing(self):
+        """インメモリDBではプールサイズを指定しないこと"""
+        options = engine_options("sqlite:///:memory:", Settings())
+        assert "pool_size" not in options
+
+        engine = create_db_engine("sqlite:///:memory:", Settings())
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+
+
 class TestTaskModel:
     """Taskモデルのテスト"""
 
@@ -85,6 +150,47 @@ class TestDatabaseInitialization:
         inspector = inspect(engine)
         tables = inspector.get_table_names()
         assert "tasks" in tables
+        assert "tasks_fts" in tables
+
+    def test_init_db_backfills_search_index(self, tmp_path):
+        """既存のデータベースに全文検索インデックスを作成し、既存タスクを登録すること"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            Task.__table__.create(conn)
+            # 全文検索インデックス導入前のデータベースを再現する
+            for name in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+                conn.exec_driver_sql(f"DROP TRIGGER {name}")
+            conn.exec_driver_sql("DROP TABLE tasks_fts")
+            conn.execute(
+                Task.__table__.insert(),
+                [{"title": "既存のタスク", "completed": False}],
+            )
+
+        init_db(engine)
+
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(
+                "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH '\"既存の\"'"
+            ).all()
+        assert rows == [(1,)]
+
+    def test_init_db_adds_version_column(self, tmp_path):
+        """既存のデータベースに version カラムを追加し、既存タスクを1にすること"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        init_db(engine)
+        with engine.begin() as conn:
+            # version 導入前のデータベースを再現する
+            conn.exec_driver_sql("ALTER TABLE tasks DROP COLUMN version")
+            conn.exec_driver_sql(
+                "INSERT INTO tasks (title, completed, created_at, updated_at) "
+                "VALUES ('既存のタスク', 0, '2024-01-01', '2024-01-01')"
+            )
+
+        init_db(engine)
+
+        with engine.connect() as conn:
+            versions = conn.exec_driver_sql("SELECT version FROM tasks").all()
+        assert versions == [(1,)]
 
     def test_get_db_returns_session(self):
         """get_dbがセッションを返すこと"""
@@ -0,0 +1,201 @@
+"""タスクの変更フィードのテスト"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from task_app.api.tasks import get_task_events
+from task_app.events import RESYNC, EventBroker, sse_stream
+from task_app.main import app
+from task_app.metrics import TASK_EVENT_RESYNCS
+from task_app.models.task import Task
+
+
+def event_json(event) -> dict:
+    return json.loads(event.data)
+
+
+class TestEventBroker:
+    """EventBrokerのテスト"""
+
+    async def test_publish_to_subscribers(self):
+        """発行したイベントがすべての購読者に届くこと"""
+        broker = EventBroker()
+        first, second = broker.subscribe(), broker.subscribe()
+        task = Task(id=1, title="タスク", completed=False, version=1)
+
+        broker.publish("created", 1, task)
+
+        for subscription in (first, second):
+            event = await subscription.get()
+            assert event.type == "created"
+            payload = event_json(event)
+            assert payload["type"] == "created"
+            assert payload["id"] == 1
+            assert payload["task"]["title"] == "タスク"
+            assert payload["task"]["version"] == 1
+
+    async def test_publish_without_task(self):
+        """タスクなしのイベントは task が null になること"""
+        broker = EventBroker()
+        subscription = broker.subscribe()
+
+        broker.publish("deleted", 5)
+
+        event = await subscription.get()
+        assert event_json(event) == {"type": "deleted", "id": 5, "task": None}
+        assert event.sse == (
+            f"id: {event.id}\nevent: deleted\ndata: {event.data}\n\n".encode()
+        )
+
+    async def test_publish_from_another_thread(self):
+        """別スレッドからの発行がイベントループに渡されること"""
+        broker = EventBroker()
+        subscription = broker.subscribe()
+
+        thread = threading.Thread(target=broker.publish, args=("deleted", 1))
+        thread.start()
+        thread.join()
+
+        event = await asyncio.wait_for(subscription.get(), timeout=1)
+        assert event_json(event)["id"] == 1
+
+    async def test_overflow_replaces_backlog_with_resync(self):
+        """キューが溢れた購読者には溜まったイベントの代わりに resync が届くこと"""
+        broker = EventBroker(max_queue_size=2)
+        slow, fast = broker.subscribe(), broker.subscribe()
+        resyncs = TASK_EVENT_RESYNCS.value("overflow")
+
+        broker.publish("deleted", 1)
+        broker.publish("deleted", 2)
+        assert event_json(await fast.get())["id"] == 1
+        assert event_json(await fast.get())["id"] == 2
+        broker.publish("deleted", 3)
+
+        assert (await slow.get()).type == RESYNC
+        assert event_json(await fast.get())["id"] == 3
+        assert TASK_EVENT_RESYNCS.value("overflow") == resyncs + 1
+
+    async def test_publish_many_over_queue_size_sends_resync(self):
+        """キューに収まらない件数の一括変更は resync 1つになること"""
+        broker = EventBroker(max_queue_size=2)
+        subscription = broker.subscribe()
+        resyncs = TASK_EVENT_RESYNCS.value("bulk")
+
+        broker.publish_many("updated", [1, 2])
+        assert [event_json(await subscription.get())["id"] for _ in range(2)] == [1, 2]
+        broker.publish_many("deleted", [1, 2, 3])
+        broker.publish("deleted", 4)
+
+        assert (await subscription.get()).type == RESYNC
+        assert event_json(await subscription.get())["id"] == 4
+        assert TASK_EVENT_RESYNCS.value("bulk") == resyncs + 1
+
+    async def test_close(self):
+        """close すると購読が解除され、get は None を返すこと"""
+        broker = EventBroker()
+        with broker.subscribe() as subscription:
+            assert broker.subscriber_count == 1
+        broker.publish("deleted", 1)
+
+        assert broker.subscriber_count == 0
+        assert await subscription.get() is None
+
+    def test_publish_without_subscribers(self):
+        """購読者がいない場合は何もしないこと"""
+        EventBroker().publish("created", 1, Task(id=1, title="タスク"))
+
+
+class TestSSEStream:
+    """sse_streamのテスト"""
+
+    async def test_events_and_heartbeat(self):
+        """イベントの間はハートビートのコメントを返すこと"""
+        broker = EventBroker()
+        stream = sse_stream(broker.subscribe(), heartbeat=0.01)
+
+        assert await anext(stream) == b": connected\n\n"
+        assert await anext(stream) == b": keep-alive\n\n"
+        broker.publish("deleted", 1)
+        chunk = await anext(stream)
+        await stream.aclose()
+
+        assert chunk.startswith(b"id: ")
+        assert b"event: deleted\n" in chunk
+        assert broker.subscriber_count == 0
+
+
+@pytest.fixture
+def broker():
+    broker = EventBroker()
+    app.dependency_overrides[get_task_events] = lambda: broker
+    yield broker
+    app.dependency_overrides.pop(get_task_events, None)
+
+
+class TestTaskEventsAPI:
+    """変更フィードのエンドポイントのテスト"""
+
+    async def test_stream(self, broker):
+        """GET /tasks/stream がイベントを text/event-stream で送ること"""
+        messages: list[dict] = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if b"event: deleted" in message.get("body", b""):
+                disconnected.set()
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/tasks/stream",
+            "raw_path": b"/tasks/stream",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "server": ("testserver", 80),
+            "client": ("testclient", 50000),
+        }
+        request = asyncio.create_task(app(scope, receive, send))
+        while broker.subscriber_count == 0:
+            await asyncio.sleep(0.01)
+        broker.publish("deleted", 7)
+        await asyncio.wait_for(request, timeout=5)
+
+        start = messages[0]
+        assert start["status"] == 200
+        assert (b"content-type", b"text/event-stream; charset=utf-8") in start[
+            "headers"
+        ]
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        assert body.startswith(b": connected\n\n")
+        assert b'data: {"type":"deleted","id":7,"task":null}\n\n' in body
+        assert broker.subscriber_count == 0
+
+    def test_websocket(self, broker, test_client):
+        """/tasks/ws がAPIで行った変更をJSONメッセージとして送ること"""
+        with test_client.websocket_connect("/tasks/ws") as websocket:
+            created = test_client.post("/tasks", json={"title": "タスク"}).json()
+            test_client.post(f"/tasks/{created['id']}/complete")
+            test_client.delete(f"/tasks/{created['id']}")
+
+            messages = [websocket.receive_json() for _ in range(3)]
+
+        assert [message["type"] for message in messages] == [
+            "created",
+            "completed",
+            "deleted",
+        ]
+        assert messages[0]["task"] == created
+        assert messages[1]["task"]["completed"] is True
+        assert messages[2] == {"type": "deleted", "id": created["id"], "task": None}
@@ -0,0 +1,100 @@
+"""タスク一括インポートのテスト"""
+
+import io
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from task_app.importer import import_records, parse_csv, parse_ndjson
+from task_app.schemas.task import TaskCreate
+
+
+class RecordingCreateMany:
+    """create_manyの呼び出しを記録するスタブ"""
+
+    def __init__(self, fail_on_call: int | None = None) -> None:
+        self.batches: list[list[TaskCreate]] = []
+        self.fail_on_call = fail_on_call
+
+    def __call__(self, tasks_in: list[TaskCreate]) -> list[TaskCreate]:
+        self.batches.append(list(tasks_in))
+        if self.fail_on_call == len(self.batches):
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return list(tasks_in)
+
+
+class TestParsers:
+    """解析関数のテスト"""
+
+    def test_parse_ndjson(self):
+        """NDJSONの各行を解析し、空行を読み飛ばすこと"""
+        stream = io.StringIO('{"title": "A"}\n\n{bad json}\n[1, 2]\n{"title": "B"}\n')
+
+        rows = list(parse_ndjson(stream))
+
+        assert rows[0] == (1, {"title": "A"})
+        assert rows[1][0] == 3 and isinstance(rows[1][1], Exception)
+        assert rows[2][0] == 4 and isinstance(rows[2][1], Exception)
+        assert rows[3] == (5, {"title": "B"})
+
+    def test_parse_csv(self):
+        """CSVの各行を解析し、空のdescriptionをNoneにすること"""
+        stream = io.StringIO('title,description\nA,\n"B, C",説明\n')
+
+        rows = list(parse_csv(stream))
+
+        assert rows == [
+            (2, {"title": "A", "description": None}),
+            (3, {"title": "B, C", "description": "説明"}),
+        ]
+
+
+class TestImportRecords:
+    """import_recordsのテスト"""
+
+    def test_imports_in_batches(self):
+        """batch_size件ごとに作成されること"""
+        create_many = RecordingCreateMany()
+        rows = [(i, {"title": f"タスク{i}"}) for i in range(1, 6)]
+
+        result = import_records(rows, create_many, batch_size=2)
+
+        assert [len(b) for b in create_many.batches] == [2, 2, 1]
+        assert result.imported == 5
+        assert result.failed == 0
+        assert result.elapsed_seconds > 0
+        assert result.rows_per_second > 0
+
+    def test_invalid_rows_are_reported(self):
+        """不正な行は行番号付きで記録され、他の行は作成されること"""
+        create_many = RecordingCreateMany()
+        rows = [
+            (1, {"title": "OK"}),
+            (2, {"title": ""}),
+            (3, ValueError("broken")),
+            (4, {"description": "タイトルなし"}),
+        ]
+
+        result = import_records(rows, create_many)
+
+        assert result.imported == 1
+        assert result.failed == 3
+        assert [e.line for e in result.errors] == [2, 3, 4]
+        assert "title" in result.errors[0].error
+
+    def test_failed_batch_is_reported(self):
+        """保存に失敗したバッチの行はエラーとして記録され、処理は続くこと"""
+        create_many = RecordingCreateMany(fail_on_call=1)
+        rows = [(i, {"title": f"タスク{i}"}) for i in range(1, 5)]
+
+        result = import_records(rows, create_many, batch_size=2)
+
+        assert result.imported == 2
+        assert [e.line for e in result.errors] == [1, 2]
+        # ドライバのエラーメッセージは結果に含めない
+        assert {e.error for e in result.errors} == {"保存に失敗しました"}
+
+    def test_invalid_batch_size(self):
+        """batch_sizeが0以下の場合はエラーになること"""
+        with pytest.raises(ValueError):
+            import_records([], RecordingCreateMany(), batch_size=0)
@@ -0,0 +1,143 @@
+"""メトリクスのテスト"""
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import OperationalError
+
+from task_app import metrics
+from task_app.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    instrument_engine,
+)
+from task_app.models.task import Task
+from task_app.repositories.task import TaskRepository
+from task_app.schemas.task import TaskCreate
+
+
+class TestMetricTypes:
+    """メトリクスの型のテスト"""
+
+    def test_counter_render(self):
+        """カウンタがラベル付きで出力されること"""
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("requests_total", "Requests.", ("path",)))
+        counter.inc("/a")
+        counter.inc("/a", amount=2)
+        counter.inc('/b"x')
+
+        text = registry.render()
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{path="/a"} 3' in text
+        assert 'requests_total{path="/b\\"x"} 1' in text
+
+    def test_gauge_inc_dec(self):
+        """ゲージを増減できること"""
+        gauge = Gauge("in_progress", "In progress.")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        assert gauge.value() == 1
+
+    def test_histogram_buckets_are_cumulative(self):
+        """ヒストグラムのバケットが累積で出力されること"""
+        registry = MetricsRegistry()
+        histogram = registry.register(
+            Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        )
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1.0"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert histogram.sum() == pytest.approx(6.25)
+
+    def test_wrong_label_count_fails(self):
+        """ラベルの数が合わない場合はエラーになること"""
+        counter = Counter("c", "C.", ("a", "b"))
+
+        with pytest.raises(ValueError):
+            counter.inc("only-one")
+
+
+class TestMetricsMiddleware:
+    """MetricsMiddlewareと/metricsのテスト"""
+
+    def test_records_route_latency_and_db_stats(self, test_client, db_session):
+        """ルートごとのレイテンシとSQL統計が記録されること"""
+        instrument_engine(db_session.get_bind())
+        before_requests = metrics.REQUESTS.value("POST", "/tasks", "201")
+        before_queries = metrics.REQUEST_DB_QUERIES.sum("POST", "/tasks")
+
+        test_client.post("/tasks", json={"title": "タスク"})
+
+        assert metrics.REQUESTS.value("POST", "/tasks", "201") == before_requests + 1
+        assert metrics.REQUEST_LATENCY.count("POST", "/tasks") >= 1
+        assert metrics.REQUEST_DB_QUERIES.sum("POST", "/tasks") > before_queries
+        assert metrics.REQUESTS_IN_PROGRESS.value("POST") == 0
+
+    def test_unmatched_route(self, client):
+        """存在しないパスは unmatched として集計されること"""
+        before = metrics.REQUESTS.value("GET", "unmatched", "404")
+
+        client.get("/no-such-path")
+
+        assert metrics.REQUESTS.value("GET", "unmatched", "404") == before + 1
+
+    def test_metrics_endpoint(self, client):
+        """/metricsがPrometheus形式で返ること"""
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in (
+            response.text
+        )
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+    def test_instrument_engine_is_idempotent(self, db_session):
+        """同じエンジンに重複してイベントを登録しないこと"""
+        engine = db_session.get_bind()
+        instrument_engine(engine)
+        instrument_engine(engine)
+
+        stats = metrics.RequestDBStats()
+        token = metrics._request_db_stats.set(stats)
+        try:
+            db_session.execute(text("SELECT 1"))
+        finally:
+            metrics._request_db_stats.reset(token)
+
+        assert stats.queries == 1
+
+    def test_rows_affected_counts_writes_only(self, db_session):
+        """変更した行数だけを数え、SELECTで取得した行は数えないこと"""
+        instrument_engine(db_session.get_bind())
+        repo = TaskRepository(db_session)
+        repo.create(TaskCreate(title="タスク1"))
+        repo.create(TaskCreate(title="タスク2"))
+
+        stats = metrics.RequestDBStats()
+        token = metrics._request_db_stats.set(stats)
+        try:
+            db_session.execute(update(Task).values(completed=True))
+            db_session.execute(select(Task)).all()
+            with pytest.raises(OperationalError):
+                db_session.execute(text("SELECT * FROM no_such_table"))
+            db_session.rollback()
+            db_session.execute(text("SELECT 1"))
+        finally:
+            metrics._request_db_stats.reset(token)
+
+        assert stats.queries == 3
+        assert stats.rows_affected == 2
@@ -0,0 +1,286 @@
+"""アウトボックスのテスト"""
+
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from task_app.batching import WriteBatcher, create_op
+from task_app.database import Base, create_db_engine, init_db
+from task_app.metrics import OUTBOX_DISPATCHED, OUTBOX_LAG
+from task_app.models.outbox import TaskOutboxEvent
+from task_app.models.task import utc_now
+from task_app.outbox import (
+    FileSink,
+    HTTPSink,
+    OutboxDispatcher,
+    event_message,
+    sink_from_url,
+)
+from task_app.repositories.outbox import claim_statement
+from task_app.repositories.task import TaskRepository, TaskVersionConflictError
+from task_app.schemas.task import TaskCreate, TaskUpdate
+
+
+def outbox(db_session) -> list[TaskOutboxEvent]:
+    db_session.expire_all()
+    stmt = select(TaskOutboxEvent).order_by(TaskOutboxEvent.id)
+    return list(db_session.scalars(stmt))
+
+
+class ListSink:
+    """送られたイベントを記録するシンク"""
+
+    def __init__(self, fail: bool = False, delay: float = 0.0) -> None:
+        self.batches: list[list[dict]] = []
+        self.fail = fail
+        self.delay = delay
+
+    def send(self, messages):
+        if self.fail:
+            raise ConnectionError("sink unavailable")
+        time.sleep(self.delay)
+        self.batches.append(messages)
+
+
+class TestOutboxRecording:
+    """変更と同じトランザクションでイベントが記録されることのテスト"""
+
+    def test_mutations_record_events(self, db_session):
+        """各変更の種類とタスクの内容が記録されること"""
+        repo = TaskRepository(db_session)
+        task = repo.create(TaskCreate(title="タスク"))
+        repo.update(task.id, TaskUpdate(title="更新"))
+        repo.mark_complete(task.id)
+        repo.mark_incomplete(task.id)
+        repo.delete(task.id)
+
+        events = outbox(db_session)
+
+        assert [event.event_type for event in events] == [
+            "created",
+            "updated",
+            "completed",
+            "completed",
+            "deleted",
+        ]
+        assert {event.task_id for event in events} == {task.id}
+        payloads = [json.loads(event.payload) for event in events[:4]]
+        assert payloads[0]["title"] == "タスク"
+        assert payloads[1]["title"] == "更新"
+        assert [p["completed"] for p in payloads[2:]] == [True, False]
+        assert [p["version"] for p in payloads] == [1, 2, 3, 4]
+        assert events[4].payload is None
+
+    def test_bulk_mutations_record_event_per_task(self, db_session):
+        """一括作成・一括更新・一括削除ではタスクごとに記録されること"""
+        repo = TaskRepository(db_session)
+        tasks = repo.create_many([TaskCreate(title=f"タスク{i}") for i in range(3)])
+        ids = [task.id for task in tasks]
+        repo.update_many(TaskUpdate(completed=True), ids=ids[:2])
+        repo.delete_many(ids=ids)
+
+        events = [(e.event_type, e.task_id) for e in outbox(db_session)]
+
+        assert events == [
+            *[("created", task_id) for task_id in ids],
+            *[("updated", task_id) for task_id in ids[:2]],
+            *[("deleted", task_id) for task_id in ids],
+        ]
+
+    def test_failed_mutation_records_nothing(self, db_session):
+        """ロールバックされた変更のイベントは残らないこと"""
+        repo = TaskRepository(db_session)
+        task = repo.create(TaskCreate(title="タスク"))
+
+        with pytest.raises(TaskVersionConflictError):
+            repo.mark_complete(task.id, expected_version=99)
+        with pytest.raises(TaskVersionConflictError):
+            repo.update(task.id, TaskUpdate(title="更新"), expected_version=99)
+
+        assert [event.event_type for event in outbox(db_session)] == ["created"]
+
+    def test_batched_write_records_event(self, tmp_path):
+        """グループコミットの書き込みでも記録されること"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+        Base.metadata.create_all(engine)
+        batcher = WriteBatcher(engine)
+        task = batcher.execute(create_op(TaskCreate(title="タスク")))
+        batcher.close()
+
+        with Session(engine) as db:
+            events = outbox(db)
+        engine.dispose()
+        assert [(e.event_type, e.task_id) for e in events] == [("created", task.id)]
+
+
+class TestOutboxDispatcher:
+    """OutboxDispatcherのテスト"""
+
+    def test_dispatch_delivers_and_deletes_in_batches(self, db_session):
+        """batch_size 件ずつ id 順に配信し、配信したイベントを削除すること"""
+        repo = TaskRepository(db_session)
+        repo.create_many([TaskCreate(title=f"タスク{i}") for i in range(5)])
+        sink = ListSink()
+        dispatcher = OutboxDispatcher(db_session.get_bind(), sink, batch_size=2)
+        dispatched = OUTBOX_DISPATCHED.value()
+
+        counts = [dispatcher.dispatch_once() for _ in range(4)]
+
+        assert counts == [2, 2, 1, 0]
+        event_ids = [m["event_id"] for batch in sink.batches for m in batch]
+        assert event_ids == sorted(event_ids)
+        assert [m["task"]["title"] for m in sink.batches[0]] == ["タスク0", "タスク1"]
+        assert outbox(db_session) == []
+        assert OUTBOX_DISPATCHED.value() == dispatched + 5
+        assert OUTBOX_LAG.value() == 0
+
+    def test_failed_send_keeps_events(self, db_session):
+        """送信に失敗したイベントは削除せず、次の配信で再送すること"""
+        TaskRepository(db_session).create(TaskCreate(title="タスク"))
+        sink = ListSink(fail=True)
+        dispatcher = OutboxDispatcher(db_session.get_bind(), sink)
+
+        with pytest.raises(ConnectionError):
+            dispatcher.dispatch_once()
+        [event] = outbox(db_session)
+        assert (event.claimed_by, event.claimed_at) == (None, None)
+
+        sink.fail = False
+        assert dispatcher.dispatch_once() == 1
+        assert outbox(db_session) == []
+
+    def test_concurrent_dispatchers_deliver_each_event_once(self, tmp_path):
+        """同じデータベースの2つのディスパッチャーが同じイベントを配信しないこと"""
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+        init_db(engine)
+        with Session(engine) as db:
+            TaskRepository(db).create_many(
+                [TaskCreate(title=f"タスク{i}") for i in range(40)]
+            )
+        sink = ListSink(delay=0.01)
+        dispatchers = [OutboxDispatcher(engine, sink, batch_size=3) for _ in range(2)]
+        start = threading.Barrier(len(dispatchers))
+
+        def drain(dispatcher):
+            start.wait()
+            while dispatcher.dispatch_once():
+                pass
+
+        threads = [threading.Thread(target=drain, args=(d,)) for d in dispatchers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        event_ids = [m["event_id"] for batch in sink.batches for m in batch]
+        with Session(engine) as db:
+            remaining = outbox(db)
+        engine.dispose()
+        assert len(event_ids) == 40
+        assert len(set(event_ids)) == 40
+        assert remaining == []
+
+    def test_expired_claim_is_taken_over(self, db_session):
+        """リースが切れたクレームのイベントは他のディスパッチャーが配信すること"""
+        TaskRepository(db_session).create(TaskCreate(title="タスク"))
+        # 送信中に停止したディスパッチャーのクレーム
+        now = utc_now()
+        db_session.execute(claim_statement("stopped", now, now, limit=10))
+        db_session.commit()
+        dispatcher = OutboxDispatcher(
+            db_session.get_bind(), ListSink(), lease_seconds=60
+        )
+
+        assert dispatcher.dispatch_once() == 0
+        db_session.execute(
+            update(TaskOutboxEvent).values(claimed_at=now - timedelta(seconds=61))
+        )
+        db_session.commit()
+        assert dispatcher.dispatch_once() == 1
+        assert outbox(db_session) == []
+
+    def test_background_thread(self, db_session):
+        """start したスレッドがイベントを配信し、stop で止まること"""
+        TaskRepository(db_session).create(TaskCreate(title="タスク"))
+        delivered = threading.Event()
+
+        class Sink:
+            def send(self, messages):
+                delivered.set()
+
+        dispatcher = OutboxDispatcher(db_session.get_bind(), Sink(), poll_interval=0.01)
+        dispatcher.start()
+        try:
+            assert delivered.wait(timeout=5)
+        finally:
+            dispatcher.stop()
+
+    def test_event_message(self, db_session):
+        """イベントの辞書にタスクとUTCの作成日時が含まれること"""
+        task = TaskRepository(db_session).create(TaskCreate(title="タスク"))
+
+        message = event_message(outbox(db_session)[0])
+
+        assert message["type"] == "created"
+        assert message["task_id"] == task.id
+        assert message["task"]["id"] == task.id
+        assert message["created_at"].tzinfo is not None
+
+
+class TestSinks:
+    """シンクのテスト"""
+
+    def test_file_sink_appends_ndjson(self, tmp_path):
+        """1行1イベントで追記すること"""
+        path = tmp_path / "events.ndjson"
+        sink = sink_from_url(f"file://{path}")
+
+        sink.send([{"event_id": 1}, {"event_id": 2}])
+        sink.send([{"event_id": 3}])
+
+        assert isinstance(sink, FileSink)
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["event_id"] for line in lines] == [1, 2, 3]
+
+    def test_http_sink_posts_json(self):
+        """JSON配列を POST し、2xx 以外は例外になること"""
+        received: list = []
+        status = {"code": 204}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                received.append(json.loads(self.rfile.read(length)))
+                self.send_response(status["code"])
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            sink = sink_from_url(f"http://127.0.0.1:{server.server_port}/events")
+            assert isinstance(sink, HTTPSink)
+
+            sink.send([{"event_id": 1}])
+            status["code"] = 503
+            with pytest.raises(OSError):
+                sink.send([{"event_id": 2}])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert received == [[{"event_id": 1}], [{"event_id": 2}]]
+
+    def test_unsupported_url(self):
+        """対応していないスキームはエラーになること"""
+        with pytest.raises(ValueError):
+            sink_from_url("ftp://example.com/events")
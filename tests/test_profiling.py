@@ -0,0 +1,143 @@
+"""SQLプロファイリングのテスト"""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from task_app.database import Base
+from task_app.profiling import (
+    QueryProfiler,
+    QueryProfilerMiddleware,
+    normalize_statement,
+    profile_queries,
+)
+from task_app.repositories.task import TaskRepository
+from task_app.schemas.task import TaskCreate
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_normalize_statement():
+    """IN句の長さや数値だけが異なるSQLが同じ形になること"""
+    a = normalize_statement("SELECT * FROM tasks WHERE id IN (?, ?)  LIMIT 10")
+    b = normalize_statement("SELECT * FROM tasks\n WHERE id IN (?, ?, ?) LIMIT 20")
+
+    assert a == b == "SELECT * FROM tasks WHERE id IN (?) LIMIT N"
+
+
+class TestSlowQueryLog:
+    """スロークエリログのテスト"""
+
+    def test_logs_slow_query_with_plan_and_origin(self, engine, db, caplog):
+        """しきい値を超えたSQLが実行計画と発行元とともに出力されること"""
+        QueryProfiler(slow_query_ms=0).install(engine)
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="タスク"))
+        caplog.clear()
+
+        with caplog.at_level(logging.WARNING, logger="task_app.profiling"):
+            repo.get_by_id(task.id)
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert len(messages) == 1
+        assert "origin: TaskRepository.get_by_id" in messages[0]
+        assert "params: (" in messages[0]
+        assert "plan: SEARCH tasks USING INTEGER PRIMARY KEY" in messages[0]
+
+    def test_fast_queries_are_not_logged(self, engine, db, caplog):
+        """しきい値未満のSQLは出力されないこと"""
+        QueryProfiler(slow_query_ms=10_000).install(engine)
+
+        with caplog.at_level(logging.WARNING, logger="task_app.profiling"):
+            TaskRepository(db).get_all()
+
+        assert caplog.records == []
+
+    def test_failed_statement_does_not_leak_timing(self, engine, db, caplog):
+        """失敗したSQLの後も次のSQLが正しく計測されること"""
+        QueryProfiler(slow_query_ms=0, explain=False).install(engine)
+        with pytest.raises(OperationalError):
+            db.execute(text("SELECT * FROM no_such_table"))
+        db.rollback()
+
+        with caplog.at_level(logging.WARNING, logger="task_app.profiling"):
+            db.execute(text("SELECT 1"))
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert len(messages) == 1
+        assert "SELECT 1" in messages[0]
+
+
+class TestNPlusOneDetection:
+    """N+1検出のテスト"""
+
+    def test_flags_repeated_statements(self, engine, db, caplog):
+        """同じ形のSQLがしきい値を超えて実行されると警告されること"""
+        QueryProfiler(slow_query_ms=10_000, n_plus_one_threshold=3).install(engine)
+        repo = TaskRepository(db)
+        ids = [t.id for t in repo.create_many([TaskCreate(title="t")] * 5)]
+
+        with caplog.at_level(logging.WARNING, logger="task_app.profiling"):
+            with profile_queries("dashboard") as scope:
+                for task_id in ids:
+                    repo.get_by_id(task_id)
+
+        assert len(scope.flagged) == 1
+        messages = [r.getMessage() for r in caplog.records]
+        assert len(messages) == 1
+        assert "Possible N+1" in messages[0]
+        assert "in dashboard" in messages[0]
+        assert "origin: TaskRepository.get_by_id" in messages[0]
+
+    def test_not_flagged_below_threshold(self, engine, db):
+        """しきい値以下の実行回数では警告されないこと"""
+        QueryProfiler(slow_query_ms=10_000, n_plus_one_threshold=3).install(engine)
+
+        with profile_queries() as scope:
+            for _ in range(3):
+                db.execute(text("SELECT 1"))
+
+        assert scope.flagged == []
+
+    def test_middleware_scopes_per_request(self, engine, db, caplog):
+        """ミドルウェアがリクエストごとに範囲を区切り、ルートを出力すること"""
+        QueryProfiler(slow_query_ms=10_000, n_plus_one_threshold=2).install(engine)
+        app = FastAPI()
+        app.add_middleware(QueryProfilerMiddleware)
+
+        @app.get("/items/{count}")
+        def items(count: int):
+            for _ in range(count):
+                db.execute(text("SELECT 1"))
+            return {}
+
+        client = TestClient(app)
+        with caplog.at_level(logging.WARNING, logger="task_app.profiling"):
+            client.get("/items/2")
+            client.get("/items/2")
+            assert caplog.records == []
+            client.get("/items/3")
+
+        assert "in GET /items/{count}" in caplog.records[0].getMessage()
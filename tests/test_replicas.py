@@ -0,0 +1,129 @@
+"""リードレプリカへの振り分けのテスト"""
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from task_app.database import Base
+from task_app.models.task import Task
+from task_app.replicas import (
+    LeastConnectionsSelector,
+    RoundRobinSelector,
+    RoutingSession,
+    make_selector,
+    use_primary,
+)
+from task_app.repositories.task import TaskRepository
+from task_app.schemas.task import TaskCreate
+
+
+def _memory_engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def engines():
+    """プライマリとレプリカ（別々のインメモリDB）"""
+    return _memory_engine(), _memory_engine()
+
+
+@pytest.fixture
+def session_factory(engines):
+    primary, replica = engines
+    return sessionmaker(class_=RoutingSession, bind=primary, replicas=[replica])
+
+
+class TestRoutingSession:
+    """RoutingSessionのテスト"""
+
+    def test_reads_go_to_replica(self, engines, session_factory):
+        """読み込みはレプリカで実行されること"""
+        primary, replica = engines
+        with session_factory() as db:
+            TaskRepository(db).create(TaskCreate(title="プライマリのみ"))
+
+        with session_factory() as db:
+            assert db.get_bind(clause=select(Task)) is replica
+            assert TaskRepository(db).get_all() == []
+
+    def test_writes_go_to_primary(self, engines, session_factory):
+        """書き込みはプライマリで実行されること"""
+        primary, replica = engines
+        with session_factory() as db:
+            TaskRepository(db).create(TaskCreate(title="タスク"))
+
+        with primary.connect() as conn:
+            assert conn.execute(select(Task.title)).scalars().all() == ["タスク"]
+        with replica.connect() as conn:
+            assert conn.execute(select(Task.title)).scalars().all() == []
+
+    def test_reads_after_write_use_primary(self, session_factory):
+        """書き込んだセッションでは以降の読み込みもプライマリで行うこと"""
+        with session_factory() as db:
+            repo = TaskRepository(db)
+            task = repo.create(TaskCreate(title="タスク"))
+
+            assert repo.get_by_id(task.id) is not None
+
+    def test_single_statement_update_goes_to_primary(self, session_factory):
+        """UPDATE文はプライマリで実行されること"""
+        with session_factory() as db:
+            task = TaskRepository(db).create(TaskCreate(title="タスク"))
+
+        with session_factory() as db:
+            result = TaskRepository(db).mark_complete(task.id)
+
+            assert result is not None
+            assert result.completed is True
+
+    def test_use_primary(self, session_factory):
+        """use_primary()のブロック内ではプライマリから読むこと"""
+        with session_factory() as db:
+            TaskRepository(db).create(TaskCreate(title="タスク"))
+
+        with session_factory() as db:
+            with use_primary(db):
+                assert len(TaskRepository(db).get_all()) == 1
+            assert TaskRepository(db).get_all() == []
+
+    def test_without_replicas_uses_primary(self, engines):
+        """レプリカがない場合はプライマリを使うこと"""
+        primary, _ = engines
+        with RoutingSession(bind=primary) as db:
+            assert db.get_bind(clause=select(Task)) is primary
+
+
+class TestSelectors:
+    """レプリカセレクタのテスト"""
+
+    def test_round_robin(self):
+        """順番にレプリカを選ぶこと"""
+        replicas = [_memory_engine(), _memory_engine()]
+        selector = RoundRobinSelector()
+
+        chosen = [selector.choose(replicas) for _ in range(4)]
+
+        assert chosen == [replicas[0], replicas[1], replicas[0], replicas[1]]
+
+    def test_least_connections(self, tmp_path):
+        """貸し出し中の接続が少ないレプリカを選ぶこと"""
+        busy = create_engine(f"sqlite:///{tmp_path / 'busy.db'}")
+        idle = create_engine(f"sqlite:///{tmp_path / 'idle.db'}")
+        selector = LeastConnectionsSelector()
+
+        with busy.connect():
+            assert selector.choose([busy, idle]) is idle
+
+    def test_make_selector(self):
+        """名前からセレクタを作成できること"""
+        assert isinstance(make_selector("round_robin"), RoundRobinSelector)
+        assert isinstance(make_selector("least_connections"), LeastConnectionsSelector)
+        with pytest.raises(ValueError):
+            make_selector("random")
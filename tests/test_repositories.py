@@ -1,12 +1,21 @@
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, select, update
 from sqlalchemy.orm import sessionmaker, Session
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta, timezone
 
 from task_app.database import Base
+from task_app.models.counter import TaskCounter
 from task_app.models.task import Task
-from task_app.schemas.task import TaskCreate, TaskUpdate
-from task_app.repositories.task import TaskRepository
+from task_app.models.tombstone import TaskTombstone
+from task_app.schemas.task import TaskCreate, TaskFilter, TaskUpdate
+from task_app.serializers import RESPONSE_FIELDS
+from task_app.repositories.pagination import (
+    CursorPosition,
+    InvalidCursorError,
+    encode_cursor,
+)
+from task_app.repositories.statements import apply_filters, prefix_upper_bound
+from task_app.repositories.task import TaskRepository, TaskVersionConflictError
 
 
 @pytest.fixture
@@ -20,7 +29,6 @@ def db():
 
 
 class TestTaskRepositoryCreate:
-
     def test_create_valid_task(self, db: Session):
         repo = TaskRepository(db)
         task_in = TaskCreate(title="Buy groceries", description="Milk, eggs, bread")
@@ -55,8 +63,38 @@ class TestTaskRepositoryCreate:
         assert task2.title == "Task 2"
 
 
-class TestTaskRepositoryGetById:
+class TestTaskRepositoryCreateMany:
+    def test_create_many_returns_tasks_in_order(self, db: Session):
+        repo = TaskRepository(db)
+        tasks_in = [TaskCreate(title=f"Task {i}") for i in range(5)]
+
+        result = repo.create_many(tasks_in, chunk_size=2)
+
+        assert [t.title for t in result] == [f"Task {i}" for i in range(5)]
+        assert all(t.id is not None for t in result)
+        assert all(t.completed is False for t in result)
+        assert all(t.created_at is not None for t in result)
+        assert len({t.id for t in result}) == 5
+        assert len(repo.get_all()) == 5
+
+    def test_create_many_empty_list(self, db: Session):
+        repo = TaskRepository(db)
+
+        result = repo.create_many([])
 
+        assert result == []
+
+    def test_create_many_is_atomic(self, db: Session):
+        repo = TaskRepository(db)
+        bad = TaskCreate.model_construct(title=None, description=None)
+
+        with pytest.raises(Exception):
+            repo.create_many([TaskCreate(title="ok"), bad], chunk_size=1)
+
+        assert repo.get_all() == []
+
+
+class TestTaskRepositoryGetById:
     def test_get_by_id_existing_task(self, db: Session):
         repo = TaskRepository(db)
         created = repo.create(TaskCreate(title="Test task"))
@@ -76,7 +114,6 @@ class TestTaskRepositoryGetById:
 
 
 class TestTaskRepositoryGetAll:
-
     def test_get_all_empty_list(self, db: Session):
         repo = TaskRepository(db)
         
@@ -112,8 +149,618 @@ class TestTaskRepositoryGetAll:
         assert page1_ids.isdisjoint(page2_ids)
 
 
-class TestTaskRepositoryUpdate:
+class TestTaskRepositoryGetPage:
+    def test_get_page_empty(self, db: Session):
+        repo = TaskRepository(db)
+
+        page = repo.get_page()
+
+        assert page.items == []
+        assert page.next_cursor is None
+        assert page.prev_cursor is None
+
+    def test_get_page_walks_forward_and_back(self, db: Session):
+        repo = TaskRepository(db)
+        ids = [repo.create(TaskCreate(title=f"Task {i}")).id for i in range(7)]
+
+        page1 = repo.get_page(limit=3)
+        page2 = repo.get_page(limit=3, cursor=page1.next_cursor)
+        page3 = repo.get_page(limit=3, cursor=page2.next_cursor)
+
+        assert [t.id for t in page1.items] == ids[0:3]
+        assert [t.id for t in page2.items] == ids[3:6]
+        assert [t.id for t in page3.items] == ids[6:7]
+        assert page1.prev_cursor is None
+        assert page3.next_cursor is None
+
+        back = repo.get_page(limit=3, cursor=page3.prev_cursor)
+        assert [t.id for t in back.items] == ids[3:6]
+        first = repo.get_page(limit=3, cursor=back.prev_cursor)
+        assert [t.id for t in first.items] == ids[0:3]
+        assert first.prev_cursor is None
+        assert first.next_cursor is not None
+
+    def test_get_page_order_by_created_at(self, db: Session):
+        repo = TaskRepository(db)
+        ids = [repo.create(TaskCreate(title=f"Task {i}")).id for i in range(5)]
+
+        page1 = repo.get_page(limit=2, order_by="created_at")
+        page2 = repo.get_page(limit=2, cursor=page1.next_cursor, order_by="created_at")
+
+        assert [t.id for t in page1.items + page2.items] == ids[0:4]
+
+    def test_get_page_rejects_cursor_for_other_order(self, db: Session):
+        repo = TaskRepository(db)
+        for i in range(3):
+            repo.create(TaskCreate(title=f"Task {i}"))
+        page = repo.get_page(limit=1)
+
+        with pytest.raises(InvalidCursorError):
+            repo.get_page(limit=1, cursor=page.next_cursor, order_by="created_at")
+
+    def test_get_page_rejects_malformed_cursor(self, db: Session):
+        repo = TaskRepository(db)
+
+        with pytest.raises(InvalidCursorError):
+            repo.get_page(cursor="not-a-cursor")
+
+    def test_get_page_rows_match_objects(self, db: Session):
+        repo = TaskRepository(db)
+        for i in range(5):
+            repo.create(TaskCreate(title=f"Task {i}", description="desc"))
+
+        tasks = repo.get_page(limit=2, order_by="-created_at")
+        rows = repo.get_page(limit=2, order_by="-created_at", rows=True)
+
+        assert [tuple(row) for row in rows.items] == [
+            tuple(getattr(t, field) for field in RESPONSE_FIELDS) for t in tasks.items
+        ]
+        assert rows.next_cursor == tasks.next_cursor
+        following = repo.get_page(
+            limit=2, cursor=rows.next_cursor, order_by="-created_at", rows=True
+        )
+        assert following.items[0].id == 3
+
+    def test_get_page_fields(self, db: Session):
+        repo = TaskRepository(db)
+        for i in range(3):
+            repo.create(TaskCreate(title=f"Task {i}", description="desc"))
+
+        page = repo.get_page(
+            limit=2, order_by="-created_at", rows=True, fields=["title"]
+        )
+        following = repo.get_page(
+            limit=2, cursor=page.next_cursor, order_by="-created_at", rows=True
+        )
+
+        # id, version and the sort key are kept for ETags and cursors
+        assert page.items[0]._fields == ("id", "title", "created_at", "version")
+        assert [row.title for row in page.items] == ["Task 2", "Task 1"]
+        assert [row.id for row in following.items] == [1]
+
+
+class TestTaskRepositoryGetMany:
+    def test_get_many_keeps_requested_order(self, db: Session):
+        repo = TaskRepository(db)
+        for i in range(5):
+            repo.create(TaskCreate(title=f"Task {i}"))
+
+        rows = repo.get_many([4, 2, 42, 4, 1])
+
+        assert [row.id for row in rows] == [4, 2, 1]
+        assert rows[0]._fields == RESPONSE_FIELDS
+
+    def test_get_many_is_one_query(self, db: Session):
+        repo = TaskRepository(db)
+        for i in range(5):
+            repo.create(TaskCreate(title=f"Task {i}"))
+        statements = []
+        event.listen(
+            db.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        repo.get_many([5, 3, 1])
+
+        assert len(statements) == 1
+        assert "IN" in statements[0]
+
+    def test_get_many_fields_and_filters(self, db: Session):
+        repo = TaskRepository(db)
+        for i in range(3):
+            repo.create(TaskCreate(title=f"Task {i}", description="desc"))
+        repo.mark_complete(2)
+
+        rows = repo.get_many(
+            [3, 2, 1], filters=TaskFilter(completed=False), fields=["title"]
+        )
+
+        assert [tuple(row) for row in rows] == [(3, "Task 2", 1), (1, "Task 0", 1)]
+        assert rows[0]._fields == ("id", "title", "version")
+
+
+class TestTaskRepositoryFilters:
+    @pytest.fixture
+    def tasks(self, db: Session):
+        base = datetime(2024, 1, 1)
+        titles = ["apple", "apricot", "banana", "Apple pie", "apps"]
+        tasks = []
+        for i, title in enumerate(titles):
+            task = Task(
+                title=title,
+                completed=i % 2 == 1,
+                created_at=base + timedelta(days=i),
+                updated_at=base + timedelta(days=10 - i),
+            )
+            db.add(task)
+            tasks.append(task)
+        db.commit()
+        return tasks
+
+    def test_filter_completed_newest_first(self, db: Session, tasks):
+        repo = TaskRepository(db)
+
+        result = repo.get_all(
+            filters=TaskFilter(completed=False), order_by="-created_at"
+        )
+
+        assert [t.title for t in result] == ["apps", "banana", "apple"]
+
+    def test_filter_title_prefix_is_case_sensitive_range(self, db: Session, tasks):
+        repo = TaskRepository(db)
+
+        result = repo.get_all(filters=TaskFilter(title_prefix="ap"))
+
+        assert [t.title for t in result] == ["apple", "apricot", "apps"]
+
+    def test_filter_created_range_is_half_open(self, db: Session, tasks):
+        repo = TaskRepository(db)
+        filters = TaskFilter(
+            created_after=datetime(2024, 1, 2), created_before=datetime(2024, 1, 4)
+        )
+
+        result = repo.get_all(filters=filters)
+
+        assert [t.title for t in result] == ["apricot", "banana"]
+
+    def test_filter_dates_are_compared_in_utc(self, db: Session, tasks):
+        repo = TaskRepository(db)
+        jst = timezone(timedelta(hours=9))
+        filters = TaskFilter(created_after=datetime(2024, 1, 5, 9, tzinfo=jst))
+
+        result = repo.get_all(filters=filters)
+
+        assert [t.title for t in result] == ["apps"]
+
+    def test_filter_updated_range(self, db: Session, tasks):
+        repo = TaskRepository(db)
+
+        result = repo.get_all(
+            filters=TaskFilter(updated_before=datetime(2024, 1, 9)),
+            order_by="updated_at",
+        )
+
+        assert [t.title for t in result] == ["apps", "Apple pie"]
+
+    def test_get_page_descending_walks_forward_and_back(self, db: Session, tasks):
+        repo = TaskRepository(db)
+        filters = TaskFilter(title_prefix="ap")
+
+        page1 = repo.get_page(limit=2, order_by="-created_at", filters=filters)
+        page2 = repo.get_page(
+            limit=2, cursor=page1.next_cursor, order_by="-created_at", filters=filters
+        )
+        back = repo.get_page(
+            limit=2, cursor=page2.prev_cursor, order_by="-created_at", filters=filters
+        )
+
+        assert [t.title for t in page1.items] == ["apps", "apricot"]
+        assert [t.title for t in page2.items] == ["apple"]
+        assert page2.next_cursor is None
+        assert [t.title for t in back.items] == ["apps", "apricot"]
+        assert back.prev_cursor is None
+
+    def test_filters_use_index_range_scans(self, db: Session):
+        def plan(filters, order_by):
+            stmt = apply_filters(select(Task), filters)
+            columns = {"id": [Task.id], "-created_at": [Task.created_at.desc()]}
+            sql = stmt.order_by(*columns[order_by]).compile(
+                db.get_bind(), compile_kwargs={"literal_binds": True}
+            )
+            rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            return " ".join(r[3] for r in rows)
+
+        incomplete = plan(TaskFilter(completed=False), "-created_at")
+        prefix = plan(TaskFilter(title_prefix="ap"), "id")
+
+        assert "USING INDEX ix_tasks_completed_created_at_id" in incomplete
+        assert "TEMP B-TREE" not in incomplete
+        assert "USING INDEX ix_tasks_title (title>? AND title<?)" in prefix
+
+    def test_prefix_upper_bound(self):
+        assert prefix_upper_bound("ap") == "aq"
+        assert prefix_upper_bound("a\U0010ffff") == "b"
+        assert prefix_upper_bound("\U0010ffff") is None
+
+
+class TestTaskRepositoryBulk:
+    @pytest.fixture
+    def repo(self, db: Session):
+        repo = TaskRepository(db)
+        repo.create_many([TaskCreate(title=f"Task {i}") for i in range(6)])
+        return repo
+
+    def test_update_many_by_ids(self, repo):
+        before = repo.get_by_id(2).updated_at
+
+        ids = repo.update_many(
+            TaskUpdate(completed=True), ids=[4, 2, 2, 99], chunk_size=1
+        )
+
+        assert ids == [2, 4]
+        completed = repo.get_all(filters=TaskFilter(completed=True))
+        assert [t.id for t in completed] == [2, 4]
+        assert repo.get_by_id(2).updated_at > before
+
+    def test_update_many_by_filter(self, repo):
+        repo.mark_complete(1)
+
+        ids = repo.update_many(
+            TaskUpdate(description="sprint 1"), filters=TaskFilter(completed=False)
+        )
+
+        assert ids == [2, 3, 4, 5, 6]
+        assert repo.get_by_id(1).description is None
+        assert repo.get_by_id(6).description == "sprint 1"
+
+    def test_update_many_ids_and_filter(self, repo):
+        repo.mark_complete(1)
+
+        ids = repo.update_many(
+            TaskUpdate(title="Done"), ids=[1, 2], filters=TaskFilter(completed=True)
+        )
+
+        assert ids == [1]
+
+    def test_update_many_is_one_transaction(self, repo, db: Session):
+        repo.update_many(TaskUpdate(title="Renamed"), ids=[1, 2, 3], chunk_size=2)
+        statements = []
+        event.listen(
+            db.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        repo.update_many(TaskUpdate(completed=True), ids=[1, 2, 3], chunk_size=2)
+
+        # 2 chunks, then the outbox events for all affected ids
+        assert [s.split()[0] for s in statements] == ["UPDATE", "UPDATE", "INSERT"]
+
+    def test_delete_many_by_ids(self, repo):
+        ids = repo.delete_many(ids=[5, 1, 42])
+
+        assert ids == [1, 5]
+        assert [t.id for t in repo.get_all()] == [2, 3, 4, 6]
+        assert repo.get_stats().total == 4
+        assert [t.id for t in repo.search("Task 1")] == [2]
+        assert repo.search("Task 4") == []
+
+    def test_delete_many_by_filter(self, repo):
+        repo.mark_complete(3)
+
+        ids = repo.delete_many(filters=TaskFilter(completed=True))
+
+        assert ids == [3]
+        assert repo.get_by_id(3) is None
+
+    def test_delete_many_empty_ids(self, repo):
+        assert repo.delete_many(ids=[]) == []
+        assert repo.count() == 6
+
+    def test_bulk_without_returning(self, repo, db: Session, monkeypatch):
+        dialect = db.get_bind().dialect
+        monkeypatch.setattr(dialect, "update_returning", False)
+        monkeypatch.setattr(dialect, "delete_returning", False)
+
+        updated = repo.update_many(
+            TaskUpdate(completed=True), ids=[1, 2, 3], chunk_size=2
+        )
+        deleted = repo.delete_many(filters=TaskFilter(completed=True))
+
+        assert updated == [1, 2, 3]
+        assert deleted == [1, 2, 3]
+        assert repo.count() == 3
+
+
+@pytest.mark.usefixtures("no_settle_time")
+class TestTaskRepositoryChanges:
+    def test_initial_sync_returns_everything(self, db: Session):
+        repo = TaskRepository(db)
+        created = repo.create_many([TaskCreate(title=f"Task {i}") for i in range(3)])
+
+        changes = repo.get_changes()
+
+        assert [t.id for t in changes.changed] == [t.id for t in created]
+        assert changes.deleted == []
+        assert changes.has_more is False
+        assert changes.watermark
+
+    def test_sync_returns_only_changes_since_watermark(self, db: Session):
+        repo = TaskRepository(db)
+        created = repo.create_many([TaskCreate(title=f"Task {i}") for i in range(4)])
+        watermark = repo.get_changes().watermark
+
+        assert repo.get_changes(since=watermark).changed == []
+
+        repo.mark_complete(created[1].id)
+        repo.delete(created[2].id)
+        repo.delete_many(ids=[created[3].id])
+        new = repo.create(TaskCreate(title="New"))
+        changes = repo.get_changes(since=watermark)
+
+        assert [t.id for t in changes.changed] == [created[1].id, new.id]
+        assert changes.deleted == [created[2].id, created[3].id]
+        assert repo.get_changes(since=changes.watermark).changed == []
+        assert repo.get_changes(since=changes.watermark).deleted == []
+
+    def test_sync_pages_with_has_more(self, db: Session):
+        repo = TaskRepository(db)
+        created = repo.create_many([TaskCreate(title=f"Task {i}") for i in range(5)])
+        repo.delete_many(ids=[created[0].id])
+
+        first = repo.get_changes(limit=3)
+        second = repo.get_changes(since=first.watermark, limit=3)
+
+        assert first.has_more is True
+        assert first.deleted == [created[0].id]
+        assert [t.id for t in first.changed + second.changed] == [
+            t.id for t in created[1:]
+        ]
+        assert second.has_more is False
+
+    def test_invalid_watermark(self, db: Session):
+        repo = TaskRepository(db)
+        cursor = encode_cursor(CursorPosition("id", (1,)))
+
+        with pytest.raises(InvalidCursorError):
+            repo.get_changes(since="not-a-watermark")
+        with pytest.raises(InvalidCursorError):
+            repo.get_changes(since=cursor)
+
+    def test_deleted_ids_are_not_reused(self, db: Session):
+        repo = TaskRepository(db)
+        first = repo.create(TaskCreate(title="First"))
+        repo.delete(first.id)
+
+        second = repo.create(TaskCreate(title="Second"))
+
+        assert second.id != first.id
+
+    def test_delete_replaces_existing_tombstone(self, db: Session):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+        db.add(TaskTombstone(task_id=task.id, deleted_at=datetime(2000, 1, 1)))
+        db.commit()
+
+        assert repo.delete(task.id) is True
+
+        tombstone = db.get(TaskTombstone, task.id)
+        assert tombstone.deleted_at > datetime(2000, 1, 1)
+
+    def test_changes_use_updated_at_index(self, db: Session):
+        from task_app.repositories.changes import changed_statement
+
+        stmt = changed_statement((datetime(2024, 1, 1), 1), limit=10)
+        sql = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+        rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        plan = " ".join(r[3] for r in rows)
 
+        assert "USING INDEX ix_tasks_updated_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestTaskRepositoryChangesSettling:
+    def test_late_commit_is_returned(self, db: Session):
+        repo = TaskRepository(db)
+        first = repo.create(TaskCreate(title="First"))
+        changes = repo.get_changes()
+        # A write that took its timestamp before ``first`` but committed after
+        # the sync above.
+        late = repo.create(TaskCreate(title="Late"))
+        db.execute(
+            update(Task)
+            .where(Task.id == late.id)
+            .values(updated_at=first.updated_at - timedelta(milliseconds=1))
+        )
+        db.commit()
+
+        later = repo.get_changes(since=changes.watermark)
+
+        assert [t.id for t in changes.changed] == [first.id]
+        assert [t.id for t in later.changed] == [late.id, first.id]
+
+    def test_watermark_advances_over_settled_rows_only(self, db: Session):
+        repo = TaskRepository(db)
+        settled = repo.create(TaskCreate(title="Settled"))
+        db.execute(
+            update(Task)
+            .where(Task.id == settled.id)
+            .values(updated_at=datetime.now(UTC) - timedelta(minutes=1))
+        )
+        db.commit()
+        recent = repo.create_many([TaskCreate(title=f"Task {i}") for i in range(3)])
+
+        first = repo.get_changes(limit=2)
+        second = repo.get_changes(since=first.watermark, limit=2)
+
+        assert [t.id for t in first.changed] == [settled.id, recent[0].id]
+        # Unsettled rows end the sync instead of paging through them.
+        assert first.has_more is False
+        assert [t.id for t in second.changed] == [t.id for t in recent[:2]]
+
+
+class TestTaskRepositoryStats:
+    def test_stats_empty(self, db: Session):
+        repo = TaskRepository(db)
+
+        stats = repo.get_stats()
+
+        assert (stats.total, stats.completed, stats.open) == (0, 0, 0)
+        assert repo.count() == 0
+
+    def test_stats_follow_writes(self, db: Session):
+        repo = TaskRepository(db)
+        tasks = repo.create_many([TaskCreate(title=f"Task {i}") for i in range(4)])
+        repo.create(TaskCreate(title="Task 4"))
+        repo.mark_complete(tasks[0].id)
+        repo.mark_complete(tasks[0].id)
+        repo.toggle_complete(tasks[1].id)
+        repo.update(tasks[2].id, TaskUpdate(completed=True))
+        repo.mark_incomplete(tasks[2].id)
+        repo.delete(tasks[1].id)
+        repo.delete(tasks[3].id)
+
+        stats = repo.get_stats()
+
+        assert (stats.total, stats.completed, stats.open) == (3, 1, 2)
+
+    def test_stats_read_from_counters(self, db: Session):
+        repo = TaskRepository(db)
+        repo.create_many([TaskCreate(title=f"Task {i}") for i in range(3)])
+        statements = []
+        event.listen(
+            db.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        assert repo.get_stats().total == 3
+
+        assert len(statements) == 1
+        assert "task_counters" in statements[0]
+
+    def test_stats_fall_back_to_aggregate_without_counters(self, db: Session):
+        repo = TaskRepository(db)
+        created = repo.create_many([TaskCreate(title=f"Task {i}") for i in range(3)])
+        repo.mark_complete(created[0].id)
+        db.query(TaskCounter).delete()
+        db.commit()
+
+        stats = repo.get_stats()
+
+        assert (stats.total, stats.completed) == (3, 1)
+
+    def test_count_with_filters(self, db: Session):
+        repo = TaskRepository(db)
+        created = repo.create_many(
+            [TaskCreate(title=t) for t in ["apple", "apricot", "banana"]]
+        )
+        repo.mark_complete(created[0].id)
+
+        assert repo.count(TaskFilter()) == 3
+        assert repo.count(TaskFilter(completed=True)) == 1
+        assert repo.count(TaskFilter(completed=False)) == 2
+        assert repo.count(TaskFilter(title_prefix="ap")) == 2
+        assert repo.count(TaskFilter(title_prefix="ap", completed=False)) == 1
+
+    def test_stats_with_filters(self, db: Session):
+        repo = TaskRepository(db)
+        created = repo.create_many(
+            [TaskCreate(title=t) for t in ["apple", "apricot", "banana"]]
+        )
+        repo.mark_complete(created[0].id)
+        repo.mark_complete(created[2].id)
+
+        stats = repo.get_stats(TaskFilter(title_prefix="ap"))
+
+        assert (stats.total, stats.completed, stats.open) == (2, 1, 1)
+
+
+class TestTaskRepositorySearch:
+    @pytest.fixture
+    def repo(self, db: Session):
+        repo = TaskRepository(db)
+        repo.create_many(
+            [
+                TaskCreate(title="牛乳を買う", description="スーパーで買い物"),
+                TaskCreate(title="買い物リストを作る"),
+                TaskCreate(title="Write report", description="quarterly REPORT"),
+                TaskCreate(title="掃除", description="買い物の後で部屋の掃除"),
+            ]
+        )
+        return repo
+
+    def test_search_matches_title_and_description(self, repo):
+        result = repo.search("買い物")
+
+        assert [t.title for t in result] == ["買い物リストを作る", "牛乳を買う", "掃除"]
+
+    def test_search_rows(self, repo):
+        result = repo.search("買い物", rows=True)
+
+        assert [row.title for row in result] == [
+            "買い物リストを作る",
+            "牛乳を買う",
+            "掃除",
+        ]
+
+    def test_search_requires_every_term(self, repo):
+        result = repo.search("買い物 スーパー")
+
+        assert [t.title for t in result] == ["牛乳を買う"]
+
+    def test_search_is_case_insensitive(self, repo):
+        assert [t.title for t in repo.search("report")] == ["Write report"]
+
+    def test_search_short_terms(self, repo):
+        assert [t.title for t in repo.search("掃除")] == ["掃除"]
+        assert [t.title for t in repo.search("買い物 部屋")] == ["掃除"]
+
+    def test_search_treats_query_syntax_as_text(self, repo):
+        assert repo.search('"report" OR *') == []
+        assert repo.search("title:report") == []
+
+    def test_search_pagination(self, repo):
+        page1 = repo.search("買い物", limit=2)
+        page2 = repo.search("買い物", limit=2, offset=2)
+
+        assert len(page1) == 2
+        assert [t.title for t in page2] == ["掃除"]
+
+    def test_search_index_follows_updates_and_deletes(self, repo):
+        task = repo.search("牛乳")[0]
+
+        repo.update(task.id, TaskUpdate(title="パンを買う", description=None))
+        assert repo.search("牛乳") == []
+        assert [t.id for t in repo.search("パンを")] == [task.id]
+
+        repo.delete(task.id)
+        assert repo.search("パンを") == []
+
+    def test_search_uses_fts_index(self, db: Session):
+        from task_app.repositories.search import search_statement
+
+        stmt = search_statement(db.get_bind().dialect, "買い物")
+        sql = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+        rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+
+        assert "VIRTUAL TABLE INDEX" in " ".join(r[3] for r in rows)
+
+
+class TestTaskRepositoryStreamAll:
+    def test_stream_all_yields_rows_in_id_order(self, db: Session):
+        repo = TaskRepository(db)
+        created = repo.create_many([TaskCreate(title=f"Task {i}") for i in range(5)])
+
+        rows = list(repo.stream_all(batch_size=2))
+
+        assert [row.id for row in rows] == [t.id for t in created]
+        assert rows[0].title == "Task 0"
+        assert rows[0].completed is False
+
+
+class TestTaskRepositoryUpdate:
     def test_update_task_title(self, db: Session):
         repo = TaskRepository(db)
         task = repo.create(TaskCreate(title="Original title"))
@@ -147,6 +794,7 @@ class TestTaskRepositoryUpdate:
         original_updated_at = task.updated_at
         
         import time
+
         time.sleep(0.05)
         
         result = repo.update(task.id, TaskUpdate(title="Updated"))
@@ -155,8 +803,79 @@ class TestTaskRepositoryUpdate:
         assert result.updated_at >= original_updated_at
 
 
-class TestTaskRepositoryDelete:
+class TestTaskRepositoryVersioning:
+    def test_new_task_starts_at_version_1(self, db: Session):
+        repo = TaskRepository(db)
+
+        assert repo.create(TaskCreate(title="Task")).version == 1
+        assert repo.create_many([TaskCreate(title="Bulk")])[0].version == 1
+
+    def test_every_write_bumps_version(self, db: Session):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+
+        assert repo.update(task.id, TaskUpdate(title="Updated")).version == 2
+        assert repo.mark_complete(task.id).version == 3
+        assert repo.toggle_complete(task.id).version == 4
+        repo.update_many(TaskUpdate(title="Bulk"), ids=[task.id])
+        assert repo.get_by_id(task.id).version == 5
+
+    def test_update_with_expected_version(self, db: Session):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+
+        result = repo.update(task.id, TaskUpdate(title="Mine"), expected_version=1)
+
+        assert result.title == "Mine"
+        with pytest.raises(TaskVersionConflictError):
+            repo.update(task.id, TaskUpdate(title="Stale"), expected_version=1)
+        assert repo.get_by_id(task.id).title == "Mine"
+
+    def test_update_detects_concurrent_write(self, tmp_path, monkeypatch):
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        with session_factory() as mine, session_factory() as theirs:
+            repo = TaskRepository(mine)
+            task_id = repo.create(TaskCreate(title="Task")).id
+            load = repo.get_by_id
+
+            def load_then_race(task_id):
+                # Another writer commits between our read and our write.
+                loaded = load(task_id)
+                TaskRepository(theirs).update(task_id, TaskUpdate(title="Theirs"))
+                return loaded
+
+            monkeypatch.setattr(repo, "get_by_id", load_then_race)
+
+            with pytest.raises(TaskVersionConflictError):
+                repo.update(task_id, TaskUpdate(title="Mine"))
+
+        with session_factory() as session:
+            stored = TaskRepository(session).get_by_id(task_id)
+            assert (stored.title, stored.version) == ("Theirs", 2)
+
+    def test_completion_with_expected_version(self, db: Session):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+
+        assert repo.mark_complete(task.id, expected_version=1).completed is True
+        with pytest.raises(TaskVersionConflictError):
+            repo.toggle_complete(task.id, expected_version=1)
+        assert repo.get_by_id(task.id).completed is True
+        assert repo.mark_incomplete(9999, expected_version=1) is None
+
+    def test_completion_conflict_without_returning(self, db: Session, monkeypatch):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+        monkeypatch.setattr(db.get_bind().dialect, "update_returning", False)
 
+        assert repo.toggle_complete(task.id, expected_version=1).version == 2
+        with pytest.raises(TaskVersionConflictError):
+            repo.toggle_complete(task.id, expected_version=1)
+
+
+class TestTaskRepositoryDelete:
     def test_delete_existing_task(self, db: Session):
         repo = TaskRepository(db)
         task = repo.create(TaskCreate(title="Task to delete"))
@@ -174,9 +893,23 @@ class TestTaskRepositoryDelete:
         
         assert result is False
 
+    def test_delete_failure_rolls_back(self, db: Session, monkeypatch):
+        repo = TaskRepository(db)
+        task_id = repo.create(TaskCreate(title="Task")).id
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("outbox unavailable")
+
+        monkeypatch.setattr(repo, "_record", fail)
+        with pytest.raises(RuntimeError):
+            repo.delete(task_id)
+        monkeypatch.undo()
+
+        assert repo.get_by_id(task_id) is not None
+        assert db.scalar(select(TaskTombstone.task_id)) is None
 
-class TestTaskRepositoryMarkComplete:
 
+class TestTaskRepositoryMarkComplete:
     def test_mark_complete(self, db: Session):
         repo = TaskRepository(db)
         task = repo.create(TaskCreate(title="Task to complete"))
@@ -209,3 +942,66 @@ class TestTaskRepositoryMarkComplete:
         result = repo.mark_incomplete(9999)
         
         assert result is None
+
+    def test_mark_complete_bumps_updated_at(self, db: Session):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+        original_updated_at = task.updated_at
+
+        import time
+
+        time.sleep(0.01)
+
+        result = repo.mark_complete(task.id)
+
+        assert result.updated_at > original_updated_at
+
+    def test_mark_complete_is_single_statement(self, db: Session):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+        statements = []
+        event.listen(
+            db.get_bind(),
+            "before_cursor_execute",
+            lambda conn, cursor, stmt, *args: statements.append(stmt),
+        )
+
+        result = repo.mark_complete(task.id)
+
+        assert result.completed is True
+        assert result.title == "Task"
+        # The UPDATE ... RETURNING plus the outbox event
+        assert len(statements) == 2
+        assert statements[0].startswith("UPDATE tasks")
+        assert statements[1].startswith("INSERT INTO task_events")
+
+
+class TestTaskRepositoryToggleComplete:
+    def test_toggle_complete_flips_state(self, db: Session):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+
+        first = repo.toggle_complete(task.id)
+        assert first.completed is True
+
+        second = repo.toggle_complete(task.id)
+        assert second.completed is False
+        assert repo.get_by_id(task.id).completed is False
+
+    def test_toggle_complete_non_existing_task(self, db: Session):
+        repo = TaskRepository(db)
+
+        result = repo.toggle_complete(9999)
+
+        assert result is None
+
+    def test_toggle_complete_without_returning(self, db: Session, monkeypatch):
+        repo = TaskRepository(db)
+        task = repo.create(TaskCreate(title="Task"))
+        monkeypatch.setattr(db.get_bind().dialect, "update_returning", False)
+
+        result = repo.toggle_complete(task.id)
+
+        assert result is not None
+        assert result.completed is True
+        assert repo.toggle_complete(9999) is None
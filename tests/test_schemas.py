@@ -132,6 +132,7 @@ class TestTaskResponse:
             "completed": False,
             "created_at": now,
             "updated_at": now,
+            "version": 1,
         }
         response = TaskResponse.model_validate(data)
         assert response.id == 1
@@ -151,6 +152,7 @@ class TestTaskResponse:
             completed = True
             created_at = datetime.now(UTC)
             updated_at = datetime.now(UTC)
+            version = 1
 
         response = TaskResponse.model_validate(MockTask())
         assert response.id == 1
@@ -169,6 +171,7 @@ class TestTaskResponse:
             completed=False,
             created_at=now,
             updated_at=now,
+            version=1,
         )
         json_data = response.model_dump()
         assert json_data["id"] == 1
@@ -0,0 +1,111 @@
+"""シリアライズ（エクスポート・APIレスポンス）のテスト"""
+
+import csv
+import io
+import json
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from task_app import serializers
+from task_app.schemas.task import TaskResponse
+from task_app.serializers import (
+    TASK_FIELDS,
+    dumps_json,
+    iter_csv,
+    iter_ndjson,
+    task_record,
+)
+
+ROWS = [
+    (1, "タスク1", None, False, datetime(2026, 1, 1, 9, 0), datetime(2026, 1, 1, 9, 0)),
+    (2, 'a,"b"', "説明\\n改行", True, datetime(2026, 1, 2), datetime(2026, 1, 3)),
+    (3, "タスク3", "", False, datetime(2026, 1, 4), datetime(2026, 1, 4)),
+]
+
+
+class TestIterNdjson:
+    """iter_ndjsonのテスト"""
+
+    def test_one_object_per_line(self):
+        """1行に1タスクのJSONが出力されること"""
+        body = b"".join(iter_ndjson(ROWS)).decode()
+        records = [json.loads(line) for line in body.splitlines()]
+
+        assert len(records) == 3
+        assert records[0] == {
+            "id": 1,
+            "title": "タスク1",
+            "description": None,
+            "completed": False,
+            "created_at": "2026-01-01T09:00:00",
+            "updated_at": "2026-01-01T09:00:00",
+        }
+        assert records[1]["title"] == 'a,"b"'
+
+    def test_chunks_rows(self):
+        """指定した行数ごとにチャンクに分かれること"""
+        chunks = list(iter_ndjson(ROWS, chunk_rows=2))
+
+        assert len(chunks) == 2
+        assert chunks[0].count(b"\n") == 2
+        assert chunks[1].count(b"\n") == 1
+
+    def test_empty(self):
+        """行がない場合は何も出力しないこと"""
+        assert list(iter_ndjson([])) == []
+
+
+class TestIterCsv:
+    """iter_csvのテスト"""
+
+    def test_header_and_rows(self):
+        """ヘッダ行とデータ行が出力されること"""
+        body = b"".join(iter_csv(ROWS, chunk_rows=2)).decode()
+        records = list(csv.reader(io.StringIO(body)))
+
+        assert records[0] == list(TASK_FIELDS)
+        assert len(records) == 4
+        assert records[2][1] == 'a,"b"'
+        assert records[2][3] == "True"
+        assert records[1][4] == "2026-01-01T09:00:00"
+
+    def test_empty_has_header(self):
+        """行がない場合もヘッダ行を出力すること"""
+        body = b"".join(iter_csv([])).decode()
+
+        assert body.strip() == ",".join(TASK_FIELDS)
+
+
+class TestDumpsJson:
+    """task_record / dumps_json のテスト"""
+
+    @pytest.fixture(params=["orjson", "json"])
+    def backend(self, request, monkeypatch):
+        if request.param == "json":
+            monkeypatch.setattr(serializers, "orjson", None)
+        elif serializers.orjson is None:
+            pytest.skip("orjson is not installed")
+        return request.param
+
+    @pytest.mark.parametrize(
+        "timestamp",
+        [
+            datetime(2026, 1, 1, 9, 0),
+            datetime(2026, 1, 1, 9, 0, 0, 123456),
+            datetime(2026, 1, 1, 9, 0, tzinfo=UTC),
+            datetime(2026, 1, 1, 9, 0, tzinfo=timezone(timedelta(hours=9))),
+        ],
+    )
+    def test_matches_task_response(self, backend, timestamp):
+        """TaskResponse をJSONにした場合と同じバイト列になること"""
+        row = (1, 'タスク"1"', None, True, timestamp, timestamp, 3)
+
+        expected = TaskResponse.model_validate(task_record(row)).model_dump_json()
+
+        assert dumps_json(task_record(row)) == expected.encode()
+
+    def test_unsupported_type(self, backend):
+        """JSONにできない値はTypeErrorになること"""
+        with pytest.raises(TypeError):
+            dumps_json({"value": object()})
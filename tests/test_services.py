@@ -1,12 +1,18 @@
 """TaskServiceのテスト"""
 
 import pytest
+import io
 from unittest.mock import Mock, MagicMock
 from datetime import datetime, UTC
 
+from task_app.cache import LRUCache
+from task_app.events import EventBroker
 from task_app.services.task import TaskService
-from task_app.repositories.task import TaskRepository
-from task_app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from task_app.repositories.changes import ChangeSet
+from task_app.repositories.pagination import TaskPage
+from task_app.repositories.statements import TaskStats
+from task_app.repositories.task import TaskRepository, TaskVersionConflictError
+from task_app.schemas.task import TaskCreate, TaskFilter, TaskUpdate, TaskResponse
 from task_app.models.task import Task
 
 
@@ -58,6 +64,44 @@ class TestTaskServiceCreate:
         assert result.description is None
 
 
+class TestTaskServiceCreateMany:
+    """TaskService.create_manyのテスト"""
+
+    def test_create_many_delegates_to_repository(self):
+        """一括作成をリポジトリに委譲すること"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_tasks = [Mock(spec=Task) for _ in range(2)]
+        mock_repo.create_many.return_value = mock_tasks
+
+        service = TaskService(mock_repo)
+        tasks_in = [TaskCreate(title="タスク1"), TaskCreate(title="タスク2")]
+
+        result = service.create_many(tasks_in)
+
+        mock_repo.create_many.assert_called_once_with(tasks_in)
+        assert result == mock_tasks
+
+
+class TestTaskServiceImportTasks:
+    """TaskService.import_tasksのテスト"""
+
+    def test_import_tasks_uses_create_many(self):
+        """バッチごとにcreate_manyで作成されること"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.create_many.side_effect = lambda tasks_in: [
+            Mock(spec=Task) for _ in tasks_in
+        ]
+
+        service = TaskService(mock_repo)
+        stream = io.StringIO("title\nタスク1\nタスク2\nタスク3\n")
+
+        result = service.import_tasks(stream, "csv", batch_size=2)
+
+        assert mock_repo.create_many.call_count == 2
+        assert result.imported == 3
+        assert result.failed == 0
+
+
 class TestTaskServiceGetById:
     """TaskService.get_by_idのテスト"""
 
@@ -102,7 +146,9 @@ class TestTaskServiceGetAll:
 
         result = service.get_all()
 
-        mock_repo.get_all.assert_called_once_with(skip=0, limit=100)
+        mock_repo.get_all.assert_called_once_with(
+            skip=0, limit=100, filters=None, order_by="id"
+        )
         assert len(result) == 3
 
     def test_get_all_with_pagination(self):
@@ -115,9 +161,25 @@ class TestTaskServiceGetAll:
 
         result = service.get_all(skip=10, limit=5)
 
-        mock_repo.get_all.assert_called_once_with(skip=10, limit=5)
+        mock_repo.get_all.assert_called_once_with(
+            skip=10, limit=5, filters=None, order_by="id"
+        )
         assert len(result) == 5
 
+    def test_get_all_with_filters(self):
+        """絞り込み条件と並び順をリポジトリに渡すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_all.return_value = []
+        filters = TaskFilter(completed=False, title_prefix="買い物")
+
+        service = TaskService(mock_repo)
+
+        service.get_all(filters=filters, order_by="-created_at")
+
+        mock_repo.get_all.assert_called_once_with(
+            skip=0, limit=100, filters=filters, order_by="-created_at"
+        )
+
     def test_get_all_empty_list(self):
         """タスクがない場合は空リストが返ること"""
         mock_repo = Mock(spec=TaskRepository)
@@ -130,6 +192,127 @@ class TestTaskServiceGetAll:
         assert result == []
 
 
+class TestTaskServiceGetPage:
+    """TaskService.get_pageのテスト"""
+
+    def test_get_page_delegates_to_repository(self):
+        """カーソル・並び順・絞り込み条件をリポジトリに渡すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_page = TaskPage(items=[Mock(spec=Task)], next_cursor="next")
+        mock_repo.get_page.return_value = mock_page
+
+        service = TaskService(mock_repo)
+
+        filters = TaskFilter(completed=True)
+        result = service.get_page(
+            limit=10, cursor="abc", order_by="created_at", filters=filters
+        )
+
+        mock_repo.get_page.assert_called_once_with(
+            limit=10,
+            cursor="abc",
+            order_by="created_at",
+            filters=filters,
+            rows=False,
+            fields=None,
+        )
+        assert result == mock_page
+
+    def test_get_many_delegates_to_repository(self):
+        """ID・絞り込み条件・フィールドをリポジトリに渡すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_many.return_value = []
+
+        service = TaskService(mock_repo)
+        result = service.get_many([3, 1], fields=("id", "title"))
+
+        mock_repo.get_many.assert_called_once_with(
+            [3, 1], filters=None, fields=("id", "title")
+        )
+        assert result == []
+
+
+class TestTaskServiceStreamAll:
+    """TaskService.stream_allのテスト"""
+
+    def test_stream_all_delegates_to_repository(self):
+        """バッチサイズをリポジトリに渡すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.stream_all.return_value = iter([(1, "タスク")])
+
+        service = TaskService(mock_repo)
+
+        result = list(service.stream_all(batch_size=50))
+
+        mock_repo.stream_all.assert_called_once_with(batch_size=50)
+        assert result == [(1, "タスク")]
+
+
+class TestTaskServiceStats:
+    """TaskService.count / get_statsのテスト"""
+
+    def test_count_delegates_to_repository(self):
+        """絞り込み条件をリポジトリに渡すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.count.return_value = 7
+        filters = TaskFilter(completed=False)
+
+        service = TaskService(mock_repo)
+
+        assert service.count(filters) == 7
+        mock_repo.count.assert_called_once_with(filters)
+
+    def test_get_stats_delegates_to_repository(self):
+        """集計結果をそのまま返すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_stats.return_value = TaskStats(total=5, completed=2)
+
+        service = TaskService(mock_repo)
+
+        result = service.get_stats()
+
+        mock_repo.get_stats.assert_called_once_with(None)
+        assert (result.total, result.completed, result.open) == (5, 2, 3)
+
+
+class TestTaskServiceGetChanges:
+    """TaskService.get_changesのテスト"""
+
+    def test_get_changes_delegates_to_repository(self):
+        """watermark と件数をリポジトリに渡すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        changes = ChangeSet(deleted=[1], watermark="next")
+        mock_repo.get_changes.return_value = changes
+
+        service = TaskService(mock_repo)
+
+        result = service.get_changes(since="prev", limit=10)
+
+        mock_repo.get_changes.assert_called_once_with(
+            since="prev", limit=10, rows=False
+        )
+        assert result == changes
+
+
+class TestTaskServiceSearch:
+    """TaskService.searchのテスト"""
+
+    def test_search_delegates_to_repository(self):
+        """検索語とページネーションをリポジトリに渡すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_tasks = [Mock(spec=Task)]
+        mock_repo.search.return_value = mock_tasks
+
+        service = TaskService(mock_repo)
+
+        result = service.search("買い物", limit=10, offset=20)
+
+        mock_repo.search.assert_called_once_with(
+            "買い物", limit=10, offset=20, rows=False
+        )
+        assert result == mock_tasks
+
+
 class TestTaskServiceUpdate:
     """TaskService.updateのテスト"""
 
@@ -146,7 +329,7 @@ class TestTaskServiceUpdate:
 
         result = service.update(1, task_in)
 
-        mock_repo.update.assert_called_once_with(1, task_in)
+        mock_repo.update.assert_called_once_with(1, task_in, expected_version=None)
         assert result == mock_task
 
     def test_update_task_not_found(self):
@@ -159,7 +342,7 @@ class TestTaskServiceUpdate:
 
         result = service.update(999, task_in)
 
-        mock_repo.update.assert_called_once_with(999, task_in)
+        mock_repo.update.assert_called_once_with(999, task_in, expected_version=None)
         assert result is None
 
     def test_update_task_partial(self):
@@ -175,7 +358,7 @@ class TestTaskServiceUpdate:
 
         result = service.update(1, task_in)
 
-        mock_repo.update.assert_called_once_with(1, task_in)
+        mock_repo.update.assert_called_once_with(1, task_in, expected_version=None)
         assert result.completed is True
 
 
@@ -222,7 +405,7 @@ class TestTaskServiceMarkComplete:
 
         result = service.mark_complete(1)
 
-        mock_repo.mark_complete.assert_called_once_with(1)
+        mock_repo.mark_complete.assert_called_once_with(1, expected_version=None)
         assert result.completed is True
 
     def test_mark_complete_not_found(self):
@@ -234,7 +417,7 @@ class TestTaskServiceMarkComplete:
 
         result = service.mark_complete(999)
 
-        mock_repo.mark_complete.assert_called_once_with(999)
+        mock_repo.mark_complete.assert_called_once_with(999, expected_version=None)
         assert result is None
 
 
@@ -253,7 +436,7 @@ class TestTaskServiceMarkIncomplete:
 
         result = service.mark_incomplete(1)
 
-        mock_repo.mark_incomplete.assert_called_once_with(1)
+        mock_repo.mark_incomplete.assert_called_once_with(1, expected_version=None)
         assert result.completed is False
 
     def test_mark_incomplete_not_found(self):
@@ -265,7 +448,7 @@ class TestTaskServiceMarkIncomplete:
 
         result = service.mark_incomplete(999)
 
-        mock_repo.mark_incomplete.assert_called_once_with(999)
+        mock_repo.mark_incomplete.assert_called_once_with(999, expected_version=None)
         assert result is None
 
 
@@ -275,55 +458,273 @@ class TestTaskServiceToggleComplete:
     def test_toggle_complete_from_incomplete(self):
         """未完了タスクを完了に切り替えできること"""
         mock_repo = Mock(spec=TaskRepository)
-        mock_task_before = Mock(spec=Task)
-        mock_task_before.id = 1
-        mock_task_before.completed = False
-        
         mock_task_after = Mock(spec=Task)
         mock_task_after.id = 1
         mock_task_after.completed = True
-
-        mock_repo.get_by_id.return_value = mock_task_before
-        mock_repo.mark_complete.return_value = mock_task_after
+        mock_repo.toggle_complete.return_value = mock_task_after
 
         service = TaskService(mock_repo)
 
         result = service.toggle_complete(1)
 
-        mock_repo.get_by_id.assert_called_once_with(1)
-        mock_repo.mark_complete.assert_called_once_with(1)
+        mock_repo.toggle_complete.assert_called_once_with(1, expected_version=None)
+        mock_repo.get_by_id.assert_not_called()
         assert result.completed is True
 
     def test_toggle_complete_from_complete(self):
         """完了タスクを未完了に切り替えできること"""
         mock_repo = Mock(spec=TaskRepository)
-        mock_task_before = Mock(spec=Task)
-        mock_task_before.id = 1
-        mock_task_before.completed = True
-        
         mock_task_after = Mock(spec=Task)
         mock_task_after.id = 1
         mock_task_after.completed = False
-
-        mock_repo.get_by_id.return_value = mock_task_before
-        mock_repo.mark_incomplete.return_value = mock_task_after
+        mock_repo.toggle_complete.return_value = mock_task_after
 
         service = TaskService(mock_repo)
 
         result = service.toggle_complete(1)
 
-        mock_repo.get_by_id.assert_called_once_with(1)
-        mock_repo.mark_incomplete.assert_called_once_with(1)
+        mock_repo.toggle_complete.assert_called_once_with(1, expected_version=None)
+        mock_repo.get_by_id.assert_not_called()
         assert result.completed is False
 
     def test_toggle_complete_not_found(self):
         """存在しないタスクのトグルでNoneが返ること"""
         mock_repo = Mock(spec=TaskRepository)
-        mock_repo.get_by_id.return_value = None
+        mock_repo.toggle_complete.return_value = None
 
         service = TaskService(mock_repo)
 
         result = service.toggle_complete(999)
 
-        mock_repo.get_by_id.assert_called_once_with(999)
+        mock_repo.toggle_complete.assert_called_once_with(999, expected_version=None)
         assert result is None
+
+
+class TestTaskServiceBulk:
+    """TaskService.update_many / delete_manyのテスト"""
+
+    def test_update_many_delegates_to_repository(self):
+        """更新内容と対象をリポジトリに渡し、更新したIDを返すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.update_many.return_value = [1, 2]
+        task_in = TaskUpdate(completed=True)
+        filters = TaskFilter(completed=False)
+
+        service = TaskService(mock_repo)
+
+        result = service.update_many(task_in, filters=filters)
+
+        mock_repo.update_many.assert_called_once_with(
+            task_in, ids=None, filters=filters
+        )
+        assert result == [1, 2]
+
+    def test_delete_many_delegates_to_repository(self):
+        """対象をリポジトリに渡し、削除したIDを返すこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.delete_many.return_value = [3]
+
+        service = TaskService(mock_repo)
+
+        result = service.delete_many(ids=[3, 4])
+
+        mock_repo.delete_many.assert_called_once_with(ids=[3, 4], filters=None)
+        assert result == [3]
+
+
+class TestTaskServiceCache:
+    """TaskServiceのキャッシュのテスト"""
+
+    @staticmethod
+    def _make_task(task_id: int = 1, completed: bool = False) -> Task:
+        now = datetime.now(UTC)
+        return Task(
+            id=task_id,
+            title="タスク",
+            description=None,
+            completed=completed,
+            created_at=now,
+            updated_at=now,
+            version=1,
+        )
+
+    def test_get_by_id_reads_through_cache(self):
+        """2回目以降の取得はリポジトリを呼ばないこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_by_id.return_value = self._make_task()
+        cache = LRUCache()
+        service = TaskService(mock_repo, cache)
+
+        first = service.get_by_id(1)
+        second = service.get_by_id(1)
+
+        mock_repo.get_by_id.assert_called_once_with(1)
+        assert first.title == second.title == "タスク"
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_get_by_id_not_found_is_not_cached(self):
+        """存在しないタスクはキャッシュしないこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_by_id.return_value = None
+        service = TaskService(mock_repo, LRUCache())
+
+        assert service.get_by_id(999) is None
+        assert service.get_by_id(999) is None
+        assert mock_repo.get_by_id.call_count == 2
+
+    @pytest.mark.parametrize(
+        "method, args",
+        [
+            ("update", (1, TaskUpdate(title="更新"))),
+            ("delete", (1,)),
+            ("mark_complete", (1,)),
+            ("mark_incomplete", (1,)),
+            ("toggle_complete", (1,)),
+        ],
+    )
+    def test_writes_invalidate_cache(self, method, args):
+        """更新系の操作で対象タスクのキャッシュが無効化されること"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_by_id.return_value = self._make_task()
+        service = TaskService(mock_repo, LRUCache())
+        service.get_by_id(1)
+
+        getattr(service, method)(*args)
+        service.get_by_id(1)
+
+        assert mock_repo.get_by_id.call_count == 2
+
+    def test_version_conflict_invalidates_cache(self):
+        """競合で更新できなかった場合もキャッシュが無効化されること"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_by_id.return_value = self._make_task()
+        mock_repo.update.side_effect = TaskVersionConflictError(1, 1)
+        service = TaskService(mock_repo, LRUCache())
+        service.get_by_id(1)
+
+        with pytest.raises(TaskVersionConflictError):
+            service.update(1, TaskUpdate(title="更新"), expected_version=1)
+        service.get_by_id(1)
+
+        assert mock_repo.get_by_id.call_count == 2
+
+    @pytest.mark.parametrize(
+        "method, args",
+        [
+            ("update_many", (TaskUpdate(completed=True),)),
+            ("delete_many", ()),
+        ],
+    )
+    def test_bulk_writes_invalidate_affected_tasks(self, method, args):
+        """一括操作で対象になったタスクのキャッシュだけが無効化されること"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_by_id.side_effect = lambda task_id: self._make_task(task_id)
+        getattr(mock_repo, method).return_value = [1]
+        service = TaskService(mock_repo, LRUCache())
+        service.get_by_id(1)
+        service.get_by_id(2)
+
+        getattr(service, method)(*args, ids=[1, 3])
+        service.get_by_id(1)
+        service.get_by_id(2)
+
+        assert mock_repo.get_by_id.call_count == 3
+
+    def test_invalidation_during_read_is_not_overwritten(self):
+        """読み込み中に更新・無効化された場合、読み込んだ古い値を保存しないこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        service = TaskService(mock_repo, LRUCache())
+        stale = self._make_task()
+        fresh = self._make_task(completed=True)
+
+        def read_then_concurrent_update(task_id):
+            # 古い行を読んだ後、保存する前に別のリクエストが更新して無効化する
+            mock_repo.mark_complete.return_value = fresh
+            service.mark_complete(task_id)
+            mock_repo.get_by_id.side_effect = None
+            mock_repo.get_by_id.return_value = fresh
+            return stale
+
+        mock_repo.get_by_id.side_effect = read_then_concurrent_update
+
+        assert service.get_by_id(1).completed is False
+        assert service.get_by_id(1).completed is True
+        assert mock_repo.get_by_id.call_count == 2
+
+    def test_create_invalidates_reused_id(self):
+        """作成したタスクのIDのキャッシュが無効化されること"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.get_by_id.return_value = self._make_task()
+        mock_repo.create.return_value = self._make_task()
+        service = TaskService(mock_repo, LRUCache())
+        service.get_by_id(1)
+
+        service.create(TaskCreate(title="タスク"))
+        service.get_by_id(1)
+
+        assert mock_repo.get_by_id.call_count == 2
+
+
+class TestTaskServiceEvents:
+    """TaskServiceの変更イベントのテスト"""
+
+    @staticmethod
+    def _make_task(task_id: int = 1) -> Task:
+        return Task(id=task_id, title="タスク", completed=False, version=1)
+
+    def test_single_task_writes_publish_task(self):
+        """1件の変更は変更後のタスクと共に発行されること"""
+        mock_repo = Mock(spec=TaskRepository)
+        task = self._make_task()
+        mock_repo.create.return_value = task
+        mock_repo.update.return_value = task
+        mock_repo.toggle_complete.return_value = task
+        events = Mock(spec=EventBroker)
+        service = TaskService(mock_repo, events=events)
+
+        service.create(TaskCreate(title="タスク"))
+        service.update(1, TaskUpdate(title="更新"))
+        service.toggle_complete(1)
+
+        assert [c.args for c in events.publish.call_args_list] == [
+            ("created", 1, task),
+            ("updated", 1, task),
+            ("completed", 1, task),
+        ]
+
+    def test_bulk_writes_publish_ids(self):
+        """一括変更と削除はIDだけが発行されること"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.update_many.return_value = [1, 2]
+        mock_repo.delete_many.return_value = [3]
+        mock_repo.delete.return_value = True
+        events = Mock(spec=EventBroker)
+        service = TaskService(mock_repo, events=events)
+
+        service.update_many(TaskUpdate(completed=True), ids=[1, 2])
+        service.delete_many(ids=[3])
+        service.delete(4)
+
+        assert [c.args for c in events.publish_many.call_args_list] == [
+            ("updated", [1, 2], None),
+            ("deleted", [3], None),
+            ("deleted", [4], None),
+        ]
+
+    def test_failed_or_missing_writes_do_not_publish(self):
+        """存在しないタスクや競合した変更は発行しないこと"""
+        mock_repo = Mock(spec=TaskRepository)
+        mock_repo.mark_complete.return_value = None
+        mock_repo.delete.return_value = False
+        mock_repo.update.side_effect = TaskVersionConflictError(1, 1)
+        events = Mock(spec=EventBroker)
+        service = TaskService(mock_repo, events=events)
+
+        service.mark_complete(999)
+        service.delete(999)
+        with pytest.raises(TaskVersionConflictError):
+            service.update(1, TaskUpdate(title="更新"), expected_version=1)
+
+        assert not events.publish.called
+        assert not events.publish_many.called